@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+__author__ = 'Andrine Zimmermann, Karin Mollatt'
+__email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
+
+"""
+Benchmark of the number of births per second.
+
+The script uses a high-fertility parameter set, where every mother that is heavy enough
+tries to give birth, but most of them are too light for the drawn birth weight. It measures
+
+- :meth:`procreation` against a copy of the method as it was when it created the newborn
+  before checking whether the mother could carry it,
+- :meth:`newborns` against creating the newborns with the ordinary constructor, and
+- :meth:`give_birth` for a whole cell.
+"""
+
+import time
+
+import numpy as np
+
+from biosim.animals import Herbivores
+
+
+def procreation_before(animal, amount_same_species, rng):
+    params = animal.params
+    if animal.weight < params.birth_demand:
+        return None
+    if rng.random() < min(1, params.gamma * animal.phi * (amount_same_species - 1)):
+        newborn = type(animal)(rng=rng)
+        if animal.weight > params.xi * newborn.weight:
+            animal.weight -= params.xi * newborn.weight
+            animal._phi_stale = True
+            return newborn
+    return None
+
+
+def births_per_second(procreation, mothers, rng):
+    """
+    Lets every mother try to give birth once, and returns the tries per second, the births
+    per second and the share of the tries that gave a birth.
+    """
+    start = time.perf_counter()
+    births = sum(procreation(mother, len(mothers), rng) is not None for mother in mothers)
+    elapsed = time.perf_counter() - start
+    return len(mothers) / elapsed, births / elapsed, births / len(mothers)
+
+
+def make_mothers(amount):
+    """
+    Creates mothers that are just heavy enough to try to give birth.
+    """
+    return [Herbivores(5, Herbivores.params.birth_demand) for _ in range(amount)]
+
+
+if __name__ == '__main__':
+    Herbivores.set_params({'gamma': 10, 'zeta': 0.8})
+    amount = 200_000
+
+    rng = np.random.default_rng(1)
+    tries, rate, share = births_per_second(procreation_before, make_mothers(amount), rng)
+    print(f'{"procreation before":>22}: {tries:12,.0f} tries/s, {rate:12,.0f} births/s '
+          f'({share:.0%} of tries give birth)')
+
+    rng = np.random.default_rng(1)
+    tries, rate, share = births_per_second(Herbivores.procreation, make_mothers(amount), rng)
+    print(f'{"procreation after":>22}: {tries:12,.0f} tries/s, {rate:12,.0f} births/s '
+          f'({share:.0%} of tries give birth)')
+
+    weights = rng.normal(Herbivores.params.w_birth, Herbivores.params.sigma_birth,
+                         amount).clip(0.1).tolist()
+    start = time.perf_counter()
+    [Herbivores(0, weight) for weight in weights]
+    constructor = amount / (time.perf_counter() - start)
+    start = time.perf_counter()
+    Herbivores.newborns(weights)
+    bulk = amount / (time.perf_counter() - start)
+    print(f'{"Herbivores(0, weight)":>22}: {constructor:12,.0f} newborns/s')
+    print(f'{"Herbivores.newborns":>22}: {bulk:12,.0f} newborns/s ({bulk / constructor:.1f}x)')
+
+    mothers = [Herbivores(5, 50) for _ in range(amount)]
+    start = time.perf_counter()
+    newborns = Herbivores.give_birth(mothers, rng)
+    rate = len(newborns) / (time.perf_counter() - start)
+    print(f'{"give_birth":>22}: {rate:12,.0f} births/s')
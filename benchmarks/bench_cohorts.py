@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+__author__ = 'Andrine Zimmermann, Karin Mollatt'
+__email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
+
+"""
+Benchmark of very large herds, stored as arrays and as cohorts.
+
+One Lowland cell, with enough fodder for the whole herd, gets a herd of herbivores of
+different ages and weights, and runs ten years of feeding, births and aging. The script
+prints the time per year, the number of entries in the arrays and their memory, for
+:class:`biosim.population.Population` and :class:`biosim.population.CohortPopulation`.
+"""
+
+import time
+
+import numpy as np
+
+from biosim.landscapes import Lowland
+
+YEARS = 10
+
+
+def make_cell(storage, amount, rng):
+    """
+    Creates a Lowland cell with the given amount of herbivores of different ages and weights.
+    """
+    cell = Lowland(storage, rng)
+    cell.herbivores.add_animals(rng.integers(0, 15, amount), rng.uniform(5, 50, amount))
+    return cell
+
+
+def time_per_year(storage, amount):
+    """
+    Runs the cell for some years, and returns the seconds per year, the number of animals,
+    the number of entries in the arrays and the bytes used at the end.
+    """
+    cell = make_cell(storage, amount, np.random.default_rng(1))
+    start = time.perf_counter()
+    for _ in range(YEARS):
+        cell.amount_fodder = 10 * amount
+        cell.feeding_herbs()
+        cell.animal_gives_birth()
+        cell.animal_ages_and_dies()
+    elapsed = (time.perf_counter() - start) / YEARS
+    return elapsed, cell.amount_herbs, cell.herbivores.size, cell.memory_footprint()['Herbivore']
+
+
+if __name__ == '__main__':
+    for amount in (10_000, 100_000, 1_000_000):
+        for storage in ('arrays', 'cohorts'):
+            elapsed, amount_animals, entries, nbytes = time_per_year(storage, amount)
+            print(f'{amount:>9} herbivores, {storage:>7}: {elapsed * 1e3:9.2f} ms/year, '
+                  f'{amount_animals:>10} animals in {entries:>9} entries, {nbytes / 1e6:8.2f} MB')
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+__author__ = 'Andrine Zimmermann, Karin Mollatt'
+__email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
+
+"""
+Benchmark comparing the reference engine and the vectorized engine of BioSim.
+
+Both engines simulate the sample island from :mod:`biosim.simulation` without graphics, first
+50 years with herbivores only and then 50 years after carnivores are added. The script prints
+the time per simulated year and the number of animals at the end.
+"""
+
+import textwrap
+import time
+
+from biosim.simulation import BioSim
+
+
+geogr = """\
+           WWWWWWWWWWWWWWWWWWWWW
+           WHHHHHLLLLWWLLLLLLLWW
+           WHHHHHLLLLWWLLLLLLLWW
+           WHHHHHLLLLWWLLLLLLLWW
+           WWHHLLLLLLLWWLLLLLLLW
+           WWHHLLLLLLLWWLLLLLLLW
+           WWWWWWWWHWWWWLLLLLLLW
+           WHHHHHLLLLWWLLLLLLLWW
+           WHHHHHHHHHWWLLLLLLWWW
+           WHHHHHDDDDDLLLLLLLWWW
+           WHHHHHDDDDDLLLLLLLWWW
+           WHHHHHDDDDDLLLLLLLWWW
+           WHHHHHDDDDDWWLLLLLWWW
+           WHHHHDDDDDDLLLLWWWWWW
+           WWHHHHDDDDDDLWWWWWWWW
+           WWHHHHDDDDDLLLWWWWWWW
+           WHHHHHDDDDDLLLLLLLWWW
+           WHHHHDDDDDDLLLLWWWWWW
+           WWHHHHDDDDDLLLWWWWWWW
+           WWWHHHHLLLLLLLWWWWWWW
+           WWWHHHHHHWWWWWWWWWWWW
+           WWWWWWWWWWWWWWWWWWWWW"""
+geogr = textwrap.dedent(geogr)
+
+ini_herbs = [{'loc': (10, 10),
+              'pop': [{'species': 'Herbivore', 'age': 5, 'weight': 20} for _ in range(150)]}]
+ini_carns = [{'loc': (10, 10),
+              'pop': [{'species': 'Carnivore', 'age': 5, 'weight': 20} for _ in range(40)]}]
+
+
+def simulate(sim, years):
+    """
+    Simulates the given number of years on the island of the simulation, without graphics.
+    """
+    for _ in range(years):
+        sim.island.annual_cycle_simulation()
+
+
+if __name__ == '__main__':
+    for engine in ('reference', 'vectorized'):
+        sim = BioSim(geogr, ini_herbs, seed=1, vis_years=0, engine=engine)
+        start = time.perf_counter()
+        simulate(sim, 50)
+        sim.add_population(ini_carns)
+        simulate(sim, 50)
+        elapsed = time.perf_counter() - start
+        print(f'{engine:>10}: {elapsed / 100 * 1e3:8.2f} ms/year, '
+              f'animals at the end {sim.num_animals_per_species}')
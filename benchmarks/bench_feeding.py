@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+__author__ = 'Andrine Zimmermann, Karin Mollatt'
+__email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
+
+"""
+Benchmark of herbivore feeding in crowded Highland and Desert cells.
+
+The "before" functions are copies of the feeding as it was when all herbivores were sorted
+by fitness every year, also when the fodder was gone after the first few eaters. The "after"
+calls are the current :meth:`feeding_herbs`, which only orders the herbivores the fodder
+can feed.
+"""
+
+import time
+
+import numpy as np
+
+from biosim.animals import Herbivores
+from biosim.landscapes import Highland, Desert
+
+
+def feeding_before(cell):
+    if cell.storage == 'arrays':
+        population = cell.herbivores
+        if population.size == 0 or cell.amount_fodder <= 0:
+            return
+        params = Herbivores.params
+        order = np.argsort(-population.phi, kind='stable')
+        amount_eaten = np.clip(cell.amount_fodder - params.F * np.arange(population.size),
+                               0, params.F)
+        fed = order[amount_eaten > 0]
+        population.weight[fed] += params.beta * amount_eaten[amount_eaten > 0]
+        population.phi[fed] = Herbivores.fitness_batch(population.age[fed], population.weight[fed])
+        cell.amount_fodder -= amount_eaten.sum()
+        return
+
+    Herbivores.update_fitness(cell.list_herbivores)
+    cell.list_herbivores = sorted(cell.list_herbivores, key=lambda f: getattr(f, 'phi'),
+                                  reverse=True)
+    for herb in cell.list_herbivores:
+        if cell.amount_fodder > 0:
+            cell.amount_fodder -= herb.herbs_eating(cell.amount_fodder)
+        else:
+            break
+
+
+def make_cell(landscape, storage, amount, rng):
+    """
+    Creates a cell with the given amount of herbivores of different ages and weights.
+    """
+    cell = landscape(storage, rng)
+    cell.animals_population([{'species': 'Herbivore', 'age': int(age), 'weight': float(weight)}
+                             for age, weight in zip(rng.integers(0, 30, amount),
+                                                    rng.uniform(5, 50, amount))])
+    return cell
+
+
+def feeding_time(feeding, landscape, storage, amount):
+    """
+    Measures the time for feeding once, on a fresh cell, in seconds.
+    """
+    cell = make_cell(landscape, storage, amount, np.random.default_rng(1))
+    cell.grow_fodder()
+    start = time.perf_counter()
+    feeding(cell)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    for landscape in (Highland, Desert):
+        for amount in (1_000, 10_000, 100_000):
+            for storage in ('objects', 'arrays'):
+                before = feeding_time(feeding_before, landscape, storage, amount)
+                after = feeding_time(landscape.feeding_herbs, landscape, storage, amount)
+                print(f'{landscape.__name__:>8} {amount:>7} herbivores, {storage:>7}: '
+                      f'before {before * 1e3:8.2f} ms, after {after * 1e3:8.3f} ms, '
+                      f'speed-up {before / after:8.1f}')
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+__author__ = 'Andrine Zimmermann, Karin Mollatt'
+__email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
+
+"""
+Benchmark comparing the scalar fitness method with the batch fitness of the animal classes.
+
+For each population size, the script times
+
+- calling :meth:`fitness` on every animal object,
+- :meth:`update_fitness` on the same list of objects, and
+- :meth:`fitness_batch` on arrays with the ages and weights.
+"""
+
+import time
+
+import numpy as np
+
+from biosim.animals import Herbivores
+
+
+def best_time(function, repeats=5):
+    """
+    Returns the best time of a number of calls to the function, in seconds.
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(1)
+
+    for amount in (10_000, 100_000, 1_000_000):
+        ages = rng.integers(0, 50, amount)
+        weights = rng.uniform(0, 60, amount)
+        herbs = [Herbivores(int(age), float(weight)) for age, weight in zip(ages, weights)]
+
+        scalar = best_time(lambda: [herb.fitness() for herb in herbs])
+        objects = best_time(lambda: Herbivores.update_fitness(herbs))
+        arrays = best_time(lambda: Herbivores.fitness_batch(ages, weights))
+
+        print(f'{amount:>9} animals: fitness() {scalar * 1e3:8.2f} ms, '
+              f'update_fitness {objects * 1e3:8.2f} ms ({scalar / objects:5.1f}x), '
+              f'fitness_batch {arrays * 1e3:8.2f} ms ({scalar / arrays:5.1f}x)')
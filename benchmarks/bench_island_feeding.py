@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+__author__ = 'Andrine Zimmermann, Karin Mollatt'
+__email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
+
+"""
+Benchmark of herbivore feeding over a whole island with the vectorized engine.
+
+The "before" function is a copy of the feeding as it was when the vectorized engine fed one
+cell at a time in a Python loop. The "after" calls are the current
+:meth:`VectorizedIsland.feeding_herbs`, which finds the intake of every herbivore on the
+island with a few NumPy calls.
+"""
+
+import time
+
+import numpy as np
+
+from biosim.animals import Herbivores
+from biosim.vectorized_island import VectorizedIsland, cell_segments
+
+
+def feeding_before(island):
+    herbs = island.herbivores
+    params = Herbivores.params
+    fodder = island.fodder.reshape(-1)
+    order = np.lexsort((-herbs.phi, herbs.cell))
+    sorted_cells = herbs.cell[order]
+
+    for start, stop in zip(*cell_segments(sorted_cells)):
+        cell = sorted_cells[start]
+        if fodder[cell] <= 0:
+            continue
+
+        amount_eaters = min(int(fodder[cell] // params.F) + 1, stop - start)
+        eaters = order[start:start + amount_eaters]
+        amount_eaten = np.clip(fodder[cell] - params.F * np.arange(amount_eaters), 0, params.F)
+        herbs.weight[eaters] += params.beta * amount_eaten
+        fodder[cell] -= amount_eaten.sum()
+
+    herbs.update_fitness()
+
+
+def make_island(size, amount_per_cell, rng):
+    """
+    Creates a square lowland island with the given amount of herbivores in every land cell.
+    """
+    lines = ['W' * size] + ['W' + 'L' * (size - 2) + 'W' for _ in range(size - 2)] + ['W' * size]
+    island = VectorizedIsland('\n'.join(lines), [], rng)
+    herbs = [{'species': 'Herbivore', 'age': 5, 'weight': 20}] * amount_per_cell
+    island.adding_population([{'loc': (row, col), 'pop': herbs}
+                              for row in range(2, size) for col in range(2, size)])
+    island.herbivores.weight[:] = rng.uniform(5, 50, island.herbivores.size)
+    island.herbivores.update_fitness()
+    return island
+
+
+def feeding_time(feeding, size, amount_per_cell):
+    """
+    Measures the time for feeding once, on a fresh island, in seconds.
+    """
+    island = make_island(size, amount_per_cell, np.random.default_rng(1))
+    island.regrow_fodder()
+    start = time.perf_counter()
+    feeding(island)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    for size, amount_per_cell in ((20, 100), (100, 20), (200, 5)):
+        before = feeding_time(feeding_before, size, amount_per_cell)
+        after = feeding_time(VectorizedIsland.feeding_herbs, size, amount_per_cell)
+        print(f'{(size - 2) ** 2:>6} cells, {amount_per_cell:>4} herbivores per cell: '
+              f'before {before * 1e3:8.2f} ms, after {after * 1e3:8.2f} ms, '
+              f'speed-up {before / after:6.1f}')
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+__author__ = 'Andrine Zimmermann, Karin Mollatt'
+__email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
+
+"""
+Strong scaling benchmark of :class:`biosim.parallel_island.ParallelIsland`.
+
+A fixed square island of Lowland, with herbivores and carnivores in every cell, is simulated
+by the serial :class:`biosim.island.Island` and by one worker up to the number of CPUs. The
+script prints the time per year, and the speed-up and efficiency against one worker. The
+speed-up can not be larger than the number of CPUs of the machine.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+from biosim.island import Island
+from biosim.parallel_island import ParallelIsland
+
+SIZE = 60
+YEARS = 5
+
+
+def make_map(size):
+    """
+    Creates the map of a square island of Lowland, surrounded by water.
+    """
+    water = 'W' * (size + 2)
+    return '\n'.join([water] + ['W' + 'L' * size + 'W'] * size + [water])
+
+
+def make_pop(size):
+    """
+    Creates a population of 40 herbivores and 5 carnivores in every cell.
+    """
+    pop = ([{'species': 'Herbivore', 'age': 5, 'weight': 20}] * 40
+           + [{'species': 'Carnivore', 'age': 5, 'weight': 20}] * 5)
+    return [{'loc': (loc_x, loc_y), 'pop': pop}
+            for loc_x in range(2, size + 2) for loc_y in range(2, size + 2)]
+
+
+def time_per_year(island):
+    """
+    Runs the island for some years, and returns the seconds per year.
+    """
+    island.annual_cycle_simulation()
+    start = time.perf_counter()
+    for _ in range(YEARS):
+        island.annual_cycle_simulation()
+    return (time.perf_counter() - start) / YEARS
+
+
+if __name__ == '__main__':
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    island_map, pop = make_map(SIZE), make_pop(SIZE)
+    print(f'{SIZE}x{SIZE} cells, {os.cpu_count()} CPUs')
+
+    serial = time_per_year(Island(island_map, pop, storage='arrays', rng=np.random.default_rng(1)))
+    print(f'  serial: {serial * 1e3:9.2f} ms/year')
+
+    one_worker = None
+    for workers in range(1, max_workers + 1):
+        island = ParallelIsland(island_map, pop, rng=np.random.default_rng(1), workers=workers)
+        elapsed = time_per_year(island)
+        island.close()
+        one_worker = elapsed if one_worker is None else one_worker
+        speed_up = one_worker / elapsed
+        print(f'{workers:>8}: {elapsed * 1e3:9.2f} ms/year, speed-up {speed_up:5.2f}, '
+              f'efficiency {speed_up / workers:5.2f}')
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+__author__ = 'Andrine Zimmermann, Karin Mollatt'
+__email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
+
+"""
+Micro-benchmark of the per-call cost of the hot animal methods.
+
+The "before" functions are copies of the methods as they were when they looked up every
+parameter in the default_params dictionary and computed the derived values on every call.
+The "after" calls are the current methods, which read the parameter snapshot.
+"""
+
+import random
+import timeit
+
+from biosim.animals import Herbivores, Carnivores
+
+
+def fitness_before(animal):
+    if animal.weight == 0:
+        animal.phi = 0
+    else:
+        q_pos = animal.q_func(animal.age, animal.default_params['a_half'],
+                              animal.default_params['phi_age'], 1)
+        q_neg = animal.q_func(animal.weight, animal.default_params['w_half'],
+                              animal.default_params['phi_weight'], -1)
+        animal.phi = q_pos * q_neg
+    return animal.phi
+
+
+def procreation_before(animal, amount_same_species):
+    birth_prob = min(1, animal.default_params['gamma']*animal.phi*(amount_same_species-1))
+    demand = animal.default_params['zeta']*(animal.default_params['w_birth']
+                                            + animal.default_params['sigma_birth'])
+
+    if animal.weight < demand:
+        return None
+    return random.random() < birth_prob
+
+
+def death_before(animal):
+    death_prob = animal.default_params['omega'] * (1 - animal.phi)
+    if animal.weight == 0:
+        return True
+    return random.random() < death_prob
+
+
+def kill_prob_before(carn, herb):
+    if carn.phi <= herb.phi:
+        return 0
+    elif 0 < (carn.phi - herb.phi) < carn.default_params['DeltaPhiMax']:
+        return (carn.phi - herb.phi) / carn.default_params['DeltaPhiMax']
+    return 1
+
+
+def kill_prob_after(carn, herb):
+    params = carn.params
+    if carn.phi <= herb.phi:
+        return 0
+    elif 0 < (carn.phi - herb.phi) < params.DeltaPhiMax:
+        return (carn.phi - herb.phi) * params.inv_DeltaPhiMax
+    return 1
+
+
+def per_call(function, number=200_000):
+    """
+    Returns the best time per call in nanoseconds.
+    """
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e9
+
+
+if __name__ == '__main__':
+    random.seed(1)
+    herb = Herbivores(5, 20)
+    carn = Carnivores(5, 30)
+
+    cases = [('fitness', lambda: fitness_before(herb), herb.fitness),
+             ('procreation (no birth)', lambda: procreation_before(herb, 10),
+              lambda: herb.procreation(10)),
+             ('death', lambda: death_before(herb), herb.death),
+             ('kill probability', lambda: kill_prob_before(carn, herb),
+              lambda: kill_prob_after(carn, herb))]
+
+    for name, before, after in cases:
+        time_before, time_after = per_call(before), per_call(after)
+        print(f'{name:>24}: before {time_before:7.1f} ns, after {time_after:7.1f} ns, '
+              f'speed-up {time_before / time_after:4.2f}')
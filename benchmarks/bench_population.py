@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+__author__ = 'Andrine Zimmermann, Karin Mollatt'
+__email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
+
+"""
+Benchmark comparing the object storage and the array storage of a single cell.
+
+For 1 000, 10 000 and 100 000 herbivores in one lowland cell, the script measures the
+memory used by the population and the time for the cell methods of one year.
+"""
+
+import time
+import tracemalloc
+
+import numpy as np
+
+from biosim.landscapes import Lowland
+
+
+# Random number generator shared by all cells of the benchmark
+rng = np.random.default_rng(1)
+
+
+def make_cell(storage, amount):
+    """
+    Creates a lowland cell with the given amount of herbivores and a tenth as many carnivores.
+    """
+    cell = Lowland(storage, rng)
+    cell.animals_population([{'species': 'Herbivore', 'age': 5, 'weight': 20}
+                             for _ in range(amount)])
+    cell.animals_population([{'species': 'Carnivore', 'age': 5, 'weight': 20}
+                             for _ in range(amount // 10)])
+    return cell
+
+
+def population_memory(storage, amount):
+    """
+    Measures the memory held by the population of a cell, in bytes.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    cell = make_cell(storage, amount)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del cell
+    return after - before
+
+
+def year_time(storage, amount):
+    """
+    Measures the time for each of the cell methods of one year, in seconds.
+
+    Every method is timed on a fresh cell, so that the phases do not affect each other.
+    """
+    timings = {}
+    for name in ('feeding_herbs', 'feeding_carn_with_herbs', 'animal_gives_birth',
+                 'distribute_migrated_animals', 'animal_gets_older', 'animal_dies',
+                 'animal_ages_and_dies'):
+        cell = make_cell(storage, amount)
+        cell.amount_fodder = amount * 5
+        start = time.perf_counter()
+        getattr(cell, name)()
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+if __name__ == '__main__':
+    for amount in (1_000, 10_000, 100_000):
+        print(f'--- {amount} herbivores, {amount // 10} carnivores ---')
+        memory = {storage: population_memory(storage, amount) for storage in ('objects', 'arrays')}
+        print(f'{"memory":>28}: objects {memory["objects"] / 1e6:8.2f} MB, '
+              f'arrays {memory["arrays"] / 1e6:8.2f} MB, '
+              f'ratio {memory["objects"] / memory["arrays"]:6.1f}')
+
+        timings = {storage: year_time(storage, amount) for storage in ('objects', 'arrays')}
+        for name in timings['objects']:
+            obj_time, arr_time = timings['objects'][name], timings['arrays'][name]
+            print(f'{name:>28}: objects {obj_time * 1e3:8.2f} ms, arrays {arr_time * 1e3:8.2f} ms, '
+                  f'speed-up {obj_time / arr_time:6.1f}')
@@ -11,21 +11,71 @@ characteristics are in common and are in the superclass Animals. The specified c
 put in their corresponding subclasses, Herbivores and Carnivores. 
 """
 
+from collections import namedtuple
 from math import exp
-import random
+from sys import getsizeof
+import numpy as np
+
+# Random number generator used by the methods below when they are not given one
+default_rng = np.random.default_rng()
 
 
 class Animals:
     """
     Class for animals with subclasses Herbivores and Carnivores.
+
+    The attributes of each animal are kept in slots instead of an instance dictionary, which
+    saves memory when the population becomes large.
+
+    The fitness is calculated lazily. Methods that change age or weight only mark the fitness
+    as stale, and it is recalculated the next time :attr:`phi` is read.
+
+    Methods that draw random numbers take a :class:`numpy.random.Generator` as the argument
+    rng, so that every simulation can use its own stream. Without rng, :data:`default_rng`
+    is used.
     """
+    __slots__ = ('age', 'weight', '_phi', '_phi_stale')
+
     default_params = None
 
+    # Immutable snapshot of default_params with derived constants, built by _compile_params
+    params = None
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Method for building the parameter snapshot when a species class is defined.
+        """
+        super().__init_subclass__(**kwargs)
+        cls._params_type = namedtuple(cls.__name__ + 'Params', list(cls.default_params)
+                                      + ['birth_demand', 'inv_DeltaPhiMax'])
+        cls._compile_params()
+
+    @classmethod
+    def _compile_params(cls):
+        """
+        Method for building the immutable parameter snapshot of the species.
+
+        The hot methods read their parameters as attributes of the snapshot, and use the
+        derived constants instead of computing them on every call:
+
+        - birth_demand: the weight zeta*(w_birth + sigma_birth) needed to give birth
+        - inv_DeltaPhiMax: 1/DeltaPhiMax, or None for species without DeltaPhiMax
+        """
+        params = cls.default_params
+        delta_phi_max = params.get('DeltaPhiMax')
+        cls.params = cls._params_type(
+            **params,
+            birth_demand=params['zeta'] * (params['w_birth'] + params['sigma_birth']),
+            inv_DeltaPhiMax=1 / delta_phi_max if delta_phi_max is not None else None)
+
     @classmethod
     def set_params(cls, incoming_params):
         """
         Method for setting parameters.
 
+        The parameter snapshot :attr:`params` is rebuilt after the parameters have changed,
+        so parameters should always be changed with this method.
+
         :param incoming_params: Dictionary with parameters to replace default parameters.
         """
         for parameter_key in incoming_params:
@@ -36,16 +86,19 @@ class Animals:
                     raise ValueError('DeltaPhiMax shall be strictly positive.')
                 if parameter_key == 'eta' and not 0 <= incoming_params[parameter_key] <= 1:
                     raise ValueError('Eta must be in [0,1]')
-                cls.default_params.update(incoming_params)
             else:
                 raise KeyError('Invalid parameter name: ' + parameter_key)
 
-    def __init__(self, age=0, weight=None):
+        cls.default_params.update(incoming_params)
+        cls._compile_params()
+
+    def __init__(self, age=0, weight=None, rng=None):
         """
         Method for saving values in class.
 
         :param age: Age of animal
-        :param weight: Weight of animal
+        :param weight: Weight of animal, drawn from the birth weight distribution if None
+        :param rng: Random number generator used to draw the weight
         """
         if age < 0:
             raise ValueError('Age cannot be below zero.')
@@ -55,17 +108,40 @@ class Animals:
             self.age = age
 
         if weight is None:
-            self.weight = random.gauss(self.default_params['w_birth'], self.default_params['sigma_birth'])
+            rng = default_rng if rng is None else rng
+            self.weight = rng.normal(self.params.w_birth, self.params.sigma_birth)
         elif weight < 0:
             raise ValueError('Weight cannot be below zero.')
         else:
             self.weight = weight
 
-        # Defining phi value for use in fitness and procreation functions
-        self.phi = self.fitness()
+        # Defining phi value for use in fitness and procreation functions, calculated when first
+        # read
+        self._phi = 0
+        self._phi_stale = True
 
-        # Defining an attribute that represents if an animal has migrated or not.
-        self.has_migrated = False
+    @property
+    def nbytes(self):
+        """
+        Estimated number of bytes used by the animal object and its attribute values.
+
+        Small integers and booleans are shared by all Python objects, and are not counted.
+        """
+        return getsizeof(self) + getsizeof(self.weight) + getsizeof(self._phi)
+
+    @property
+    def phi(self):
+        """
+        Fitness of the animal, recalculated with :meth:`fitness` if age or weight has changed.
+        """
+        if self._phi_stale:
+            return self.fitness()
+        return self._phi
+
+    @phi.setter
+    def phi(self, value):
+        self._phi = value
+        self._phi_stale = False
 
     @staticmethod
     def q_func(x, x_half, phi_aw, pos_neg):
@@ -108,24 +184,79 @@ class Animals:
 
         :return: Value of phi
         """
-        if self.weight == 0:
-            self.phi = 0
-        else:
-            q_pos = self.q_func(self.age, self.default_params['a_half'], self.default_params['phi_age'], 1)
-            q_neg = self.q_func(self.weight, self.default_params['w_half'], self.default_params['phi_weight'], -1)
-            self.phi = q_pos * q_neg
+        self._phi = self.fitness_value(self.age, self.weight)
+        self._phi_stale = False
 
-        return self.phi
+        return self._phi
+
+    @classmethod
+    def fitness_value(cls, age, weight):
+        """
+        Method for calculating the fitness for a given age and weight of this species.
+
+        :param age: Age of animal
+        :param weight: Weight of animal
+        :return: Value of phi
+        """
+        if weight == 0:
+            return 0
+
+        params = cls.params
+        q_pos = 1 / (1 + exp(params.phi_age * (age - params.a_half)))
+        q_neg = 1 / (1 + exp(-params.phi_weight * (weight - params.w_half)))
+        return q_pos * q_neg
+
+    @classmethod
+    def fitness_batch(cls, ages, weights):
+        """
+        Method for calculating fitness of many animals of the same species at once.
+
+        Uses the same formula as :meth:`fitness`, but evaluates it with NumPy for whole arrays.
+
+        :param ages: Sequence with ages of the animals
+        :param weights: Sequence with weights of the animals
+        :return: Array with the value of phi for each animal
+        """
+        params = cls.params
+        ages = np.asarray(ages, dtype=float)
+        weights = np.asarray(weights, dtype=float)
+
+        with np.errstate(over='ignore'):
+            q_pos = 1 / (1 + np.exp(params.phi_age * (ages - params.a_half)))
+            q_neg = 1 / (1 + np.exp(-params.phi_weight * (weights - params.w_half)))
+
+        return np.where(weights == 0, 0.0, q_pos * q_neg)
+
+    @classmethod
+    def update_fitness(cls, animals):
+        """
+        Method for recalculating the stale fitness of a list of animals with one call to
+        :meth:`fitness_batch`.
+
+        Used before reading the fitness of many animals, instead of recalculating each animal
+        on its own when :attr:`phi` is read.
+
+        :param animals: List with animals of this species
+        """
+        stale_animals = [animal for animal in animals if animal._phi_stale]
+        if len(stale_animals) == 0:
+            return
+
+        ages = [animal.age for animal in stale_animals]
+        weights = [animal.weight for animal in stale_animals]
+        for animal, phi in zip(stale_animals, cls.fitness_batch(ages, weights).tolist()):
+            animal._phi = phi
+            animal._phi_stale = False
 
     def aging(self):
         """
         Method for aging each animal. Will increase by one every new year.
         """
         self.age += 1
-        self.weight -= (self.default_params['eta'] * self.weight)
-        self.fitness()
+        self.weight -= (self.params.eta * self.weight)
+        self._phi_stale = True
 
-    def procreation(self, amount_same_species):
+    def procreation(self, amount_same_species, rng=None):
         r"""
         Method to determine the probability of birth.
 
@@ -146,26 +277,171 @@ class Animals:
             w < \zeta(w_{birth} + \sigma_{birth})
             \end{equation}
 
+        The birth weight is drawn before the newborn is created, and the newborn is only
+        created if the mother weighs more than xi times the birth weight.
+
+        :param amount_same_species: Number of animals of the same species in the cell
+        :param rng: Random number generator
         :return: Returns None if there is no birth, and returns newborn if there is new offspring
         """
-        birth_prob = min(1, self.default_params['gamma']*self.phi*(amount_same_species-1))
-        demand = self.default_params['zeta']*(self.default_params['w_birth']+self.default_params['sigma_birth'])
-
-        if self.weight < demand:
+        rng = default_rng if rng is None else rng
+        params = self.params
+        if self.weight < params.birth_demand:
             return None
         else:
-            if random.random() < birth_prob:
-                newborn = type(self)()
-                if self.weight > self.default_params['xi'] * newborn.weight:
-                    self.weight -= self.default_params['xi'] * newborn.weight
-                    self.fitness()
-                    return newborn
+            if rng.random() < min(1, params.gamma*self.phi*(amount_same_species-1)):
+                newborn_weight = rng.normal(params.w_birth, params.sigma_birth)
+                if 0 < newborn_weight and params.xi * newborn_weight < self.weight:
+                    self.weight -= params.xi * newborn_weight
+                    self._phi_stale = True
+                    return self.newborns([newborn_weight])[0]
                 else:
                     return None
             else:
                 return None
 
-    def death(self):
+    @classmethod
+    def newborns(cls, weights):
+        """
+        Method for creating many newborns of this species at once.
+
+        The newborns are created without calling :meth:`__init__`, so the weights are not
+        checked. They must come from a birth, where the weight is already known to be positive.
+
+        :param weights: Sequence with the birth weights
+        :return: List with the newborns
+        """
+        new = cls.__new__
+        newborns = []
+        for weight in weights:
+            newborn = new(cls)
+            newborn.age = 0
+            newborn.weight = weight
+            newborn._phi = 0
+            newborn._phi_stale = True
+            newborns.append(newborn)
+
+        return newborns
+
+    @classmethod
+    def procreation_batch(cls, weights, phis, amount_same_species, rng=None):
+        """
+        Method for deciding which of many animals of the same species give birth.
+
+        Follows the same rules as :meth:`procreation`, but for all animals in a cell at once:
+        only animals heavy enough draw whether they give birth, and the birth weights are
+        only drawn for the animals that do. A newborn must weigh more than zero, and the
+        mother must weigh more than xi times the newborn.
+
+        :param weights: Array with the weights of the animals
+        :param phis: Array with the fitness of the animals
+        :param amount_same_species: Number of animals of the same species in the cell, or an
+                                    array with this number for the cell of each animal
+        :param rng: Random number generator
+        :return: Array with the indices of the mothers, and array with the weights of their newborns
+        """
+        rng = default_rng if rng is None else rng
+        params = cls.params
+        weights = np.asarray(weights, dtype=float)
+        phis = np.asarray(phis, dtype=float)
+        amount_same_species = np.broadcast_to(amount_same_species, weights.shape)
+
+        candidates = np.flatnonzero((weights >= params.birth_demand) & (amount_same_species >= 2))
+        if len(candidates) == 0:
+            return np.zeros(0, dtype=int), np.zeros(0)
+
+        birth_prob = np.minimum(1, params.gamma * phis[candidates]
+                                * (amount_same_species[candidates] - 1))
+        candidates = candidates[rng.random(len(candidates)) < birth_prob]
+
+        newborn_weights = rng.normal(params.w_birth, params.sigma_birth, len(candidates))
+        births = (newborn_weights > 0) & (weights[candidates] > params.xi * newborn_weights)
+
+        return candidates[births], newborn_weights[births]
+
+    @classmethod
+    def give_birth(cls, animals, rng=None):
+        """
+        Method for letting a list of animals of this species give birth, using
+        :meth:`procreation_batch`.
+
+        The mothers lose xi times the weight of their newborn, and the newborns are only
+        created for the births that happen, with :meth:`newborns`.
+
+        :param animals: List with animals of this species in one cell
+        :param rng: Random number generator
+        :return: List with the newborns
+        """
+        if len(animals) < 2:
+            return []
+
+        cls.update_fitness(animals)
+        weights = np.array([animal.weight for animal in animals])
+        phis = np.array([animal.phi for animal in animals])
+        mothers, newborn_weights = cls.procreation_batch(weights, phis, len(animals), rng)
+
+        mother_weights = weights[mothers] - cls.params.xi * newborn_weights
+        for mother, weight in zip(mothers.tolist(), mother_weights.tolist()):
+            animals[mother].weight = weight
+            animals[mother]._phi_stale = True
+
+        return cls.newborns(newborn_weights.tolist())
+
+    @classmethod
+    def aging_and_death_batch(cls, ages, weights, rng=None):
+        """
+        Method for the end of the year for many animals of the same species at once.
+
+        Ages the animals, applies the annual weight loss, recalculates the fitness and draws
+        which animals die, following :meth:`aging` and :meth:`death`.
+
+        :param ages: Array with the ages of the animals
+        :param weights: Array with the weights of the animals
+        :param rng: Random number generator
+        :return: Arrays with the new ages, weights and fitness, and a boolean array that is
+                 True for the animals that survive.
+        """
+        rng = default_rng if rng is None else rng
+        params = cls.params
+        ages = np.asarray(ages) + 1
+        weights = np.asarray(weights, dtype=float)
+        weights = weights - params.eta * weights
+        phis = cls.fitness_batch(ages, weights)
+
+        dies = (weights == 0) | (rng.random(len(weights)) < params.omega * (1 - phis))
+
+        return ages, weights, phis, ~dies
+
+    @classmethod
+    def age_and_die(cls, animals, rng=None):
+        """
+        Method for aging a list of animals of this species and removing the ones that die.
+
+        Uses :meth:`aging_and_death_batch`, and compacts the surviving animals at the front
+        of the list.
+
+        :param animals: List with animals of this species in one cell
+        :param rng: Random number generator
+        """
+        if len(animals) == 0:
+            return
+
+        ages, weights, phis, survives = cls.aging_and_death_batch(
+            [animal.age for animal in animals], [animal.weight for animal in animals], rng)
+
+        amount_survivors = 0
+        for animal, age, weight, phi, alive in zip(animals, ages.tolist(), weights.tolist(),
+                                                   phis.tolist(), survives.tolist()):
+            if alive:
+                animal.age = age
+                animal.weight = weight
+                animal._phi = phi
+                animal._phi_stale = False
+                animals[amount_survivors] = animal
+                amount_survivors += 1
+        del animals[amount_survivors:]
+
+    def death(self, rng=None):
         r"""
         Method of deciding if the animal dies or not.
 
@@ -174,22 +450,26 @@ class Animals:
             \omega(1 - \Phi)
             \end{equation}
 
+        :param rng: Random number generator
         :return: True if animal dies, and False if it survives.
         """
-        death_prob = self.default_params['omega'] * (1 - self.phi)
         if self.weight == 0:
             return True
         else:
-            return random.random() < death_prob
+            rng = default_rng if rng is None else rng
+            return rng.random() < self.params.omega * (1 - self.phi)
 
-    def probability_migrate(self):
+    def probability_migrate(self, rng=None):
         """
         Method for deciding if the animal wants to migrate.
 
         The probability to move is calculated with mu * fitness of the animal.
+
+        :param rng: Random number generator
         """
-        prob_migrate = self.default_params['mu'] * self.phi
-        if random.random() < prob_migrate:
+        rng = default_rng if rng is None else rng
+        prob_migrate = self.params.mu * self.phi
+        if rng.random() < prob_migrate:
             return True
         else:
             return False
@@ -199,6 +479,8 @@ class Herbivores(Animals):
     """
     Subclass for herbivores, with Animals as superclass.
     """
+    __slots__ = ()
+
     default_params = {
                     'w_birth': 8.0,
                     'sigma_birth': 1.5,
@@ -217,28 +499,31 @@ class Herbivores(Animals):
 
     species = 'Herbivores'
 
-    def __init__(self, age=0, weight=None):
+    def __init__(self, age=0, weight=None, rng=None):
         """
         Method for saving values in class.
 
         :param age: Age of herbivore
         :param weight: Weight of herbivore
+        :param rng: Random number generator used to draw the weight
         """
-        super().__init__(age, weight)
+        super().__init__(age, weight, rng)
 
     def herbs_eating(self, amount_fodder):
         """
         Method for deciding how much a herbivore eats.
 
+        :param amount_fodder: Amount of fodder available in the cell
         :return: Eaten amount
         """
-        if self.default_params['F'] < amount_fodder:
-            amount_eaten = self.default_params['F']
+        params = self.params
+        if params.F < amount_fodder:
+            amount_eaten = params.F
         else:
             amount_eaten = amount_fodder
 
-        self.weight += self.default_params['beta']*amount_eaten
-        self.fitness()
+        self.weight += params.beta*amount_eaten
+        self._phi_stale = True
 
         return amount_eaten
 
@@ -247,6 +532,8 @@ class Carnivores(Animals):
     """
     Subclass for carnivores, with Animals as superclass.
     """
+    __slots__ = ()
+
     default_params = {
                     'w_birth': 6.0,
                     'sigma_birth': 1.0,
@@ -266,15 +553,19 @@ class Carnivores(Animals):
 
     species = 'Carnivores'
 
-    def __init__(self, age=0, weight=None):
+    # Number of herbivores in the first batch of random numbers drawn by hunt_batch
+    hunt_chunk = 16
+
+    def __init__(self, age=0, weight=None, rng=None):
         """
         Method for saving values in class.
         :param age: Age of carnivore
         :param weight: Weight of carnivore.
+        :param rng: Random number generator used to draw the weight
         """
-        super().__init__(age, weight)
+        super().__init__(age, weight, rng)
 
-    def carns_eating_herbs(self, sorted_list_fitness_herbs):
+    def carns_eating_herbs(self, sorted_list_fitness_herbs, rng=None):
         r"""
         Method for carnivores hunting herbivores.
 
@@ -301,28 +592,117 @@ class Carnivores(Animals):
             \end{equation}
 
         :param sorted_list_fitness_herbs: List with sorted fitness for herbs.
+        :param rng: Random number generator
         :return: List of dead herbivores.
         """
-
+        rng = default_rng if rng is None else rng
+        params = self.params
         eaten_herbs = []
         weight_eaten_herbs = 0
 
         for herb in sorted_list_fitness_herbs:
-            if self.phi <= herb.phi:
+            # Reading phi recalculates the fitness of the carnivore once after each kill
+            phi_difference = self.phi - herb.phi
+            if phi_difference <= 0:
                 prob_kill = 0
-            elif 0 < (self.phi - herb.phi) < self.default_params['DeltaPhiMax']:
-                prob_kill = (self.phi - herb.phi) / self.default_params['DeltaPhiMax']
+            elif phi_difference < params.DeltaPhiMax:
+                prob_kill = phi_difference * params.inv_DeltaPhiMax
             else:
                 prob_kill = 1
 
-            if random.random() < prob_kill:
-                amount_eaten = min(herb.weight, self.default_params['F'] - weight_eaten_herbs)
-                self.weight += self.default_params['beta'] * amount_eaten
-                self.fitness()
+            if rng.random() < prob_kill:
+                amount_eaten = min(herb.weight, params.F - weight_eaten_herbs)
+                self.weight += params.beta * amount_eaten
+                self._phi_stale = True
                 eaten_herbs.append(herb)
                 weight_eaten_herbs += amount_eaten
 
-                if weight_eaten_herbs >= self.default_params['F']:
+                if weight_eaten_herbs >= params.F:
                     return eaten_herbs
 
         return eaten_herbs
+
+    @classmethod
+    def hunt_batch(cls, age, weight, phi, herb_phis, herb_weights, alive, rng=None):
+        """
+        Method for one carnivore hunting herbivores that are given as arrays sorted by fitness.
+
+        Follows the same rules as :meth:`carns_eating_herbs`: the herbivores are tried in
+        ascending order of fitness, a herbivore that is eaten is not eaten again, and the
+        carnivore stops when it has eaten F. The random numbers for the herbivores are drawn
+        in batches, starting with :attr:`hunt_chunk` herbivores and doubling the batch for
+        every new batch. Since the kill probability is zero for herbivores that are at least as fit
+        as the carnivore, the hunt stops as soon as only such herbivores are left.
+
+        :param age: Age of the carnivore
+        :param weight: Weight of the carnivore
+        :param phi: Fitness of the carnivore
+        :param herb_phis: Array with the fitness of the herbivores, in ascending order
+        :param herb_weights: Array with the weights of the herbivores, in the same order
+        :param alive: Boolean array, True for herbivores that have not been eaten. Updated in place.
+        :param rng: Random number generator
+        :return: Weight of the carnivore after hunting, and the number of herbivores it killed.
+        """
+        rng = default_rng if rng is None else rng
+        params = cls.params
+        weight_eaten_herbs = 0
+        amount_killed = 0
+
+        # Only herbivores with lower fitness than the carnivore can be killed
+        limit = np.searchsorted(herb_phis, phi, side='left')
+        start = int(np.argmax(alive[:limit])) if limit > 0 else 0
+        if limit == 0 or not alive[start]:
+            return weight, amount_killed
+        chunk = cls.hunt_chunk
+
+        while start < limit:
+            stop = min(start + chunk, limit)
+            candidates = start + np.flatnonzero(alive[start:stop])
+            draws = rng.random(len(candidates))
+            position = 0
+
+            while position < len(candidates):
+                prob_kill = np.minimum((phi - herb_phis[candidates[position:]])
+                                       * params.inv_DeltaPhiMax, 1)
+                hits = np.flatnonzero(draws[position:] < prob_kill)
+                if len(hits) == 0:
+                    break
+
+                position += hits[0]
+                herb = candidates[position]
+                amount_eaten = min(herb_weights[herb], params.F - weight_eaten_herbs)
+                weight += params.beta * amount_eaten
+                phi = cls.fitness_value(age, weight)
+                alive[herb] = False
+                amount_killed += 1
+                weight_eaten_herbs += amount_eaten
+                position += 1
+
+                if weight_eaten_herbs >= params.F:
+                    return weight, amount_killed
+
+            # A fitter carnivore can reach herbivores that were out of reach before
+            start = stop
+            chunk *= 2
+            limit = np.searchsorted(herb_phis, phi, side='left')
+
+        return weight, amount_killed
+
+    def hunting(self, herb_phis, herb_weights, alive, rng=None):
+        """
+        Method for hunting herbivores that are given as arrays sorted by fitness, see
+        :meth:`hunt_batch`.
+
+        :param herb_phis: Array with the fitness of the herbivores, in ascending order
+        :param herb_weights: Array with the weights of the herbivores, in the same order
+        :param alive: Boolean array, True for herbivores that have not been eaten. Updated in place.
+        :param rng: Random number generator
+        :return: Number of herbivores killed.
+        """
+        weight, amount_killed = self.hunt_batch(self.age, self.weight, self.phi, herb_phis,
+                                                herb_weights, alive, rng)
+        if amount_killed > 0:
+            self.weight = weight
+            self._phi_stale = True
+
+        return amount_killed
@@ -3,7 +3,7 @@
 __author__ = 'Andrine Zimmermann, Karin Mollatt'
 __email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
 
-import random
+import numpy as np
 
 """
 :mod: 'biosim.island' contains information about the annual cycle of Rossumøya. 
@@ -11,9 +11,64 @@ import random
 This file only has one class, Island. 
 """
 
+from collections import namedtuple
+
+from .animals import default_rng
 from .landscapes import Lowland, Highland, Desert, Water
 
 
+class IslandSnapshot(namedtuple('IslandSnapshot',
+                                ['herb_counts', 'carn_counts', 'total_herbs', 'total_carns',
+                                 'herb_phi', 'carn_phi', 'herb_age', 'carn_age',
+                                 'herb_weight', 'carn_weight', 'herb_amounts', 'carn_amounts'],
+                                defaults=(None, None))):
+    """
+    Class for the statistics of the island at one moment, see :meth:`Island.snapshot`.
+
+    The counts are 2-D arrays with the number of animals in each cell, and the totals the number of
+    animals in the habitable cells. The traits are arrays with one value per animal, or None if the
+    snapshot was taken without traits. None of the arrays can be written to.
+
+    For cohort storage, the traits have one value per cohort, and the amounts the number of
+    animals in each cohort, to be used as weights. Otherwise the amounts are None.
+    """
+
+    __slots__ = ()
+
+    @property
+    def amount_animals_species(self):
+        """
+        Dictionary with the amount of animals per species.
+        """
+        return {'Herbivore': self.total_herbs, 'Carnivore': self.total_carns}
+
+
+def traits_of_snapshot(herb_traits, carn_traits):
+    """
+    Function for splitting the trait arrays of both species into the trait fields of a snapshot.
+
+    :param herb_traits: Array with a row for the fitness, age and weight of the herbivores, and
+                        a fourth row with the amounts for cohort storage
+    :param carn_traits: Array with the same rows for the carnivores
+    :return: Tuple with the trait fields of :class:`IslandSnapshot`, from herb_phi on.
+    """
+    amounts = (herb_traits[3], carn_traits[3]) if len(herb_traits) == 4 else (None, None)
+    return (herb_traits[0], carn_traits[0], herb_traits[1], carn_traits[1],
+            herb_traits[2], carn_traits[2]) + amounts
+
+
+def freeze(*arrays):
+    """
+    Function for making arrays read-only.
+
+    :param arrays: NumPy arrays
+    :return: The same arrays, as a tuple.
+    """
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
 class Island:
     """
     Class for Island.
@@ -24,21 +79,43 @@ class Island:
                   'D': Desert,
                   'W': Water}
 
-    def __init__(self, island_map, ini_pop):
+    # Movement for north, south, east and west, indexed by the directions drawn in
+    # find_adjacent_cell_migrate
+    migration_steps = np.array([(0, 1), (0, -1), (1, 0), (-1, 0)])
+
+    def __init__(self, island_map, ini_pop, storage='objects', rng=None):
         """
         Method for saving values in class.
 
         :param island_map: Multi-line string specifying island geography
         :param ini_pop: List of dictionaries specifying initial population
+        :param storage: Population storage used in the cells, 'objects', 'arrays' or 'cohorts'
+        :param rng: Random number generator shared by the island and its cells, the shared
+                    :data:`biosim.animals.default_rng` if None.
         """
+        self.storage = storage
+        self.rng = default_rng if rng is None else rng
         self.ini_pop = ini_pop
         self.map_string = island_map
         self.map_lines = island_map.splitlines()
         self.map = self.creating_map(island_map)
+        self.creating_grid()
+
+        # Position of each cell in the order the annual cycle visits the cells
+        self._cell_order = {loc: order for order, loc in enumerate(self.map)}
+        # Locations of the cells with animals
+        self.active_cells = set()
+
         self.adding_population(self.ini_pop)
+        self.checking_map()
 
+    def checking_map(self):
+        """
+        Method for checking that the lines of the map have equal length, and that the island is
+        surrounded by water.
+        """
         for line in self.map_lines:
-            if len(line) is not len(self.map_lines[0]):
+            if len(line) != len(self.map_lines[0]):
                 raise ValueError(f'Each line must be of equal length.')
 
         for i in range(len(self.map_lines[0])):
@@ -67,25 +144,129 @@ class Island:
 
         for loc_x, lines in enumerate(list_map_string):
             for loc_y, landscape_type in enumerate(lines):
-                map_dict[(1 + loc_x, 1 + loc_y)] = self.map_params[landscape_type]()
+                map_dict[(1 + loc_x, 1 + loc_y)] = self.map_params[landscape_type](self.storage,
+                                                                                   self.rng)
 
         return map_dict
 
+    def creating_grid(self):
+        """
+        Method for keeping the cells of the island in dense 2-D arrays.
+
+        The cell at location (x, y) is element (x - 1, y - 1) of every array, see
+        :meth:`grid_index`.
+        :attr:`cells` holds the landscape objects, :attr:`landscape_codes` the index of the
+        landscape type of each cell in :attr:`map_params`, :attr:`habitable` whether animals
+        can live in the cell, and :attr:`fodder` the amount of fodder, which each cell reads and
+        writes through a view. :attr:`herb_counts` and :attr:`carn_counts` hold the number of
+        animals in each cell, and :attr:`total_herbs` and :attr:`total_carns` the number of
+        animals in the habitable cells, see :meth:`update_counts`.
+        """
+        shape = (max(loc[0] for loc in self.map), max(loc[1] for loc in self.map))
+        type_codes = {landscape: code for code, landscape in enumerate(self.map_params.values())}
+
+        self.cells = np.empty(shape, dtype=object)
+        self.landscape_codes = np.full(shape, type_codes[Water], dtype=np.intp)
+        self.habitable = np.zeros(shape, dtype=bool)
+        self.fodder = np.zeros(shape)
+        for (loc_x, loc_y), cell in self.map.items():
+            self.cells[loc_x - 1, loc_y - 1] = cell
+            self.landscape_codes[loc_x - 1, loc_y - 1] = type_codes[type(cell)]
+            self.habitable[loc_x - 1, loc_y - 1] = cell.available
+            cell.bind_fodder(self.fodder[loc_x - 1, loc_y - 1:loc_y])
+
+        self.herb_counts = np.zeros(shape, dtype=np.int64)
+        self.carn_counts = np.zeros(shape, dtype=np.int64)
+        self.total_herbs = 0
+        self.total_carns = 0
+        self.creating_neighbour_tables()
+
+    def creating_neighbour_tables(self):
+        """
+        Method for finding the neighbours of every cell once, for the migration.
+
+        The cells are numbered row by row, see :meth:`flat_index`. Row i of :attr:`neighbours`
+        holds the numbers of the neighbouring cells of cell i, in the order of
+        :attr:`migration_steps`, and row i of :attr:`neighbour_habitable` whether animals can move
+        there. The cells on the edge of the map are water, so their missing neighbours are
+        replaced by the nearest cell on the edge. The tables only depend on the map, and must be
+        made again if the map changes.
+        """
+        amount_rows, amount_cols = self.cells.shape
+        grid_x, grid_y = np.indices(self.cells.shape).reshape(2, -1, 1)
+
+        next_x = np.clip(grid_x + self.migration_steps[:, 0], 0, amount_rows - 1)
+        next_y = np.clip(grid_y + self.migration_steps[:, 1], 0, amount_cols - 1)
+        self.neighbours = next_x * amount_cols + next_y
+        self.neighbour_habitable = self.habitable.ravel()[self.neighbours]
+        self.flat_locs = [(loc_x + 1, loc_y + 1)
+                          for loc_x in range(amount_rows) for loc_y in range(amount_cols)]
+
+    @staticmethod
+    def grid_index(loc):
+        """
+        Method for finding the element of the grid arrays that belongs to a location.
+
+        :param loc: Location tuple, counted from 1
+        :return: Tuple with the row and column in the grid arrays.
+        """
+        return loc[0] - 1, loc[1] - 1
+
+    def flat_index(self, loc):
+        """
+        Method for finding the number of a cell, counted row by row from zero.
+
+        :param loc: Location tuple, counted from 1
+        :return: Number of the cell, the index of its row in :attr:`neighbours`.
+        """
+        index_x, index_y = self.grid_index(loc)
+        return index_x * self.cells.shape[1] + index_y
+
+    def update_counts(self, loc):
+        """
+        Method for updating the counts of a cell whose animals have changed.
+
+        The island keeps the number of animals of each species in every cell, and in total, up
+        to date with this method after every phase that adds or removes animals in a cell:
+        adding a population, feeding, birth, migration, and aging and death. Only the cells
+        that were visited are counted again, and the totals are changed by the difference.
+
+        :param loc: Location tuple
+        """
+        index = self.grid_index(loc)
+        cell = self.cells[index]
+        herb_change = cell.amount_herbs - self.herb_counts[index]
+        carn_change = cell.amount_carns - self.carn_counts[index]
+
+        self.herb_counts[index] += herb_change
+        self.carn_counts[index] += carn_change
+        if self.habitable[index]:
+            self.total_herbs += int(herb_change)
+            self.total_carns += int(carn_change)
+
+    def regrow_fodder(self):
+        """
+        Method for regrowing the fodder of every cell at once.
+
+        Every cell gets the amount f_max of its landscape type.
+        """
+        f_max = np.array([landscape.params_fodder['f_max']
+                          for landscape in self.map_params.values()], dtype=float)
+        self.fodder[:] = f_max[self.landscape_codes]
+
     @property
     def row_length(self):
         """
         Number of rows.
         """
-        list_map_string = self.map_string.strip().split('\n')
-        return len(list_map_string[0])
+        return self.cells.shape[1]
 
     @property
     def col_length(self):
         """
         Number of columns.
         """
-        list_map_string = self.map_string.strip().split('\n')
-        return len(list_map_string)
+        return self.cells.shape[0]
 
     def adding_population(self, incoming_pop=None):
         """
@@ -105,106 +286,227 @@ class Island:
 
             pop = dict_loc_pop['pop']
             self.map[loc].animals_population(pop)
+            self.update_counts(loc)
+            if self.map[loc].amount_herbs + self.map[loc].amount_carns > 0:
+                self._activate(loc)
+
+    def _activate(self, loc):
+        """
+        Method for adding a cell that has got animals to the active cells.
+
+        :param loc: Location tuple
+        """
+        self.active_cells.add(loc)
+
+    def ordered_active_cells(self):
+        """
+        Method for listing the active cells in the same order as in the map.
+
+        :return: List with the locations of the active cells.
+        """
+        return sorted(self.active_cells, key=self._cell_order.get)
 
     def animals_per_species(self):
         """
         Method for creating a dictionary containing the amount of animals per species.
 
+        Reads the totals kept by :meth:`update_counts`.
+
         :return: Dictionary with the amount of animals per species.
         """
-        amount_herbs = 0
-        amount_carns = 0
-
-        for cell in self.map:
-            if self.map[cell].available:
-                herb_list = self.map[cell].list_herbivores
-                carn_list = self.map[cell].list_carnivores
-                amount_herbs += len(herb_list)
-                amount_carns += len(carn_list)
-
-        amount_animals_species = {'Herbivore': amount_herbs, 'Carnivore': amount_carns}
-        total_amount_animals = amount_herbs + amount_carns
+        amount_animals_species = {'Herbivore': self.total_herbs, 'Carnivore': self.total_carns}
+        total_amount_animals = self.total_herbs + self.total_carns
         return amount_animals_species, total_amount_animals
 
-    @staticmethod
-    def find_adjacent_cell_migrate(cell):
+    def memory_footprint(self):
         """
-        Method for finding the neighbouring cells, and deciding which cell to migrate to.
+        Method for estimating the memory used by the animals on the island.
 
-        :return: The cell to be migrated to.
+        :return: Dictionary with the number of bytes used by each species.
         """
-        x_loc, y_loc = cell
-
-        north_loc = (x_loc, y_loc + 1)
-        south_loc = (x_loc, y_loc - 1)
-        east_loc = (x_loc + 1, y_loc)
-        west_loc = (x_loc - 1, y_loc)
+        footprint = {'Herbivore': 0, 'Carnivore': 0}
 
-        loc_list = [north_loc, south_loc, east_loc, west_loc]
+        for cell in self.map.values():
+            for species, cell_bytes in cell.memory_footprint().items():
+                footprint[species] += cell_bytes
 
-        selected_cell = random.choice(loc_list)
-        return selected_cell
+        return footprint
 
-    def migrating_animals(self, cell):
+    def find_adjacent_cell_migrate(self, cell, amount=1):
         """
-        Method for migrating animals.
+        Method for deciding which neighbouring cell each migrating animal moves to.
 
-        Ensures that the cell is an available landscape type. Water is the only unavailable landscape.
-        Puts the migrating animals in a new cell (location), and adds the animal to the population in that
-        cell. Also makes sure that the animal is removed from the population to the previous cell.
+        The directions of all migrating animals in the cell are drawn at once, and looked up in
+        the neighbour tables, see :meth:`creating_neighbour_tables`. Animals that draw a cell
+        where they cannot live stay where they are.
 
         :param cell: Location tuple
+        :param amount: Number of migrating animals
+        :return: Dictionary with the neighbouring cells that animals move to as keys, and arrays
+                 with the positions among the migrating animals of the animals that move there as
+                 values.
         """
-        moved_herbs = []
-        moved_carns = []
+        flat = self.flat_index(cell)
+        directions = self.rng.integers(len(self.migration_steps), size=amount)
 
-        if self.map[cell].available is True:
-            migrated_herbs, migrated_carns = self.map[cell].distribute_migrated_animals()
+        next_locs = {}
+        for direction in np.flatnonzero(self.neighbour_habitable[flat]):
+            positions = np.flatnonzero(directions == direction)
+            if len(positions) > 0:
+                next_locs[self.flat_locs[self.neighbours[flat, direction]]] = positions
+        return next_locs
 
-            for herb in migrated_herbs:
-                next_loc = self.find_adjacent_cell_migrate(cell)
-                if self.map[next_loc].available is False:
-                    break
-                else:
-                    self.map[next_loc].add_single_animal(herb)
-                    herb.has_migrated = True
-                    moved_herbs.append(herb)
+    def find_adjacent_cohorts_migrate(self, cell, cohorts, amount_movers):
+        """
+        Method for deciding how many migrating animals of each cohort move to each neighbouring
+        cell.
 
-            self.map[cell].list_herbivores = [herb for herb in self.map[cell].list_herbivores
-                                              if herb not in moved_herbs]
+        The animals of a cohort are split between the neighbouring cells with one multinomial draw,
+        and the cells are looked up as in :meth:`find_adjacent_cell_migrate`.
 
-            for carn in migrated_carns:
-                next_loc = self.find_adjacent_cell_migrate(cell)
-                if self.map[next_loc].available is False:
-                    break
+        :param cell: Location tuple
+        :param cohorts: Array with the indices of the cohorts with migrating animals
+        :param amount_movers: Array with the number of migrating animals in each of these cohorts
+        :return: Dictionary with the neighbouring cells that animals move to as keys, and tuples
+                 with the cohort indices and the number of animals of each cohort that move there
+                 as values.
+        """
+        flat = self.flat_index(cell)
+        amount_directions = len(self.migration_steps)
+        split = self.rng.multinomial(amount_movers, [1 / amount_directions] * amount_directions)
+        split = split.reshape(-1, amount_directions)
+
+        next_locs = {}
+        for direction in np.flatnonzero(self.neighbour_habitable[flat]):
+            moving = np.flatnonzero(split[:, direction])
+            if len(moving) > 0:
+                next_locs[self.flat_locs[self.neighbours[flat, direction]]] = \
+                    (cohorts[moving], split[moving, direction])
+        return next_locs
+
+    def migrating_animals(self):
+        """
+        Method for migrating the animals of every active cell, in two phases.
+
+        First, every cell decides which animals want to move, with
+        :meth:`biosim.landscapes.Landscapes.distribute_migrated_animals`, and draws the cells they
+        move to with :meth:`find_adjacent_cell_migrate`, or with
+        :meth:`find_adjacent_cohorts_migrate` for cohort storage. All decisions are made before any
+        animal moves. An animal that draws a cell where animals cannot live, water, stays.
+
+        Then all moves are applied at once: the animals leave their cells with
+        :meth:`biosim.landscapes.Landscapes.emigrate`, and arrive in their new cells with
+        :meth:`biosim.landscapes.Landscapes.immigrate`. Since no animal arrives before every cell
+        has decided, each animal migrates at most once a year, whatever the order of the cells.
+        """
+        decided = []
+        for loc in self.ordered_active_cells():
+            if not self.habitable[self.grid_index(loc)]:
+                continue
+
+            moves = []
+            for movers in self.map[loc].distribute_migrated_animals():
+                if self.storage == 'cohorts':
+                    moves.append(self.find_adjacent_cohorts_migrate(loc, *movers))
                 else:
-                    self.map[next_loc].add_single_animal(carn)
-                    carn.has_migrated = True
-                    moved_carns.append(carn)
+                    moves.append({next_loc: movers[positions] for next_loc, positions
+                                  in self.find_adjacent_cell_migrate(loc, len(movers)).items()})
+            decided.append((loc, moves[0], moves[1]))
+
+        for loc, herb_moves, carn_moves in decided:
+            if len(herb_moves) + len(carn_moves) == 0:
+                continue
+
+            leaving_herbs, leaving_carns = self.map[loc].emigrate(list(herb_moves.values()),
+                                                                  list(carn_moves.values()))
+            self.update_counts(loc)
+            for next_loc, herbs in zip(herb_moves, leaving_herbs):
+                self.map[next_loc].immigrate(herbs=herbs)
+                self.update_counts(next_loc)
+                self._activate(next_loc)
+            for next_loc, carns in zip(carn_moves, leaving_carns):
+                self.map[next_loc].immigrate(carns=carns)
+                self.update_counts(next_loc)
+                self._activate(next_loc)
 
-            self.map[cell].list_carnivores = [carn for carn in self.map[cell].list_carnivores
-                                              if carn not in moved_carns]
+    def heatmap_population(self):
+        """
+        Method for creating population distribution of heatmap for herbivores and carnivores.
 
-    def restart_migration(self):
+        Returns the count grids kept by :meth:`update_counts`, which must not be changed.
+
+        :return: 2D arrays with population in each cell for herbivores and carnivores.
         """
-        Method for setting has_migrated attribute back to False at the end of the year.
+        return self.herb_counts, self.carn_counts
 
-        An animal can only migrate once each year.
+    def snapshot(self, traits=True):
         """
-        for cell in self.map:
-            self.map[cell].annual_restart_migration()
+        Method for collecting the statistics of the island in one pass over the active cells.
 
-    def heatmap_population(self):
+        The counts are copied from the count grids, see :meth:`update_counts`. The arrays for the
+        fitness, age and weight of both species are allocated once, see :meth:`trait_entries`, and
+        each cell writes its animals into its own part of them with
+        :meth:`biosim.landscapes.Landscapes.write_traits`. The cells are visited in the order of the
+        map. The ages are stored as floats, in the same array as the other traits, and so are the
+        amounts of animals in the cohorts for cohort storage.
+
+        :param traits: If False, only the counts are collected.
+        :return: Read-only :class:`IslandSnapshot`.
         """
-        Method for creating population distribution of heatmap for herbivores and carnivores.
+        herb_counts, carn_counts = freeze(self.herb_counts.copy(), self.carn_counts.copy())
+        if not traits:
+            return IslandSnapshot(herb_counts, carn_counts, self.total_herbs, self.total_carns,
+                                  None, None, None, None, None, None)
 
-        :return: 2D arrays with population in each cell for herbivores and carnivores.
+        # One row per trait, in the order fitness, age and weight, and the amounts for cohorts
+        herb_entries, carn_entries = self.trait_entries()
+        herb_traits = np.empty((self.trait_rows, herb_entries))
+        carn_traits = np.empty((self.trait_rows, carn_entries))
+        self.writing_traits(herb_traits, carn_traits)
+
+        freeze(herb_traits, carn_traits)
+        return IslandSnapshot(herb_counts, carn_counts, self.total_herbs, self.total_carns,
+                              *traits_of_snapshot(herb_traits, carn_traits))
+
+    @property
+    def trait_rows(self):
+        """
+        Number of rows of the trait arrays of a snapshot, four with the amounts for cohort storage.
         """
-        herb_array = [[len(self.map[(row, col)].list_herbivores) for col in range(1, self.row_length+1)]
-                      for row in range(1, self.col_length+1)]
-        carn_array = [[len(self.map[(row, col)].list_carnivores) for col in range(1, self.row_length+1)]
-                      for row in range(1, self.col_length+1)]
-        return herb_array, carn_array
+        return 4 if self.storage == 'cohorts' else 3
+
+    def trait_entries(self):
+        """
+        Method for counting the columns of the trait arrays of a snapshot.
+
+        :return: Number of columns for the herbivores and for the carnivores, one per animal, or
+                 one per cohort for cohort storage.
+        """
+        if self.storage != 'cohorts':
+            return int(self.herb_counts.sum()), int(self.carn_counts.sum())
+
+        columns = [self.map[loc].trait_columns() for loc in self.active_cells]
+        return sum(herbs for herbs, _ in columns), sum(carns for _, carns in columns)
+
+    def writing_traits(self, herb_traits, carn_traits):
+        """
+        Method for writing the fitness, age and weight of every animal into arrays.
+
+        Each active cell writes its animals into its own columns, in the order of the map, see
+        :meth:`biosim.landscapes.Landscapes.trait_columns`.
+
+        :param herb_traits: Array with :attr:`trait_rows` rows, for the fitness, age and weight, and
+                            one column per herbivore on the island, see :meth:`trait_entries`.
+        :param carn_traits: Array with the same rows, and one column per carnivore on the island.
+        """
+        herb_start = carn_start = 0
+        for loc in self.ordered_active_cells():
+            herb_columns, carn_columns = self.map[loc].trait_columns()
+            herb_stop = herb_start + herb_columns
+            carn_stop = carn_start + carn_columns
+            self.map[loc].write_traits(herb_traits[:, herb_start:herb_stop],
+                                       carn_traits[:, carn_start:carn_stop])
+            herb_start, carn_start = herb_stop, carn_stop
 
     def fitness_list(self):
         """
@@ -215,12 +517,10 @@ class Island:
         fitness_list_herb = []
         fitness_list_carn = []
 
-        for cell in self.map.values():
-            for herb in cell.list_herbivores:
-                fitness_list_herb.append(herb.phi)
-
-            for carn in cell.list_carnivores:
-                fitness_list_carn.append(carn.phi)
+        for loc in self.ordered_active_cells():
+            herb_values, carn_values = self.map[loc].trait_values('phi')
+            fitness_list_herb.extend(herb_values)
+            fitness_list_carn.extend(carn_values)
 
         return fitness_list_herb, fitness_list_carn
 
@@ -233,12 +533,10 @@ class Island:
         age_list_herb = []
         age_list_carn = []
 
-        for cell in self.map.values():
-            for herb in cell.list_herbivores:
-                age_list_herb.append(herb.age)
-
-            for carn in cell.list_carnivores:
-                age_list_carn.append(carn.age)
+        for loc in self.ordered_active_cells():
+            herb_values, carn_values = self.map[loc].trait_values('age')
+            age_list_herb.extend(herb_values)
+            age_list_carn.extend(carn_values)
 
         return age_list_herb, age_list_carn
 
@@ -251,12 +549,10 @@ class Island:
         weight_list_herb = []
         weight_list_carn = []
 
-        for cell in self.map.values():
-            for herb in cell.list_herbivores:
-                weight_list_herb.append(herb.weight)
-
-            for carn in cell.list_carnivores:
-                weight_list_carn.append(carn.weight)
+        for loc in self.ordered_active_cells():
+            herb_values, carn_values = self.map[loc].trait_values('weight')
+            weight_list_herb.extend(herb_values)
+            weight_list_carn.extend(carn_values)
 
         return weight_list_herb, weight_list_carn
 
@@ -287,15 +583,43 @@ class Island:
             elif landscape == 'W':
                 cell.set_params(params)
 
-    def annual_cycle_simulation(self):
+    def feeding_and_birth(self):
         """
-        Method for simulating one year one the island. It follows the annual cycle.
+        Method for the first part of the year, before the migration.
+
+        The fodder of every cell is regrown at once. Then the active cells, the cells with animals,
+        are visited in the same order as in the map for feeding and birth.
         """
-        for cell in self.map:
-            self.map[cell].eating_process()
+        self.regrow_fodder()
+
+        for cell in self.ordered_active_cells():
+            self.map[cell].feeding_herbs()
+            self.map[cell].feeding_carn_with_herbs()
             self.map[cell].animal_gives_birth()
-            self.migrating_animals(cell)
-            self.map[cell].animal_gets_older()
-            self.map[cell].animal_dies()
+            self.update_counts(cell)
 
-        self.restart_migration()
+    def aging_and_death(self):
+        """
+        Method for the last part of the year, after the migration.
+
+        The animals of every active cell age and die. Cells whose animals all die are removed from
+        the active cells.
+        """
+        for cell in self.ordered_active_cells():
+            self.map[cell].animal_ages_and_dies()
+            self.update_counts(cell)
+            if self.map[cell].amount_herbs + self.map[cell].amount_carns == 0:
+                self.active_cells.discard(cell)
+
+    def annual_cycle_simulation(self):
+        """
+        Method for simulating one year one the island. It follows the annual cycle.
+
+        First the animals feed and give birth, see :meth:`feeding_and_birth`. The animals of all
+        cells migrate together, see :meth:`migrating_animals`, and finally the animals age and die,
+        see :meth:`aging_and_death`. The counts of a cell are updated after each phase that visits
+        it, see :meth:`update_counts`.
+        """
+        self.feeding_and_birth()
+        self.migrating_animals()
+        self.aging_and_death()
@@ -12,9 +12,14 @@ cannot move into the water. The desert does not contain fodder for the herbivore
 animals can still move to these cells. The lowland and highland cells contain fodder for 
 the herbivores, where lowland cells have more available fodder. 
 """
-from .animals import Herbivores, Carnivores
+from .animals import Herbivores, Carnivores, default_rng
+from .population import Population, CohortPopulation
 
-import random
+from itertools import compress
+from operator import attrgetter
+from sys import getsizeof
+import heapq
+import numpy as np
 
 
 class Landscapes:
@@ -24,6 +29,8 @@ class Landscapes:
 
     params_fodder = None
 
+    storage_types = ('objects', 'arrays', 'cohorts')
+
     @classmethod
     def set_params(cls, incoming_params):
         """
@@ -39,16 +46,61 @@ class Landscapes:
             else:
                 raise ValueError('Invalid parameter name: ' + parameter_key)
 
-    def __init__(self):
+    def __init__(self, storage='objects', rng=None):
         """
         Method for saving values in class.
-        """
-        # Defining empty lists for use in animals_population function
-        self.list_herbivores = []
-        self.list_carnivores = []
+
+        :param storage: 'objects' for one animal object per animal, 'arrays' for storing
+                        the population of each species as NumPy arrays, or 'cohorts' for storing
+                        it as arrays of cohorts, see :class:`biosim.population.CohortPopulation`.
+        :param rng: Random number generator for the random decisions in the cell, the shared
+                    :data:`biosim.animals.default_rng` if None.
+        """
+        if storage not in self.storage_types:
+            raise ValueError('Invalid storage type: ' + str(storage))
+        self.storage = storage
+        self.rng = default_rng if rng is None else rng
+
+        if storage != 'objects':
+            # Defining one array population per species
+            population_class = CohortPopulation if storage == 'cohorts' else Population
+            self.herbivores = population_class(Herbivores, self.rng)
+            self.carnivores = population_class(Carnivores, self.rng)
+        else:
+            # Defining empty lists for use in animals_population function
+            self.list_herbivores = []
+            self.list_carnivores = []
+
+            # True while list_herbivores is in ascending order of fitness, see order_herbivores
+            self._herbs_ordered = True
 
         # Defining amount of fodder for use in feeding_herbs and feeding_carns functions.
-        self.amount_fodder = 0
+        # The fodder is kept in a one-element array, which can be a view into the fodder grid of
+        # an island, see bind_fodder.
+        self._fodder = np.zeros(1)
+
+    @property
+    def amount_fodder(self):
+        """
+        Amount of fodder available in the cell.
+        """
+        return self._fodder.item()
+
+    @amount_fodder.setter
+    def amount_fodder(self, value):
+        self._fodder[0] = value
+
+    def bind_fodder(self, fodder):
+        """
+        Method for keeping the fodder of the cell in an element of a larger array.
+
+        The island keeps the fodder of all cells in one 2-D array, and regrows it for every
+        cell at once. Each cell reads and writes its own element through a view.
+
+        :param fodder: One-element array view, which gets the current fodder of the cell.
+        """
+        fodder[0] = self._fodder[0]
+        self._fodder = fodder
 
     def animals_population(self, ini_population):
         """
@@ -57,22 +109,61 @@ class Landscapes:
         :param ini_population: Initial population in one cell.
         :return: List with herbivores and carnivores in one cell.
         """
+        if self.storage != 'objects':
+            self._array_population(ini_population)
+            return
+
+        self._herbs_ordered = False
+        for pop_dict in ini_population:
+            if pop_dict['species'] == 'Herbivore':
+                self.list_herbivores.append(Herbivores(pop_dict['age'], pop_dict['weight'],
+                                                       self.rng))
+            elif pop_dict['species'] == 'Carnivore':
+                self.list_carnivores.append(Carnivores(pop_dict['age'], pop_dict['weight'],
+                                                       self.rng))
+            else:
+                raise TypeError('The only accepted species are Herbivore and Carnivore.')
+
+    def _array_population(self, ini_population):
+        """
+        Method for adding a population to the array storage.
+
+        The animals are created once, so that age and weight are checked in the same way
+        as for the animal objects, before their traits are copied into the arrays.
+
+        :param ini_population: Initial population in one cell.
+        """
+        new_animals = {'Herbivore': [], 'Carnivore': []}
         for pop_dict in ini_population:
             if pop_dict['species'] == 'Herbivore':
-                self.list_herbivores.append(Herbivores(pop_dict['age'], pop_dict['weight']))
+                new_animals['Herbivore'].append(Herbivores(pop_dict['age'], pop_dict['weight'],
+                                                           self.rng))
             elif pop_dict['species'] == 'Carnivore':
-                self.list_carnivores.append(Carnivores(pop_dict['age'], pop_dict['weight']))
+                new_animals['Carnivore'].append(Carnivores(pop_dict['age'], pop_dict['weight'],
+                                                           self.rng))
             else:
                 raise TypeError('The only accepted species are Herbivore and Carnivore.')
 
+        for population, animals in ((self.herbivores, new_animals['Herbivore']),
+                                    (self.carnivores, new_animals['Carnivore'])):
+            population.add_animals([animal.age for animal in animals],
+                                   [animal.weight for animal in animals],
+                                   [animal.phi for animal in animals])
+
     def add_single_animal(self, animal):
         """
         Method for adding single to population in cell.
 
         :param animal: Herbivore or carnivore class object.
         """
-        if animal.species == 'Herbivores':
+        if self.storage != 'objects':
+            if animal.species == 'Herbivores':
+                self.herbivores.add_animals([animal.age], [animal.weight], [animal.phi])
+            elif animal.species == 'Carnivores':
+                self.carnivores.add_animals([animal.age], [animal.weight], [animal.phi])
+        elif animal.species == 'Herbivores':
             self.list_herbivores.append(animal)
+            self._herbs_ordered = False
         elif animal.species == 'Carnivores':
             self.list_carnivores.append(animal)
 
@@ -95,107 +186,360 @@ class Landscapes:
         """
         pass
 
+    def order_herbivores(self):
+        """
+        Method for putting the herbivores in ascending order of fitness, unless they already are.
+
+        The order is an index of the herbivores that both feeding phases read. Removing animals
+        keeps it, and feeding keeps it up to date, while births, arriving animals and aging end
+        it. Since the herbivores keep their order from the year before, the list is nearly
+        sorted when the order is made again.
+
+        Herbivores with the same fitness are put in reverse order, so that feeding, which reads
+        the list from the end, feeds them in their order in the list, as a heap selection does.
+        """
+        if self.storage != 'objects':
+            self.herbivores.order_by_fitness()
+        elif not self._herbs_ordered:
+            Herbivores.update_fitness(self.list_herbivores)
+            self.list_herbivores.sort(key=attrgetter('phi'), reverse=True)
+            self.list_herbivores.reverse()
+            self._herbs_ordered = True
+
     def feeding_herbs(self):
         """
         Method for adjusting amount of fodder available in the cell.
-        """
-        self.list_herbivores = sorted(self.list_herbivores, key=lambda f: getattr(f, 'phi'), reverse=True)
 
-        for herb in self.list_herbivores:
-            if self.amount_fodder > 0:
-                amount_eaten = herb.herbs_eating(self.amount_fodder)
-                self.amount_fodder -= amount_eaten
+        The herbivores eat in descending order of fitness until the fodder is gone. When there
+        are carnivores in the cell, the herbivores are put in order with :meth:`order_herbivores`,
+        which the hunt reads afterwards. Otherwise only the herbivores the fodder can feed are
+        put in order, with a heap selection. Nothing is ordered when there is no fodder.
+        """
+        if self.amount_fodder <= 0 or self.amount_herbs == 0:
+            return
+
+        if self.amount_carns > 0:
+            self.order_herbivores()
+
+        if self.storage != 'objects':
+            self.amount_fodder = self.herbivores.eats_fodder(self.amount_fodder)
+            return
+
+        # Every herbivore but the last one to eat gets F
+        amount_fodder = self.amount_fodder
+        amount_eaters = min(int(amount_fodder // Herbivores.params.F) + 1,
+                            len(self.list_herbivores))
+        if self._herbs_ordered:
+            eaters = self.list_herbivores[:-amount_eaters - 1:-1]
+        else:
+            Herbivores.update_fitness(self.list_herbivores)
+            eaters = heapq.nlargest(amount_eaters, self.list_herbivores, key=attrgetter('phi'))
+
+        amount_fed = 0
+        for herb in eaters:
+            if amount_fodder > 0:
+                amount_eaten = herb.herbs_eating(amount_fodder)
+                amount_fodder -= amount_eaten
+                amount_fed += 1
+            else:
+                break
+        self.amount_fodder = amount_fodder
+
+        if self._herbs_ordered and amount_fed > 0:
+            # The herbivores that ate are still fitter than the others, so only they need ordering
+            self.list_herbivores[-amount_fed:] = sorted(self.list_herbivores[-amount_fed:],
+                                                        key=attrgetter('phi'))
 
     def feeding_carn_with_herbs(self):
         """
         Method for feeding carnivore with herbivores.
 
-        :return:
+        The carnivores hunt in random order, each with :meth:`biosim.animals.Carnivores.hunting`
+        on the herbivores ordered by fitness, see :meth:`order_herbivores`. The eaten herbivores
+        are marked during the hunt, and removed at the end with :meth:`remove_animals`.
         """
-        self.list_herbivores = sorted(self.list_herbivores, key=lambda f: getattr(f, 'phi'))
-        random.shuffle(self.list_carnivores)
+        if self.storage != 'objects':
+            self.carnivores.hunts(self.herbivores)
+            return
+
+        self.order_herbivores()
+        Carnivores.update_fitness(self.list_carnivores)
+        self.rng.shuffle(self.list_carnivores)
+
+        herb_phis = np.array([herb.phi for herb in self.list_herbivores])
+        herb_weights = np.array([herb.weight for herb in self.list_herbivores])
+        alive = np.ones(len(self.list_herbivores), dtype=bool)
+        amount_alive = len(self.list_herbivores)
 
         for carn in self.list_carnivores:
-            if len(self.list_herbivores) > 0:
-                eaten_herbs = carn.carns_eating_herbs(self.list_herbivores)
-                if eaten_herbs is not None:
-                    self.list_herbivores = [herb for herb in self.list_herbivores
-                                            if herb not in eaten_herbs]
+            if amount_alive == 0:
+                break
+            amount_alive -= carn.hunting(herb_phis, herb_weights, alive, self.rng)
+
+        if amount_alive < len(self.list_herbivores):
+            self.remove_animals(herbs_keep=alive)
 
     def animal_gives_birth(self):
         """
         Method for adding a newborn to the population in the cell.
+
+        All births of one species are decided at once, see
+        :meth:`biosim.animals.Animals.give_birth`.
         """
-        newborn_herbs = []
-        newborn_carns = []
+        if self.storage != 'objects':
+            self.herbivores.gives_birth()
+            self.carnivores.gives_birth()
+            return
 
-        for herb in self.list_herbivores:
-            newborn = herb.procreation(len(self.list_herbivores))
-            if newborn is not None:
-                newborn_herbs.append(newborn)
-        self.list_herbivores.extend(newborn_herbs)
-
-        for carn in self.list_carnivores:
-            newborn = carn.procreation(len(self.list_carnivores))
-            if newborn is not None:
-                newborn_carns.append(newborn)
-        self.list_carnivores.extend(newborn_carns)
+        self.list_herbivores.extend(Herbivores.give_birth(self.list_herbivores, self.rng))
+        self._herbs_ordered = False
+        self.list_carnivores.extend(Carnivores.give_birth(self.list_carnivores, self.rng))
 
     def animal_dies(self):
         """
         Method for removing dead animals from the rest of the population.
         """
-        self.list_herbivores = [herb for herb in self.list_herbivores if not herb.death()]
+        if self.storage != 'objects':
+            self.herbivores.dies()
+            self.carnivores.dies()
+            return
 
-        self.list_carnivores = [carn for carn in self.list_carnivores if not carn.death()]
+        Herbivores.update_fitness(self.list_herbivores)
+        Carnivores.update_fitness(self.list_carnivores)
+        self.remove_animals(herbs_keep=[not herb.death(self.rng) for herb in self.list_herbivores],
+                            carns_keep=[not carn.death(self.rng) for carn in self.list_carnivores])
 
     def animal_gets_older(self):
         """
         Method for aging an animal.
         """
+        if self.storage != 'objects':
+            self.herbivores.gets_older()
+            self.carnivores.gets_older()
+            return
+
         for herb in self.list_herbivores:
             herb.aging()
+        self._herbs_ordered = False
 
         for carn in self.list_carnivores:
             carn.aging()
 
+    def animal_ages_and_dies(self):
+        """
+        Method for aging the animals and removing the dead ones in one pass.
+
+        Gives the same result as :meth:`animal_gets_older` followed by :meth:`animal_dies`,
+        but each species is only traversed once.
+        """
+        if self.storage != 'objects':
+            self.herbivores.ages_and_dies()
+            self.carnivores.ages_and_dies()
+            return
+
+        Herbivores.age_and_die(self.list_herbivores, self.rng)
+        self._herbs_ordered = False
+        Carnivores.age_and_die(self.list_carnivores, self.rng)
+
+    def remove_animals(self, herbs_keep=None, carns_keep=None):
+        """
+        Method for removing animals from the cell, one pass per species.
+
+        The phases that remove animals mark the animals that stay in a mask, and remove the
+        others together at the end of the phase, instead of searching the population for every
+        animal that is removed. The order of the remaining animals is kept.
+
+        :param herbs_keep: Boolean sequence, True for the herbivores that stay. None keeps all.
+        :param carns_keep: Boolean sequence, True for the carnivores that stay. None keeps all.
+        """
+        if self.storage != 'objects':
+            if herbs_keep is not None:
+                self.herbivores.remove_animals(np.asarray(herbs_keep, dtype=bool))
+            if carns_keep is not None:
+                self.carnivores.remove_animals(np.asarray(carns_keep, dtype=bool))
+            return
+
+        if herbs_keep is not None:
+            self.list_herbivores[:] = compress(self.list_herbivores,
+                                               np.asarray(herbs_keep).tolist())
+        if carns_keep is not None:
+            self.list_carnivores[:] = compress(self.list_carnivores,
+                                               np.asarray(carns_keep).tolist())
+
     @property
     def amount_herbs(self):
+        if self.storage != 'objects':
+            return len(self.herbivores)
         return len(self.list_herbivores)
 
     @property
     def amount_carns(self):
+        if self.storage != 'objects':
+            return len(self.carnivores)
         return len(self.list_carnivores)
 
+    def trait_columns(self):
+        """
+        Method for finding the number of columns the animals of the cell take in the trait arrays,
+        see :meth:`write_traits`.
+
+        :return: Number of columns for the herbivores and for the carnivores.
+        """
+        if self.storage == 'cohorts':
+            return self.herbivores.size, self.carnivores.size
+        return self.amount_herbs, self.amount_carns
+
+    def write_traits(self, herb_traits, carn_traits):
+        """
+        Method for writing the fitness, age and weight of every animal in the cell into arrays.
+
+        Each animal is only visited once. For cohort storage, each column is a cohort, and a
+        fourth row gets the number of animals in it.
+
+        :param herb_traits: Array with three rows, for the fitness, age and weight, and one column
+                            per herbivore in the cell, see :meth:`trait_columns`.
+        :param carn_traits: Array with the same rows, and one column per carnivore in the cell.
+        """
+        if self.storage != 'objects':
+            for traits, population in ((herb_traits, self.herbivores),
+                                       (carn_traits, self.carnivores)):
+                for row, trait in enumerate(('phi', 'age', 'weight')):
+                    traits[row] = population.trait_values(trait)
+                if self.storage == 'cohorts':
+                    traits[3] = population.count
+            return
+
+        Herbivores.update_fitness(self.list_herbivores)
+        Carnivores.update_fitness(self.list_carnivores)
+        for traits, animals in ((herb_traits, self.list_herbivores),
+                                (carn_traits, self.list_carnivores)):
+            if len(animals) > 0:
+                traits.T[:] = [(animal.phi, animal.age, animal.weight) for animal in animals]
+
+    def trait_values(self, trait):
+        """
+        Method for collecting one trait of every animal in the cell.
+
+        :param trait: Name of the trait, 'phi', 'age' or 'weight'.
+        :return: Two sequences with the values for the herbivores and the carnivores, one per
+                 animal.
+        """
+        if self.storage == 'cohorts':
+            return (np.repeat(self.herbivores.trait_values(trait), self.herbivores.count),
+                    np.repeat(self.carnivores.trait_values(trait), self.carnivores.count))
+        if self.storage != 'objects':
+            return self.herbivores.trait_values(trait), self.carnivores.trait_values(trait)
+
+        if trait == 'phi':
+            Herbivores.update_fitness(self.list_herbivores)
+            Carnivores.update_fitness(self.list_carnivores)
+
+        return ([getattr(herb, trait) for herb in self.list_herbivores],
+                [getattr(carn, trait) for carn in self.list_carnivores])
+
+    def memory_footprint(self):
+        """
+        Method for estimating the memory used by the population in the cell.
+
+        For object storage, this is the size of each animal object and its values, plus the
+        lists holding them. For array storage, this is the size of the arrays.
+
+        :return: Dictionary with the number of bytes used by each species.
+        """
+        if self.storage != 'objects':
+            return {'Herbivore': self.herbivores.nbytes, 'Carnivore': self.carnivores.nbytes}
+
+        return {'Herbivore': getsizeof(self.list_herbivores)
+                + sum(herb.nbytes for herb in self.list_herbivores),
+                'Carnivore': getsizeof(self.list_carnivores)
+                + sum(carn.nbytes for carn in self.list_carnivores)}
+
     def distribute_migrated_animals(self):
         """
-        Method for putting the animals that want to move in each list.
+        Method for deciding which animals want to move this year.
+
+        Each animal wants to move with probability mu times its fitness. The decisions for all
+        animals of one species are drawn at once.
 
-        :return: Two lists with the herbivores and carnivores that migrate.
+        :return: Two arrays with the indices of the herbivores and carnivores that want to move.
+                 With cohort storage, two tuples with the indices of the cohorts and the number of
+                 animals in each of them that want to move.
         """
-        migrated_herbs = []
-        migrated_carns = []
+        if self.storage != 'objects':
+            return self.herbivores.wants_to_migrate(), self.carnivores.wants_to_migrate()
 
-        for herb in self.list_herbivores:
-            if herb.has_migrated is False and herb.probability_migrate():
-                migrated_herbs.append(herb)
+        Herbivores.update_fitness(self.list_herbivores)
+        Carnivores.update_fitness(self.list_carnivores)
 
-        for carn in self.list_carnivores:
-            if carn.has_migrated is False and carn.probability_migrate():
-                migrated_carns.append(carn)
+        movers = []
+        for species_class, animals in ((Herbivores, self.list_herbivores),
+                                       (Carnivores, self.list_carnivores)):
+            prob_migrate = species_class.params.mu * np.array([animal.phi for animal in animals])
+            movers.append(np.flatnonzero(self.rng.random(len(animals)) < prob_migrate))
+
+        return movers[0], movers[1]
 
-        return migrated_herbs, migrated_carns
+    def emigrate(self, herb_groups, carn_groups):
+        """
+        Method for removing the animals that leave the cell, in groups that move to the same cell.
+
+        The animals of all groups are removed together with :meth:`remove_animals`.
 
-    def annual_restart_migration(self):
+        :param herb_groups: List with one array of herbivore indices per group. With cohort
+                            storage, each group is a tuple with an array of cohort indices and
+                            an array with the number of animals leaving each cohort.
+        :param carn_groups: List with the carnivore groups, in the same form.
+        :return: Two lists with the leaving herbivores and carnivores of each group. With array
+                 storage, each group is a tuple with the ages, weights and fitness of the animals,
+                 and with cohort storage also the number of animals in each cohort.
         """
-        Method for setting migration attribute back to False in the end of the year, if it has migrated.
+        keep = {}
+        leaving = {}
+        for species, groups in (('herbivores', herb_groups), ('carnivores', carn_groups)):
+            keep[species] = None
+            if self.storage == 'cohorts':
+                population = getattr(self, species)
+                leaving[species] = [population.take_animals(*group) for group in groups]
+                population.remove_empty()
+                continue
+
+            if self.storage == 'arrays':
+                population = getattr(self, species)
+                leaving[species] = [(population.age[group], population.weight[group],
+                                     population.phi[group]) for group in groups]
+                amount_animals = len(population)
+            else:
+                animals = getattr(self, 'list_' + species)
+                leaving[species] = [[animals[index] for index in group.tolist()]
+                                    for group in groups]
+                amount_animals = len(animals)
+
+            if len(groups) > 0:
+                keep[species] = np.ones(amount_animals, dtype=bool)
+                keep[species][np.concatenate(groups)] = False
+
+        self.remove_animals(herbs_keep=keep['herbivores'], carns_keep=keep['carnivores'])
+        return leaving['herbivores'], leaving['carnivores']
 
-        An animal can only move once every year.
+    def immigrate(self, herbs=None, carns=None):
         """
-        for herb in self.list_herbivores:
-            herb.has_migrated = False
-        for carn in self.list_carnivores:
-            carn.has_migrated = False
+        Method for adding animals that arrive from another cell.
+
+        :param herbs: Arriving herbivores, in the form returned by :meth:`emigrate`.
+        :param carns: Arriving carnivores, in the form returned by :meth:`emigrate`.
+        """
+        if self.storage != 'objects':
+            if herbs is not None:
+                self.herbivores.add_animals(*herbs)
+            if carns is not None:
+                self.carnivores.add_animals(*carns)
+            return
+
+        if herbs is not None:
+            self.list_herbivores.extend(herbs)
+            self._herbs_ordered = False
+        if carns is not None:
+            self.list_carnivores.extend(carns)
 
     def set_animal_params_landscapes(self, species, params):
         """
@@ -217,11 +561,11 @@ class Lowland(Landscapes):
     params_fodder = {'f_max': 800}
     available = True
 
-    def __init__(self):
+    def __init__(self, storage='objects', rng=None):
         """
         Method for saving values in class.
         """
-        super().__init__()
+        super().__init__(storage, rng)
 
     def grow_fodder(self):
         """
@@ -237,11 +581,11 @@ class Highland(Landscapes):
     params_fodder = {'f_max': 300}
     available = True
 
-    def __init__(self):
+    def __init__(self, storage='objects', rng=None):
         """
         Method for saving values in class.
         """
-        super().__init__()
+        super().__init__(storage, rng)
 
     def grow_fodder(self):
         """
@@ -257,11 +601,11 @@ class Desert(Landscapes):
     params_fodder = {'f_max': 0}
     available = True
 
-    def __init__(self):
+    def __init__(self, storage='objects', rng=None):
         """
         Method for making fodder available.
         """
-        super().__init__()
+        super().__init__(storage, rng)
 
     def grow_fodder(self):
         """
@@ -277,11 +621,11 @@ class Water(Landscapes):
     params_fodder = {'f_max': 0}
     available = False
 
-    def __init__(self):
+    def __init__(self, storage='objects', rng=None):
         """
         Method for making fodder available.
         """
-        super().__init__()
+        super().__init__(storage, rng)
 
     def grow_fodder(self):
         """
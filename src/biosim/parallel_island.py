@@ -0,0 +1,836 @@
+# -*- coding: utf-8 -*-
+
+__author__ = 'Andrine Zimmermann, Karin Mollatt'
+__email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
+
+import multiprocessing
+import os
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+"""
+:mod: 'biosim.parallel_island' runs the annual cycle of Rossumøya in several processes.
+
+The map is split into strips of whole rows, and each strip is simulated by a
+:class:`StripIsland` in its own worker process. The phases that only involve the animals
+in one cell, feeding, hunting, birth, aging and death, run in every strip at the same time.
+The animals that migrate across the border of a strip are sent to the strip they arrive in,
+in one exchange a year.
+
+The fodder and count grids of the island live in shared memory blocks, see
+:class:`SharedArrays`, and every strip updates its own rows of them in place. For a snapshot,
+the strips write the traits of their animals into shared trait arrays. The animals
+themselves are not shared: the population of each strip is private to its worker process,
+and the migrants that cross the border of a strip are pickled and sent between the processes.
+"""
+
+from .animals import Herbivores, Carnivores, default_rng
+from .island import Island, IslandSnapshot, freeze, traits_of_snapshot
+
+
+class _BlockArray:
+    """
+    Class for the array interface of an array in a shared memory block.
+
+    NumPy keeps this object as the base of the array and of every view of it, so the block stays
+    mapped as long as any of them is used, and is closed when the last of them is gone.
+    """
+
+    def __init__(self, block, shape, dtype):
+        """
+        Method for saving values in class.
+
+        :param block: SharedMemory object
+        :param shape: Shape of the array
+        :param dtype: Data type of the array
+        """
+        self.block = block
+        self.__array_interface__ = np.ndarray(shape, dtype, buffer=block.buf).__array_interface__
+
+
+class SharedArrays:
+    """
+    Class for NumPy arrays stored in shared memory blocks, one block per array.
+
+    The arrays are found by a key in :attr:`arrays`. An owner creates the blocks, and unlinks
+    them when they are replaced or closed. Other processes attach to a block by its name, see
+    :meth:`spec`. A block is only unmapped from a process when no array uses it any more, so
+    the arrays of a snapshot can still be read after the block is unlinked.
+
+    :class:`ParallelIsland` keeps the fodder grid, the count grids and the trait arrays of the
+    snapshots here. The populations of the strips are not shared arrays.
+    """
+
+    def __init__(self, owner=False):
+        """
+        Method for saving values in class.
+
+        :param owner: If True, the blocks are created and unlinked by this object.
+        """
+        self.owner = owner
+        self.arrays = {}
+        self._blocks = {}
+
+    def create(self, key, shape, dtype=np.float64):
+        """
+        Method for creating a zero-filled array in a new block, replacing any array with the same
+        key.
+
+        :param key: Name of the array
+        :param shape: Shape of the array
+        :param dtype: Data type of the array
+        :return: The array.
+        """
+        if not self.owner:
+            raise PermissionError('Only the owner can create shared arrays.')
+
+        self.release(key)
+        size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        self._blocks[key] = shared_memory.SharedMemory(create=True, size=size)
+        self.arrays[key] = np.asarray(_BlockArray(self._blocks[key], shape, dtype))
+        self.arrays[key][...] = 0
+        return self.arrays[key]
+
+    def attach(self, key, name, shape, dtype):
+        """
+        Method for attaching to the block of an array created by another process.
+
+        :param key: Name of the array
+        :param name: Name of the shared memory block, see :meth:`spec`
+        :param shape: Shape of the array
+        :param dtype: Data type of the array
+        :return: The array.
+        """
+        if key in self._blocks and self._blocks[key].name != name:
+            self.release(key)
+        if key not in self._blocks:
+            self._blocks[key] = shared_memory.SharedMemory(name=name)
+        self.arrays[key] = np.asarray(_BlockArray(self._blocks[key], shape, dtype))
+        return self.arrays[key]
+
+    def spec(self, key):
+        """
+        Method for describing an array, so another process can attach to it.
+
+        :param key: Name of the array
+        :return: Tuple with the name of the block, the shape and the data type of the array.
+        """
+        array = self.arrays[key]
+        return self._blocks[key].name, array.shape, array.dtype.str
+
+    def release(self, key):
+        """
+        Method for letting go of the block of an array, and unlinking it if this object is the
+        owner.
+
+        :param key: Name of the array
+        """
+        if key not in self._blocks:
+            return
+
+        block = self._blocks.pop(key)
+        del self.arrays[key]
+        if self.owner:
+            block.unlink()
+
+    def close(self):
+        """
+        Method for releasing every block.
+        """
+        for key in list(self._blocks):
+            self.release(key)
+
+
+class StripIsland(Island):
+    """
+    Class for the part of an island that one worker process simulates.
+
+    The strip holds the rows it owns, and the row above and below it, the halo, where they
+    exist. Animals that migrate out of the strip arrive in the halo, and are taken out of it
+    with :meth:`taking_halo_animals` before the year goes on. Locations are given in the
+    coordinates of the whole island.
+
+    With shared grids, the fodder and count grids of the strip are its rows of the shared grids
+    of the island, see :meth:`binding_shared_grids`. The halo rows belong to the neighbouring
+    strips, so the strip only regrows the fodder and counts the animals of its owned rows.
+    """
+
+    # Grids of the strip that are rows of the shared grids of the same name
+    shared_grids = ('fodder', 'herb_counts', 'carn_counts')
+
+    def __init__(self, island_map, owned_rows, row_offset, storage='arrays', rng=None,
+                 grid_specs=None):
+        """
+        Method for saving values in class.
+
+        :param island_map: Multi-line string with the rows of the strip, including the halo
+        :param owned_rows: Tuple with the first and last row of the island the strip owns
+        :param row_offset: Number of rows of the island above the first row of island_map
+        :param storage: Population storage used in the cells
+        :param rng: Random number generator of the strip
+        :param grid_specs: Dictionary with the shared grid of each name in :attr:`shared_grids`,
+                           as given by :meth:`SharedArrays.spec`, or None for grids of its own.
+        """
+        self.row_offset = row_offset
+        self.owned_rows = owned_rows
+        # Rows of the grids of the strip that the strip owns
+        self.owned = slice(owned_rows[0] - row_offset - 1, owned_rows[1] - row_offset)
+        super().__init__(island_map, [], storage, rng)
+
+        self.halo_locs = [loc for loc in self.map if not self.is_owned(loc)]
+        self.shared = SharedArrays()
+        if grid_specs is not None:
+            self.binding_shared_grids(grid_specs)
+
+    def binding_shared_grids(self, grid_specs):
+        """
+        Method for making the grids of the strip views of the shared grids of the island.
+
+        The cells of the owned rows are bound to the shared fodder grid, so they feed from it
+        directly, and :meth:`update_counts` writes the counts of the owned rows into the shared
+        count grids. The cells of the halo keep their fodder in the grid of the strip.
+
+        :param grid_specs: Dictionary with the shared grid of each name in :attr:`shared_grids`
+        """
+        rows = slice(self.row_offset, self.row_offset + self.cells.shape[0])
+        for key in self.shared_grids:
+            setattr(self, key, self.shared.attach(key, *grid_specs[key])[rows])
+
+        for loc, cell in self.map.items():
+            if self.is_owned(loc):
+                index_x, index_y = self.grid_index(loc)
+                cell.bind_fodder(self.fodder[index_x, index_y:index_y + 1])
+
+    def is_owned(self, loc):
+        """
+        Method for checking if a location in the strip is in the rows the strip owns.
+
+        :param loc: Location tuple in the strip
+        :return: True if the strip owns the location.
+        """
+        return self.owned.start < loc[0] <= self.owned.stop
+
+    def update_counts(self, loc):
+        """
+        Method for updating the counts of a cell, see :meth:`biosim.island.Island.update_counts`.
+
+        The cells of the halo are not counted, since their counts belong to the neighbouring
+        strip. Animals that arrive in the halo therefore leave the totals of the strip.
+
+        :param loc: Location tuple in the strip
+        """
+        if self.is_owned(loc):
+            super().update_counts(loc)
+
+    def regrow_fodder(self):
+        """
+        Method for regrowing the fodder of the owned rows, see
+        :meth:`biosim.island.Island.regrow_fodder`.
+        """
+        f_max = np.array([landscape.params_fodder['f_max']
+                          for landscape in self.map_params.values()], dtype=float)
+        self.fodder[self.owned] = f_max[self.landscape_codes[self.owned]]
+
+    def checking_map(self):
+        """
+        Method for checking the map, which is done for the whole island by :class:`ParallelIsland`.
+        """
+
+    def local_loc(self, loc):
+        """
+        Method for converting a location on the island to a location in the strip.
+
+        :param loc: Location tuple on the island
+        :return: Location tuple in the strip.
+        """
+        return loc[0] - self.row_offset, loc[1]
+
+    def adding_population(self, incoming_pop=None):
+        """
+        Method for adding population to the strip, with locations on the island.
+
+        :param incoming_pop: List of dictionaries specifying population
+        """
+        if incoming_pop is None:
+            return
+
+        super().adding_population([{'loc': self.local_loc(dict_loc_pop['loc']),
+                                    'pop': dict_loc_pop['pop']}
+                                   for dict_loc_pop in incoming_pop])
+
+    def _all_animals(self, cell):
+        """
+        Method for describing all animals in a cell as one group per species, see
+        :meth:`biosim.landscapes.Landscapes.emigrate`.
+
+        :param cell: Landscape object
+        :return: Two lists with the group of herbivores and the group of carnivores, empty for a
+                 species without animals in the cell.
+        """
+        if self.storage == 'objects':
+            return ([np.arange(len(animals))] if len(animals) > 0 else []
+                    for animals in (cell.list_herbivores, cell.list_carnivores))
+        if self.storage == 'cohorts':
+            return ([(np.arange(population.size), population.count.copy())]
+                    if population.size > 0 else []
+                    for population in (cell.herbivores, cell.carnivores))
+        return ([np.arange(population.size)] if population.size > 0 else []
+                for population in (cell.herbivores, cell.carnivores))
+
+    def taking_halo_animals(self):
+        """
+        Method for taking out the animals that have migrated into the halo.
+
+        :return: List with a tuple for each halo cell with animals: the location on the island, and
+                 the herbivores and carnivores in the form returned by
+                 :meth:`biosim.landscapes.Landscapes.emigrate`, or None for a species without
+                 animals.
+        """
+        leaving = []
+        for loc in self.halo_locs:
+            if loc not in self.active_cells:
+                continue
+
+            herb_groups, carn_groups = self._all_animals(self.map[loc])
+            herbs, carns = self.map[loc].emigrate(herb_groups, carn_groups)
+            leaving.append(((loc[0] + self.row_offset, loc[1]), herbs[0] if herbs else None,
+                            carns[0] if carns else None))
+            self.active_cells.discard(loc)
+
+        return leaving
+
+    def year_until_exchange(self):
+        """
+        Method for the part of the year before the migrants are exchanged between the strips.
+
+        :return: The animals that left the strip, see :meth:`taking_halo_animals`.
+        """
+        self.feeding_and_birth()
+        self.migrating_animals()
+        return self.taking_halo_animals()
+
+    def year_after_exchange(self, arriving):
+        """
+        Method for the part of the year after the migrants are exchanged between the strips.
+
+        The animals that arrive from the other strips are added to their cells, and then every
+        animal in the strip ages and dies.
+
+        :param arriving: List with tuples with the location on the island, the herbivores and the
+                         carnivores that arrive there, as returned by :meth:`taking_halo_animals`.
+        """
+        for loc, herbs, carns in arriving:
+            loc = self.local_loc(loc)
+            self.map[loc].immigrate(herbs=herbs, carns=carns)
+            self.update_counts(loc)
+            self._activate(loc)
+
+        self.aging_and_death()
+
+    def trait_entries(self):
+        """
+        Method for counting the columns of the trait arrays of the strip, see
+        :meth:`biosim.island.Island.trait_entries`. Only the owned rows of the count grids are
+        counted.
+
+        :return: Number of columns for the herbivores and for the carnivores.
+        """
+        if self.storage != 'cohorts':
+            return int(self.herb_counts[self.owned].sum()), int(self.carn_counts[self.owned].sum())
+        return super().trait_entries()
+
+    def writing_shared_traits(self, herb_spec, carn_spec, herb_start, carn_start):
+        """
+        Method for writing the traits of the animals in the strip into the shared trait arrays.
+
+        The animals are written from the given columns on, see
+        :meth:`biosim.island.Island.writing_traits`.
+
+        :param herb_spec: Shared trait array of the herbivores, see :meth:`SharedArrays.spec`
+        :param carn_spec: Shared trait array of the carnivores
+        :param herb_start: First column for the herbivores of the strip
+        :param carn_start: First column for the carnivores of the strip
+        """
+        herb_traits = self.shared.attach('herb_traits', *herb_spec)
+        carn_traits = self.shared.attach('carn_traits', *carn_spec)
+        herb_entries, carn_entries = self.trait_entries()
+        herb_stop, carn_stop = herb_start + herb_entries, carn_start + carn_entries
+        self.writing_traits(herb_traits[:, herb_start:herb_stop],
+                            carn_traits[:, carn_start:carn_stop])
+
+
+def _apply_params(animal_params, landscape_params):
+    """
+    Function for setting the parameters of the animals and landscapes in a worker process.
+
+    :param animal_params: Dictionary with the parameters of each species class
+    :param landscape_params: Dictionary with the fodder parameters of each landscape type
+    """
+    for species_class, params in animal_params.items():
+        species_class.set_params(params)
+    for landscape, params in landscape_params.items():
+        Island.map_params[landscape].set_params(params)
+
+
+def _strip_worker(connection, strip_map, owned_rows, row_offset, storage, seed, animal_params,
+                  landscape_params, grid_specs):
+    """
+    Function run by each worker process, answering the calls of :class:`ParallelIsland`.
+
+    Each call is a method name of :class:`StripIsland` and its arguments. The worker answers
+    with True and the result, or with False and the exception the method raised. A method
+    name of None ends the worker, which then closes its mappings of the shared blocks.
+    """
+    _apply_params(animal_params, landscape_params)
+    strip = StripIsland(strip_map, owned_rows, row_offset, storage, np.random.default_rng(seed),
+                        grid_specs)
+
+    try:
+        while True:
+            method, args = connection.recv()
+            if method is None:
+                break
+            try:
+                result = getattr(strip, method)(*args)
+            except Exception as error:
+                connection.send((False, error))
+            else:
+                connection.send((True, result))
+    finally:
+        strip.shared.close()
+        connection.close()
+
+
+def _shutting_down(connections, processes, shared):
+    """
+    Function for ending the worker processes, and then unlinking the shared blocks.
+    """
+    for connection in connections:
+        try:
+            connection.send((None, ()))
+        except (BrokenPipeError, OSError):
+            pass
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+    shared.close()
+
+
+class ParallelIsland:
+    """
+    Class for an island simulated in strips of rows by several worker processes.
+
+    Each worker simulates its strip with a :class:`StripIsland`, with its own random number
+    generator, seeded from the generator of the island. A year has two steps:
+
+    #. every strip regrows its fodder, and lets its animals feed, give birth and migrate.
+       The animals that cross the border of the strip are taken out of its halo.
+    #. the migrants are sent to the strip that owns their new cell, and every strip adds them,
+       and lets its animals age and die.
+
+    All decisions of an animal depend only on its own cell, and every animal migrates at most
+    once a year, so a year is the same as a year of :class:`biosim.island.Island`, with other
+    random numbers. The rows are split so that the strips have about the same number of
+    habitable cells.
+
+    The fodder and count grids of the island are shared memory blocks, which every strip updates
+    in place for its owned rows, and the snapshots read the traits from shared blocks the strips
+    write into, so neither is copied between the processes. These are the only shared arrays.
+    The populations of the strips stay private to their worker processes, and the animals that
+    migrate between the strips are pickled and sent through pipes. The blocks are unlinked by
+    :meth:`close`, at the end of a ``with`` block, when the island is garbage collected or when the
+    program exits, also after an exception.
+    """
+
+    map_params = Island.map_params
+
+    def __init__(self, island_map, ini_pop, rng=None, workers=None, storage='arrays'):
+        """
+        Method for saving values in class.
+
+        :param island_map: Multi-line string specifying island geography
+        :param ini_pop: List of dictionaries specifying initial population
+        :param rng: Random number generator for seeding the workers, the shared
+                    :data:`biosim.animals.default_rng` if None.
+        :param workers: Number of worker processes, the number of CPUs if None. Never more than
+                        the number of rows with habitable cells.
+        :param storage: Population storage used in the cells of the workers
+        """
+        self.rng = default_rng if rng is None else rng
+        self.ini_pop = ini_pop
+        self.map_string = island_map
+        self.storage = storage
+        self.creating_grid(island_map)
+        self.creating_strips(os.cpu_count() if workers is None else workers)
+
+        self.shared = SharedArrays(owner=True)
+        self._connections = []
+        self._processes = []
+        self._finalizer = weakref.finalize(self, _shutting_down, self._connections, self._processes,
+                                           self.shared)
+        try:
+            self.creating_shared_grids()
+            self.starting_workers()
+            self.adding_population(self.ini_pop)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def creating_grid(self, island_map):
+        """
+        Method for checking the map, and creating the landscape codes and habitable cells.
+
+        Gives the same errors as :class:`biosim.island.Island` for invalid maps.
+
+        :param island_map: Multi-line string specifying island geography
+        """
+        self.map_lines = island_map.strip().splitlines()
+
+        for line in self.map_lines:
+            for landscape_type in line:
+                if landscape_type not in self.map_params:
+                    raise ValueError('Invalid landscape type: ' + landscape_type)
+
+        for line in self.map_lines:
+            if len(line) != len(self.map_lines[0]):
+                raise ValueError('Each line must be of equal length.')
+
+        border = (self.map_lines[0] + self.map_lines[-1]
+                  + ''.join(line[0] + line[-1] for line in self.map_lines))
+        if set(border) != {'W'}:
+            raise ValueError('The island must be surrounded of water')
+
+        type_codes = {landscape_type: code for code, landscape_type in enumerate(self.map_params)}
+        self.landscape_codes = np.array([[type_codes[landscape_type] for landscape_type in line]
+                                         for line in self.map_lines], dtype=np.intp)
+        self.habitable = np.array([landscape.available for landscape in self.map_params.values()])[
+            self.landscape_codes]
+
+    def creating_strips(self, workers):
+        """
+        Method for splitting the rows into strips with about the same number of habitable cells.
+
+        :attr:`strips` holds the first and last row of each strip, and :attr:`row_owner` the
+        strip that owns each row, indexed by the row number.
+
+        :param workers: Number of strips wanted
+        """
+        habitable_rows = np.flatnonzero(self.habitable.any(axis=1)) + 1
+        workers = max(1, min(workers, len(habitable_rows)))
+
+        # Cut the rows where the number of habitable cells passes each share of the total
+        cumulative = np.cumsum(self.habitable.sum(axis=1))
+        shares = cumulative[-1] * np.arange(1, workers) / workers
+        cuts = np.searchsorted(cumulative, shares, side='left') + 1
+        cuts = np.unique(np.clip(cuts, 1, self.col_length - 1))
+        starts = np.r_[1, cuts + 1]
+        stops = np.r_[cuts, self.col_length]
+
+        self.strips = list(zip(starts.tolist(), stops.tolist()))
+        self.row_owner = np.zeros(self.col_length + 1, dtype=np.intp)
+        for strip, (first, last) in enumerate(self.strips):
+            self.row_owner[first:last + 1] = strip
+
+    def creating_shared_grids(self):
+        """
+        Method for creating the fodder and count grids of the island in shared memory.
+
+        :attr:`fodder`, :attr:`herb_counts` and :attr:`carn_counts` are the shared grids, which
+        the strips update in place.
+        """
+        self.fodder = self.shared.create('fodder', self.landscape_codes.shape)
+        self.herb_counts = self.shared.create('herb_counts', self.landscape_codes.shape, np.int64)
+        self.carn_counts = self.shared.create('carn_counts', self.landscape_codes.shape, np.int64)
+
+    @property
+    def total_herbs(self):
+        """
+        Number of herbivores in the habitable cells of the island.
+        """
+        return int(self.herb_counts[self.habitable].sum())
+
+    @property
+    def total_carns(self):
+        """
+        Number of carnivores in the habitable cells of the island.
+        """
+        return int(self.carn_counts[self.habitable].sum())
+
+    def strip_amounts(self, counts):
+        """
+        Method for counting the animals in each strip, also in the cells that are not habitable.
+
+        :param counts: Count grid of one species
+        :return: Array with the number of animals in each strip.
+        """
+        return np.array([counts[first - 1:last].sum() for first, last in self.strips])
+
+    def starting_workers(self):
+        """
+        Method for starting one worker process per strip.
+
+        The workers get the current parameters of the animals and landscapes, and attach to the
+        shared grids. They are ended by :meth:`close`, or when the island is garbage collected.
+        """
+        animal_params = {Herbivores: dict(Herbivores.default_params),
+                         Carnivores: dict(Carnivores.default_params)}
+        landscape_params = {code: dict(landscape.params_fodder)
+                            for code, landscape in self.map_params.items()}
+        grid_specs = {key: self.shared.spec(key) for key in StripIsland.shared_grids}
+        seeds = self.rng.integers(2 ** 63, size=len(self.strips))
+
+        for (first, last), seed in zip(self.strips, seeds):
+            top, bottom = max(1, first - 1), min(self.col_length, last + 1)
+            strip_map = '\n'.join(self.map_lines[top - 1:bottom])
+            parent_connection, child_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_strip_worker,
+                                              args=(child_connection, strip_map, (first, last),
+                                                    top - 1, self.storage, int(seed),
+                                                    animal_params, landscape_params, grid_specs),
+                                              daemon=True)
+            process.start()
+            child_connection.close()
+            self._connections.append(parent_connection)
+            self._processes.append(process)
+
+    def close(self):
+        """
+        Method for ending the worker processes and unlinking the shared blocks. Calling it again
+        does nothing.
+        """
+        self._finalizer()
+
+    def _call(self, method, args_per_strip):
+        """
+        Method for calling a method of every strip, letting the workers run at the same time.
+
+        :param method: Name of the :class:`StripIsland` method
+        :param args_per_strip: List with a tuple of arguments for each strip
+        :return: List with the result of each strip.
+        """
+        for connection, args in zip(self._connections, args_per_strip):
+            connection.send((method, args))
+
+        results = [connection.recv() for connection in self._connections]
+        for succeeded, result in results:
+            if not succeeded:
+                raise result
+        return [result for _, result in results]
+
+    def _call_all(self, method, *args):
+        """
+        Method for calling a method of every strip with the same arguments.
+        """
+        return self._call(method, [args] * len(self._connections))
+
+    @property
+    def row_length(self):
+        """
+        Number of rows.
+        """
+        return self.landscape_codes.shape[1]
+
+    @property
+    def col_length(self):
+        """
+        Number of columns.
+        """
+        return self.landscape_codes.shape[0]
+
+    def adding_population(self, incoming_pop=None):
+        """
+        Method for adding population to the island, sending each cell to the strip that owns it.
+
+        :param incoming_pop: List of dictionaries specifying population
+        """
+        if incoming_pop is None:
+            return
+
+        pop_per_strip = [[] for _ in self.strips]
+        for dict_loc_pop in incoming_pop:
+            loc_x, loc_y = dict_loc_pop['loc']
+            if not (1 <= loc_x <= self.col_length and 1 <= loc_y <= self.row_length):
+                raise KeyError('This location is invalid.')
+            pop_per_strip[self.row_owner[loc_x]].append(dict_loc_pop)
+
+        self._call('adding_population', [(pop,) for pop in pop_per_strip])
+
+    def annual_cycle_simulation(self):
+        """
+        Method for simulating one year on the island, in every strip at once.
+        """
+        leaving_per_strip = self._call_all('year_until_exchange')
+
+        arriving_per_strip = [[] for _ in self.strips]
+        for leaving in leaving_per_strip:
+            for loc, herbs, carns in leaving:
+                arriving_per_strip[self.row_owner[loc[0]]].append((loc, herbs, carns))
+
+        self._call('year_after_exchange', [(arriving,) for arriving in arriving_per_strip])
+
+    def animals_per_species(self):
+        """
+        Method for creating a dictionary containing the amount of animals per species.
+
+        :return: Dictionary with the amount of animals per species.
+        """
+        amount_animals_species = {'Herbivore': self.total_herbs, 'Carnivore': self.total_carns}
+        return amount_animals_species, self.total_herbs + self.total_carns
+
+    def heatmap_population(self):
+        """
+        Method for creating population distribution of heatmap for herbivores and carnivores.
+
+        Returns the shared count grids, which must not be changed.
+
+        :return: 2D arrays with population in each cell for herbivores and carnivores.
+        """
+        return self.herb_counts, self.carn_counts
+
+    def _shared_traits(self, key, amount):
+        """
+        Method for getting a shared trait array with room for the given number of columns.
+
+        A new block with twice the room is created when the old one is too small.
+
+        :param key: 'herb_traits' or 'carn_traits'
+        :param amount: Number of columns, one per animal, or one per cohort for cohort storage
+        :return: The shared array, with a row for the fitness, age and weight, and a fourth row
+                 with the amounts for cohort storage.
+        """
+        rows = 4 if self.storage == 'cohorts' else 3
+        if key not in self.shared.arrays or self.shared.arrays[key].shape[1] < amount:
+            self.shared.create(key, (rows, max(1, 2 * amount)))
+        return self.shared.arrays[key]
+
+    def strip_entries(self):
+        """
+        Method for counting the columns of each strip in the trait arrays of a snapshot.
+
+        Like :meth:`biosim.island.Island.snapshot`, the columns follow the count grids, which
+        include the animals of the cells that are not habitable. For cohort storage, each strip
+        counts its cohorts, see :meth:`StripIsland.trait_entries`.
+
+        :return: Two arrays with the number of columns of each strip, for the herbivores and for
+                 the carnivores.
+        """
+        if self.storage == 'cohorts':
+            entries = np.array(self._call_all('trait_entries')).reshape(-1, 2)
+            return entries[:, 0], entries[:, 1]
+        return self.strip_amounts(self.herb_counts), self.strip_amounts(self.carn_counts)
+
+    def snapshot(self, traits=True):
+        """
+        Method for collecting the statistics of the island, see
+        :meth:`biosim.island.Island.snapshot`.
+
+        Nothing is copied: the counts are read-only views of the shared grids, and the traits are
+        read-only views of shared trait arrays, which every strip writes its animals into, in
+        the order of the strips. The arrays of a snapshot therefore change in the next year, or
+        with the next snapshot, and are kept only until then.
+
+        :param traits: If False, only the counts are collected.
+        :return: Read-only :class:`biosim.island.IslandSnapshot`.
+        """
+        herb_counts, carn_counts = freeze(self.herb_counts.view(), self.carn_counts.view())
+        if not traits:
+            return IslandSnapshot(herb_counts, carn_counts, self.total_herbs, self.total_carns,
+                                  None, None, None, None, None, None)
+
+        herb_entries, carn_entries = self.strip_entries()
+        herb_traits = self._shared_traits('herb_traits', int(herb_entries.sum()))
+        carn_traits = self._shared_traits('carn_traits', int(carn_entries.sum()))
+        herb_starts = np.cumsum(herb_entries) - herb_entries
+        carn_starts = np.cumsum(carn_entries) - carn_entries
+        herb_spec, carn_spec = self.shared.spec('herb_traits'), self.shared.spec('carn_traits')
+        self._call('writing_shared_traits',
+                   [(herb_spec, carn_spec, int(herb_start), int(carn_start))
+                    for herb_start, carn_start in zip(herb_starts, carn_starts)])
+
+        herb_traits, carn_traits = freeze(herb_traits[:, :herb_entries.sum()],
+                                          carn_traits[:, :carn_entries.sum()])
+        return IslandSnapshot(herb_counts, carn_counts, self.total_herbs, self.total_carns,
+                              *traits_of_snapshot(herb_traits, carn_traits))
+
+    def _trait_lists(self, trait):
+        """
+        Method for copying one trait of every animal out of a snapshot.
+
+        :param trait: Name of the trait in the snapshot, 'phi', 'age' or 'weight'.
+        :return: Arrays with one value per herbivore and per carnivore, also for cohort storage.
+        """
+        snapshot = self.snapshot()
+        herb_values = getattr(snapshot, 'herb_' + trait)
+        carn_values = getattr(snapshot, 'carn_' + trait)
+        if snapshot.herb_amounts is None:
+            return herb_values.copy(), carn_values.copy()
+        return (np.repeat(herb_values, snapshot.herb_amounts.astype(np.int64)),
+                np.repeat(carn_values, snapshot.carn_amounts.astype(np.int64)))
+
+    def fitness_list(self):
+        """
+        Method for creating arrays with fitness for all animals.
+
+        :return: Arrays containing fitness for herbivores and carnivores.
+        """
+        return self._trait_lists('phi')
+
+    def age_list(self):
+        """
+        Method for creating arrays with ages for all animals.
+
+        :return: Arrays containing ages for herbivores and carnivores.
+        """
+        return self._trait_lists('age')
+
+    def weight_list(self):
+        """
+        Method for creating arrays with weights for all animals.
+
+        :return: Arrays containing weights for herbivores and carnivores.
+        """
+        return self._trait_lists('weight')
+
+    def memory_footprint(self):
+        """
+        Method for estimating the memory used by the animals in all strips.
+
+        :return: Dictionary with the number of bytes used by each species.
+        """
+        footprint = {'Herbivore': 0, 'Carnivore': 0}
+        for strip_footprint in self._call_all('memory_footprint'):
+            for species, strip_bytes in strip_footprint.items():
+                footprint[species] += strip_bytes
+        return footprint
+
+    def set_animal_params_island(self, species, params):
+        """
+        Set parameters for animal species, in this process and in every worker.
+
+        :param species: String, name of animal species
+        :param params: Dict with valid parameter specification for species
+        """
+        if species == 'Herbivore':
+            Herbivores.set_params(params)
+        elif species == 'Carnivore':
+            Carnivores.set_params(params)
+        self._call_all('set_animal_params_island', species, params)
+
+    def set_landscape_params_island(self, landscape, params):
+        """
+        Set parameters for landscape type, in this process and in every worker.
+
+        :param landscape: String, code letter for landscape
+        :param params: Dict with valid parameter specification for landscape
+        """
+        self.map_params[landscape].set_params(params)
+        self._call_all('set_landscape_params_island', landscape, params)
@@ -0,0 +1,745 @@
+# -*- coding: utf-8 -*-
+
+__author__ = 'Andrine Zimmermann, Karin Mollatt'
+__email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
+
+"""
+:mod: 'biosim.population' contains the array based population storage of Rossumøya.
+
+Instead of keeping one Python object per animal, a population stores the age, weight
+and fitness of all animals of one species in one cell in contiguous NumPy
+arrays. The methods follow the same rules as the methods of the animal classes, but act on
+the whole population at once.
+
+For very large herds, :class:`CohortPopulation` stores the animals with the same age and
+weight as one cohort with a count, and draws the number of animals of each cohort that eat,
+give birth, die or migrate.
+"""
+
+from functools import lru_cache
+from math import ceil, erf, sqrt
+import numpy as np
+
+from .animals import default_rng
+
+
+class Population:
+    """
+    Class for storing all animals of one species in one cell as arrays.
+
+    The arrays are allocated with some spare capacity, so that adding animals does not
+    reallocate every time. Only the first :attr:`size` entries are living animals.
+
+    While :attr:`ordered` is True, the animals are stored in ascending order of fitness, so that
+    feeding and hunting can read the order without sorting. Removing animals keeps the order,
+    while adding animals or changing the fitness of all animals ends it.
+    """
+
+    initial_capacity = 8
+
+    # Names of the arrays holding one entry per animal
+    _buffers = ('_age', '_weight', '_phi')
+
+    def __init__(self, species_class, rng=None):
+        """
+        Method for saving values in class.
+
+        :param species_class: Herbivores or Carnivores
+        :param rng: Random number generator for the random decisions of the population, the
+                    shared :data:`biosim.animals.default_rng` if None.
+        """
+        self.species_class = species_class
+        self.rng = default_rng if rng is None else rng
+        self.size = 0
+        self.ordered = True
+
+        self._age = np.zeros(self.initial_capacity, dtype=np.int64)
+        self._weight = np.zeros(self.initial_capacity)
+        self._phi = np.zeros(self.initial_capacity)
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def age(self):
+        """
+        Ages of the living animals.
+        """
+        return self._age[:self.size]
+
+    @property
+    def weight(self):
+        """
+        Weights of the living animals.
+        """
+        return self._weight[:self.size]
+
+    @property
+    def phi(self):
+        """
+        Fitness of the living animals.
+        """
+        return self._phi[:self.size]
+
+    @property
+    def nbytes(self):
+        """
+        Number of bytes used by the arrays, including spare capacity.
+        """
+        return sum(getattr(self, name).nbytes for name in self._buffers)
+
+    def trait_values(self, trait):
+        """
+        Method for collecting one trait of every animal in the population.
+
+        :param trait: Name of the trait, 'phi', 'age' or 'weight'.
+        :return: Array with one value per animal.
+        """
+        return getattr(self, trait)
+
+    def _reserve(self, amount_new):
+        """
+        Method for making room for new animals at the end of the arrays.
+
+        :param amount_new: Number of animals to make room for.
+        """
+        needed = self.size + amount_new
+        capacity = len(self._age)
+        if needed <= capacity:
+            return
+
+        while capacity < needed:
+            capacity *= 2
+
+        for name in self._buffers:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def add_animals(self, ages, weights, phis=None):
+        """
+        Method for adding animals to the end of the population.
+
+        :param ages: Sequence with ages of the new animals
+        :param weights: Sequence with weights of the new animals
+        :param phis: Sequence with fitness of the new animals, calculated if None
+        """
+        ages = np.asarray(ages, dtype=np.int64)
+        weights = np.asarray(weights, dtype=float)
+        if phis is None:
+            phis = self.species_class.fitness_batch(ages, weights)
+
+        amount_new = len(ages)
+        self._reserve(amount_new)
+        start, stop = self.size, self.size + amount_new
+        self._age[start:stop] = ages
+        self._weight[start:stop] = weights
+        self._phi[start:stop] = phis
+        self.size = stop
+        if amount_new > 0:
+            self.ordered = False
+
+    def remove_animals(self, keep):
+        """
+        Method for removing animals, keeping the survivors at the front of the arrays.
+
+        :param keep: Boolean array, True for the animals that stay in the population.
+        """
+        amount_kept = int(np.count_nonzero(keep))
+        if amount_kept == self.size:
+            return
+
+        for name in self._buffers:
+            buffer = getattr(self, name)
+            buffer[:amount_kept] = buffer[:self.size][keep]
+        self.size = amount_kept
+
+    def _permute(self, order, start=0):
+        """
+        Method for reordering a part of the animals.
+
+        :param order: Indices of the animals in the part in their new order, counted from start.
+        :param start: Index of the first animal in the part.
+        """
+        stop = start + len(order)
+        for name in self._buffers:
+            buffer = getattr(self, name)
+            buffer[start:stop] = buffer[start:stop][order]
+
+    def order_by_fitness(self):
+        """
+        Method for storing the animals in ascending order of fitness, unless they already are.
+
+        Animals with the same fitness are stored in reverse order, so that reading the arrays from
+        the end gives the fittest animals in the same order as :meth:`fittest`.
+        """
+        if not self.ordered:
+            self._permute(np.argsort(-self.phi, kind='stable')[::-1])
+            self.ordered = True
+
+    def update_fitness(self):
+        """
+        Method for recalculating the fitness of every animal in the population.
+        """
+        self._phi[:self.size] = self.species_class.fitness_batch(self.age, self.weight)
+        self.ordered = False
+
+    def eats_fodder(self, amount_fodder):
+        """
+        Method for herbivores eating fodder in descending order of fitness.
+
+        Each herbivore eats F, or what is left of the fodder if that is less than F. If the
+        population is ordered by fitness, the fittest herbivores are read from the end of the
+        arrays, and only the herbivores that ate are put in order again afterwards, since they
+        are still fitter than the others. Otherwise only the herbivores the fodder can feed are
+        put in order, see :meth:`fittest`.
+
+        :param amount_fodder: Amount of fodder available in the cell.
+        :return: Amount of fodder left after feeding.
+        """
+        if self.size == 0 or amount_fodder <= 0:
+            return amount_fodder
+
+        params = self.species_class.params
+        amount_eaters = min(int(amount_fodder // params.F) + 1, self.size)
+        if self.ordered:
+            order = np.arange(self.size - 1, self.size - 1 - amount_eaters, -1)
+        else:
+            order = self.fittest(amount_eaters)
+        left_before = amount_fodder - params.F * np.arange(len(order))
+        amount_eaten = np.clip(left_before, 0, params.F)
+
+        fed = order[amount_eaten > 0]
+        self._weight[fed] += params.beta * amount_eaten[amount_eaten > 0]
+        self._phi[fed] = self.species_class.fitness_batch(self._age[fed], self._weight[fed])
+
+        if self.ordered:
+            start = self.size - len(fed)
+            self._permute(np.argsort(self._phi[start:self.size], kind='stable'), start)
+
+        return amount_fodder - amount_eaten.sum()
+
+    def fittest(self, amount):
+        """
+        Method for finding the fittest animals, in descending order of fitness.
+
+        Gives the same animals in the same order as the first entries of a stable sort of the
+        whole population, where animals with equal fitness keep their order in the arrays. When
+        only a few animals are needed, they are selected with a partition before they are sorted.
+
+        :param amount: Number of animals to find.
+        :return: Indices of the fittest animals, the fittest first.
+        """
+        neg_phi = -self.phi
+        if amount >= self.size:
+            return np.argsort(neg_phi, kind='stable')
+
+        threshold = np.partition(neg_phi, amount - 1)[amount - 1]
+        above = np.flatnonzero(neg_phi < threshold)
+        ties = np.flatnonzero(neg_phi == threshold)[:amount - len(above)]
+        selected = np.sort(np.concatenate((above, ties)))
+        return selected[np.argsort(neg_phi[selected], kind='stable')]
+
+    def hunts(self, herbivores):
+        """
+        Method for carnivores hunting the herbivores in the same cell.
+
+        The carnivores hunt one at a time in random order, each with
+        :meth:`biosim.animals.Carnivores.hunt_batch` on the herbivores ordered by fitness, see
+        :meth:`order_by_fitness`.
+
+        :param herbivores: Population with the herbivores in the cell.
+        """
+        if self.size == 0 or herbivores.size == 0:
+            return
+
+        herbivores.order_by_fitness()
+        herb_phis = herbivores.phi
+        herb_weights = herbivores.weight
+        alive = np.ones(herbivores.size, dtype=bool)
+        amount_alive = herbivores.size
+
+        for carn in self.rng.permutation(self.size):
+            if amount_alive == 0:
+                break
+
+            weight, amount_killed = self.species_class.hunt_batch(self._age[carn],
+                                                                  self._weight[carn],
+                                                                  self._phi[carn], herb_phis,
+                                                                  herb_weights, alive, self.rng)
+            if amount_killed > 0:
+                self._weight[carn] = weight
+                self._phi[carn] = self.species_class.fitness_value(self._age[carn], weight)
+                amount_alive -= amount_killed
+
+        self.ordered = False
+        herbivores.remove_animals(alive)
+
+    def gives_birth(self):
+        """
+        Method for giving birth, following :meth:`biosim.animals.Animals.procreation_batch`.
+
+        All mothers are decided at once, and the newborns are added to the end of the population.
+        """
+        amount_same_species = self.size
+        if amount_same_species < 2:
+            return
+
+        mothers, newborn_weights = self.species_class.procreation_batch(self.weight, self.phi,
+                                                                        amount_same_species,
+                                                                        self.rng)
+        if len(mothers) == 0:
+            return
+
+        self._weight[mothers] -= self.species_class.params.xi * newborn_weights
+        self._phi[mothers] = self.species_class.fitness_batch(self._age[mothers],
+                                                              self._weight[mothers])
+        self.ordered = False
+        self.add_animals(np.zeros(len(mothers), dtype=np.int64), newborn_weights)
+
+    def gets_older(self):
+        """
+        Method for aging every animal one year, including the annual weight loss.
+        """
+        params = self.species_class.params
+        self._age[:self.size] += 1
+        self._weight[:self.size] -= params.eta * self.weight
+        self.update_fitness()
+
+    def dies(self):
+        """
+        Method for removing the animals that die, following :meth:`biosim.animals.Animals.death`.
+        """
+        if self.size == 0:
+            return
+
+        death_prob = self.species_class.params.omega * (1 - self.phi)
+        dead = (self.weight == 0) | (self.rng.random(self.size) < death_prob)
+        self.remove_animals(~dead)
+
+    def ages_and_dies(self):
+        """
+        Method for aging every animal and removing the ones that die, in one pass.
+
+        Uses :meth:`biosim.animals.Animals.aging_and_death_batch`.
+        """
+        if self.size == 0:
+            return
+
+        ages, weights, phis, survives = self.species_class.aging_and_death_batch(
+            self.age, self.weight, self.rng)
+        self._age[:self.size] = ages
+        self._weight[:self.size] = weights
+        self._phi[:self.size] = phis
+        self.ordered = False
+        self.remove_animals(survives)
+
+    def wants_to_migrate(self):
+        """
+        Method for deciding which animals want to migrate this year.
+
+        :return: Indices of the animals that want to move.
+        """
+        prob_migrate = self.species_class.params.mu * self.phi
+        return np.flatnonzero(self.rng.random(self.size) < prob_migrate)
+
+
+class IslandPopulation(Population):
+    """
+    Class for storing all animals of one species on the whole island as arrays.
+
+    Works like :class:`Population`, but keeps the cell of every animal as an extra array, so
+    that the phases of the year can act on the animals of every cell at once. The cell is
+    the flat index of the cell in the island grid.
+    """
+
+    _buffers = Population._buffers + ('_cell',)
+
+    def __init__(self, species_class, rng=None):
+        """
+        Method for saving values in class.
+
+        :param species_class: Herbivores or Carnivores
+        :param rng: Random number generator for the random decisions of the population
+        """
+        self._cell = np.zeros(self.initial_capacity, dtype=np.intp)
+        super().__init__(species_class, rng)
+
+    @property
+    def cell(self):
+        """
+        Flat cell indices of the living animals.
+        """
+        return self._cell[:self.size]
+
+    def add_animals(self, cells, ages, weights, phis=None):
+        """
+        Method for adding animals to the end of the population.
+
+        :param cells: Sequence with the flat cell indices of the new animals
+        :param ages: Sequence with ages of the new animals
+        :param weights: Sequence with weights of the new animals
+        :param phis: Sequence with fitness of the new animals, calculated if None
+        """
+        start = self.size
+        super().add_animals(ages, weights, phis)
+        self._cell[start:self.size] = cells
+
+    def counts(self, amount_cells):
+        """
+        Method for counting the animals in every cell.
+
+        :param amount_cells: Number of cells on the island.
+        :return: Array with the number of animals in each cell.
+        """
+        return np.bincount(self.cell, minlength=amount_cells)
+
+
+@lru_cache(maxsize=None)
+def newborn_weight_bins(w_birth, sigma_birth, quantum):
+    """
+    Function for the possible birth weights of a cohort population, and their probabilities.
+
+    The birth weight is normally distributed, and rounded to the nearest multiple of quantum.
+    The last probability is for a birth weight that is not positive, or more than six standard
+    deviations above the mean, which gives no birth. The bins only depend on the parameters,
+    so they are calculated once for each set of parameters.
+
+    :param w_birth: Mean birth weight
+    :param sigma_birth: Standard deviation of the birth weight
+    :param quantum: Weight quantum of the population
+    :return: Array with the birth weights, and array with one more entry with the probabilities.
+    """
+    newborn_weights = np.arange(1, ceil((w_birth + 6 * sigma_birth) / quantum) + 1) * quantum
+
+    edges = np.concatenate(([0], newborn_weights + quantum / 2))
+    cdf = np.array([0.5 * (1 + erf((edge - w_birth) / (sigma_birth * sqrt(2)))) for edge in edges])
+    probabilities = np.diff(cdf)
+    return newborn_weights, np.append(probabilities, max(0, 1 - probabilities.sum()))
+
+
+class CohortPopulation(Population):
+    """
+    Class for storing the animals of one species in one cell as cohorts.
+
+    A cohort is all animals with the same age and quantised weight, kept as one entry of the
+    arrays together with :attr:`count`, the number of animals in the cohort. Memory and time
+    therefore scale with the number of cohorts, not with the number of animals.
+
+    The weights are multiples of :attr:`weight_quantum`. A weight between two multiples is
+    rounded up or down at random, with probabilities that keep the expected weight, so each
+    cohort is split in two with a binomial draw. After every phase, cohorts with the same age
+    and weight are merged.
+
+    The phases follow the rules of the animals, with binomial and multinomial draws for the
+    number of animals in a cohort that give birth, die or migrate. Carnivores hunt as cohorts,
+    and share what the cohort eats equally, see :meth:`hunts`.
+    """
+
+    weight_quantum = 0.25
+
+    _buffers = Population._buffers + ('_count',)
+
+    def __init__(self, species_class, rng=None):
+        """
+        Method for saving values in class.
+
+        :param species_class: Herbivores or Carnivores
+        :param rng: Random number generator for the random decisions of the population
+        """
+        self._count = np.zeros(self.initial_capacity, dtype=np.int64)
+        super().__init__(species_class, rng)
+
+    def __len__(self):
+        return int(self.count.sum())
+
+    @property
+    def count(self):
+        """
+        Number of animals in each cohort.
+        """
+        return self._count[:self.size]
+
+    def trait_values(self, trait):
+        """
+        Method for collecting one trait of every cohort in the population.
+
+        The values are not repeated for the animals of each cohort, which would take one entry
+        per animal. The number of animals each value stands for is :attr:`count`.
+
+        :param trait: Name of the trait, 'phi', 'age' or 'weight'.
+        :return: Array with one value per cohort.
+        """
+        return getattr(self, trait)
+
+    def _quantise(self, ages, weights, counts):
+        """
+        Method for rounding weights to multiples of :attr:`weight_quantum`.
+
+        Each cohort is split into the animals rounded down and the animals rounded up, with a
+        binomial draw, so that the expected weight is kept.
+
+        :param ages: Array with the ages of the cohorts
+        :param weights: Array with the weights of the cohorts
+        :param counts: Array with the number of animals in the cohorts
+        :return: Arrays with the ages, quantised weights and counts of the split cohorts.
+        """
+        scaled = np.asarray(weights, dtype=float) / self.weight_quantum
+        nearest = np.rint(scaled)
+        scaled = np.where(np.abs(scaled - nearest) < 1e-9, nearest, scaled)
+        lower = np.floor(scaled)
+        rounded_up = self.rng.binomial(counts, scaled - lower)
+
+        return (np.concatenate((ages, ages)),
+                np.concatenate((lower, lower + 1)) * self.weight_quantum,
+                np.concatenate((counts - rounded_up, rounded_up)))
+
+    def _set_cohorts(self, ages, weights, counts):
+        """
+        Method for replacing the cohorts, merging cohorts with the same age and weight.
+
+        :param ages: Array with the ages of the cohorts
+        :param weights: Array with the weights of the cohorts, multiples of :attr:`weight_quantum`
+        :param counts: Array with the number of animals in the cohorts. Empty cohorts are dropped.
+        """
+        present = np.asarray(counts) > 0
+        steps = np.rint(np.asarray(weights)[present] / self.weight_quantum).astype(np.int64)
+        keys = (np.asarray(ages, dtype=np.int64)[present] << 32) | steps
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        merged_counts = np.bincount(inverse, weights=np.asarray(counts)[present]).astype(np.int64)
+
+        self.size = 0
+        super().add_animals(unique_keys >> 32, (unique_keys & 0xFFFFFFFF) * self.weight_quantum)
+        self._count[:self.size] = merged_counts
+
+    def add_animals(self, ages, weights, phis=None, counts=None):
+        """
+        Method for adding animals to the population.
+
+        The weights are quantised, and the new animals join the cohorts with the same age and
+        weight. The fitness is calculated from the quantised weights.
+
+        :param ages: Sequence with ages of the new animals or cohorts
+        :param weights: Sequence with weights of the new animals or cohorts
+        :param phis: Not used, since the fitness follows from the quantised weight
+        :param counts: Sequence with the number of animals of each new cohort, one each if None
+        """
+        ages = np.asarray(ages, dtype=np.int64)
+        counts = (np.ones(len(ages), dtype=np.int64) if counts is None
+                  else np.asarray(counts, dtype=np.int64))
+        new_ages, new_weights, new_counts = self._quantise(ages, weights, counts)
+
+        self._set_cohorts(np.concatenate((self.age, new_ages)),
+                          np.concatenate((self.weight, new_weights)),
+                          np.concatenate((self.count, new_counts)))
+
+    def take_animals(self, cohorts, counts):
+        """
+        Method for taking animals out of their cohorts.
+
+        Cohorts that are left empty stay until :meth:`remove_empty` is called.
+
+        :param cohorts: Array with the indices of the cohorts
+        :param counts: Array with the number of animals to take from each cohort
+        :return: Tuple with the ages, weights, fitness and counts of the animals taken.
+        """
+        self._count[cohorts] -= counts
+        return self.age[cohorts], self.weight[cohorts], self.phi[cohorts], counts
+
+    def remove_empty(self):
+        """
+        Method for removing the cohorts without animals, keeping the order of the others.
+        """
+        self.remove_animals(self.count > 0)
+
+    def eats_fodder(self, amount_fodder):
+        """
+        Method for herbivores eating fodder in descending order of fitness.
+
+        The animals of a cohort eat one after another, so in each cohort some animals eat F,
+        at most one animal eats what is left of the fodder, and the others eat nothing. The
+        cohort is split into these groups.
+
+        :param amount_fodder: Amount of fodder available in the cell.
+        :return: Amount of fodder left after feeding.
+        """
+        if self.size == 0 or amount_fodder <= 0:
+            return amount_fodder
+
+        params = self.species_class.params
+        order = np.argsort(-self.phi, kind='stable')
+        ages, weights, counts = self.age[order], self.weight[order], self.count[order]
+
+        left_before = amount_fodder - params.F * (np.cumsum(counts) - counts)
+        amount_full = np.clip(np.floor(left_before / params.F), 0, counts).astype(np.int64)
+        rest = np.clip(left_before - params.F * amount_full, 0, params.F)
+        rest = np.where(amount_full < counts, rest, 0)
+        amount_partial = (rest > 0).astype(np.int64)
+
+        amount_eaten = params.F * amount_full.sum() + rest.sum()
+        self._set_cohorts(*self._quantise(np.concatenate((ages, ages, ages)),
+                                          np.concatenate((weights + params.beta * params.F,
+                                                          weights + params.beta * rest,
+                                                          weights)),
+                                          np.concatenate((amount_full, amount_partial,
+                                                          counts - amount_full - amount_partial))))
+        return amount_fodder - amount_eaten
+
+    def hunts(self, herbivores):
+        """
+        Method for carnivore cohorts hunting the herbivore cohorts in the same cell.
+
+        The carnivore cohorts hunt one at a time in random order, through the herbivore cohorts
+        in ascending order of fitness, until the cohort has eaten F for each of its carnivores.
+        A herbivore is killed if one of the carnivores of the cohort that are still hungry kills
+        it, so the number of kills in a herbivore cohort is a binomial draw. The carnivores fill
+        up one after another, so after the hunt some carnivores of the cohort have eaten F, at
+        most one has eaten less, and the others nothing, as in :meth:`eats_fodder`. During the
+        hunt, the fitness of the cohort follows its mean weight.
+
+        :param herbivores: CohortPopulation with the herbivores in the cell.
+        """
+        if self.size == 0 or herbivores.size == 0:
+            return
+
+        params = self.species_class.params
+        herbivores.order_by_fitness()
+        herb_phis = herbivores.phi
+        herb_weights = herbivores.weight
+        alive = herbivores.count.copy()
+        amount_eaten = np.zeros(self.size)
+
+        for carn in self.rng.permutation(self.size):
+            phi = self._phi[carn]
+            appetite = params.F * self._count[carn]
+            herb = 0
+
+            while (herb < np.searchsorted(herb_phis, phi, side='left')
+                   and amount_eaten[carn] < appetite):
+                if alive[herb] > 0:
+                    hunger = appetite - amount_eaten[carn]
+                    amount_hungry = ceil(hunger / params.F)
+                    prob_kill = min((phi - herb_phis[herb]) * params.inv_DeltaPhiMax, 1)
+                    eaten_per_kill = min(herb_weights[herb], params.F)
+                    amount_killed = self.rng.binomial(alive[herb],
+                                                      1 - (1 - prob_kill) ** amount_hungry)
+                    if eaten_per_kill > 0:
+                        # Herbivores without weight give no food, so hunger does not cap the kills
+                        amount_killed = min(amount_killed, ceil(hunger / eaten_per_kill))
+
+                    if amount_killed > 0:
+                        amount_eaten[carn] += min(amount_killed * eaten_per_kill, hunger)
+                        alive[herb] -= amount_killed
+                        gained = params.beta * amount_eaten[carn] / self._count[carn]
+                        phi = self.species_class.fitness_value(self._age[carn],
+                                                               self._weight[carn] + gained)
+                herb += 1
+
+        herbivores._count[:herbivores.size] = alive
+        herbivores.remove_empty()
+
+        amount_full = np.minimum(amount_eaten // params.F, self.count).astype(np.int64)
+        rest = np.where(amount_full < self.count, amount_eaten - params.F * amount_full, 0)
+        amount_partial = (rest > 0).astype(np.int64)
+        amount_unfed = self.count - amount_full - amount_partial
+        self._set_cohorts(*self._quantise(np.concatenate((self.age, self.age, self.age)),
+                                          np.concatenate((self.weight + params.beta * params.F,
+                                                          self.weight + params.beta * rest,
+                                                          self.weight)),
+                                          np.concatenate((amount_full, amount_partial,
+                                                          amount_unfed))))
+
+    def _newborn_weights(self):
+        """
+        Method for the possible birth weights, and their probabilities, see
+        :func:`newborn_weight_bins`.
+
+        :return: Array with the birth weights, and array with one more entry with the probabilities.
+        """
+        params = self.species_class.params
+        return newborn_weight_bins(params.w_birth, params.sigma_birth, self.weight_quantum)
+
+    def gives_birth(self):
+        """
+        Method for giving birth, following :meth:`biosim.animals.Animals.procreation`.
+
+        The number of mothers in each cohort that try to give birth is a binomial draw, and their
+        birth weights a multinomial draw. A birth only happens if the mother weighs more than xi
+        times the newborn. The mothers with the same birth weight form a new cohort, and so do
+        the newborns.
+        """
+        amount_same_species = len(self)
+        if amount_same_species < 2:
+            return
+
+        params = self.species_class.params
+        candidates = np.flatnonzero(self.weight >= params.birth_demand)
+        if len(candidates) == 0:
+            return
+
+        birth_prob = np.minimum(1, params.gamma * self.phi[candidates] * (amount_same_species - 1))
+        amount_births = self.rng.binomial(self.count[candidates], birth_prob)
+        newborn_weights, probabilities = self._newborn_weights()
+        births = self.rng.multinomial(amount_births, probabilities)[:, :-1]
+        births[params.xi * newborn_weights[np.newaxis, :]
+               >= self.weight[candidates][:, np.newaxis]] = 0
+
+        mothers, weight_steps = np.nonzero(births)
+        if len(mothers) == 0:
+            return
+
+        amount_born = births[mothers, weight_steps]
+        counts = self.count.copy()
+        np.subtract.at(counts, candidates[mothers], amount_born)
+        mother_weights = (self.weight[candidates[mothers]]
+                          - params.xi * newborn_weights[weight_steps])
+        mother_ages, mother_weights, mother_counts = self._quantise(self.age[candidates[mothers]],
+                                                                    mother_weights, amount_born)
+
+        newborn_ages = np.zeros(len(mothers), dtype=np.int64)
+        self._set_cohorts(np.concatenate((self.age, mother_ages, newborn_ages)),
+                          np.concatenate((self.weight, mother_weights,
+                                          newborn_weights[weight_steps])),
+                          np.concatenate((counts, mother_counts, amount_born)))
+
+    def gets_older(self):
+        """
+        Method for aging every animal one year, including the annual weight loss.
+        """
+        params = self.species_class.params
+        self._set_cohorts(*self._quantise(self.age + 1, self.weight - params.eta * self.weight,
+                                          self.count))
+
+    def dies(self):
+        """
+        Method for removing the animals that die, with a binomial draw for the number of deaths in
+        each cohort.
+        """
+        if self.size == 0:
+            return
+
+        death_prob = np.where(self.weight == 0, 1, self.species_class.params.omega * (1 - self.phi))
+        self._count[:self.size] -= self.rng.binomial(self.count, death_prob)
+        self.remove_empty()
+
+    def ages_and_dies(self):
+        """
+        Method for aging every animal and removing the ones that die.
+        """
+        if self.size == 0:
+            return
+
+        self.gets_older()
+        self.dies()
+
+    def wants_to_migrate(self):
+        """
+        Method for deciding how many animals of each cohort want to migrate this year.
+
+        :return: Array with the indices of the cohorts with animals that want to move, and array
+                 with the number of these animals.
+        """
+        amount_movers = self.rng.binomial(self.count, self.species_class.params.mu * self.phi)
+        cohorts = np.flatnonzero(amount_movers)
+        return cohorts, amount_movers[cohorts]
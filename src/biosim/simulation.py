@@ -78,12 +78,22 @@ This code
 # https://opensource.org/licenses/BSD-3-Clause
 # (C) Copyright 2021 Hans Ekkehard Plesser / NMBU
 
+from functools import partial
+
 from .visualization import Graphics
 from .island import Island
-import random
+from .vectorized_island import VectorizedIsland
+from .parallel_island import ParallelIsland
+import numpy as np
 
 _DEFAULT_GRAPHICS_NAME = 'bs'
 
+# Island classes that can run the annual cycle, selected with the engine argument of BioSim
+_ENGINES = {'reference': Island,
+            'vectorized': VectorizedIsland,
+            'cohorts': partial(Island, storage='cohorts'),
+            'parallel': ParallelIsland}
+
 
 class BioSim:
     """
@@ -101,7 +111,9 @@ class BioSim:
                  img_base=None,
                  img_fmt='png',
                  img_years=None,
-                 log_file=None):
+                 log_file=None,
+                 engine='reference',
+                 engine_options=None):
         """
         :param island_map: Multi-line string specifying island geography
         :param ini_pop: List of dictionaries specifying initial population
@@ -115,6 +127,16 @@ class BioSim:
         :param img_fmt: String with file type for figures, e.g. 'png'
         :param img_years: years between visualizations saved to files (default: vis_years)
         :param log_file: If given, write animal counts to this file
+        :param engine: 'reference' for one object per animal and cell, see
+                       :class:`biosim.island.Island`, 'vectorized' for arrays over the whole
+                       island, see :class:`biosim.vectorized_island.VectorizedIsland`, 'cohorts'
+                       for very large herds, with the animals of each cell grouped in cohorts, see
+                       :class:`biosim.population.CohortPopulation`, or 'parallel' for large maps,
+                       with strips of rows simulated in worker processes, see
+                       :class:`biosim.parallel_island.ParallelIsland`. Call :meth:`close`, or use
+                       the simulation in a with block, to end the workers of the parallel engine
+        :param engine_options: Dict with more keyword arguments for the island class of the
+                               engine, e.g. {'workers': 4} for the parallel engine
 
         If ymax_animals is None, the y-axis limit should be adjusted automatically.
         If cmax_animals is None, sensible, fixed default values should be used.
@@ -136,8 +158,22 @@ class BioSim:
         img_dir and img_base must either be both None or both strings.
 
         .. note:: For default values for img_* parameters, see :mod:`biosim.visualization`.
+
+        All engines follow the same rules and answer the same queries, so the graphics and the
+        log file work with any of them. The reference engine is kept for validating the others.
+        The cohort engine rounds the weights, and lets the carnivores of a cohort hunt together,
+        so it only agrees with the others on average. The parallel engine draws its random numbers
+        in the workers, so it also only agrees with the others on average.
+
+        The parallel engine starts one worker per CPU by default, but never more workers than
+        there are rows with habitable cells, since each worker simulates a strip of whole rows.
+        Set the number of workers with engine_options={'workers': ...}.
         """
-        random.seed(seed)
+        if engine not in _ENGINES:
+            raise ValueError('Invalid engine: ' + str(engine))
+
+        # Every random decision of the simulation is drawn from this generator
+        self.rng = np.random.default_rng(seed)
 
         if img_years is None:
             self.img_years = vis_years
@@ -150,7 +186,9 @@ class BioSim:
         self._final_year = None
 
         self.island_map = island_map
-        self.island = Island(island_map, ini_pop)
+        self.engine = engine
+        engine_options = {} if engine_options is None else engine_options
+        self.island = _ENGINES[engine](island_map, ini_pop, rng=self.rng, **engine_options)
 
         self.img_fmt = img_fmt
 
@@ -207,35 +245,25 @@ class BioSim:
                 raise ValueError('img_years must be multiple of vis_years')
         else:
             enable_graphics = False
-            self.vis_years = 1
 
         while self._current_year < self._final_year:
             self.island.annual_cycle_simulation()
             self._current_year += 1
 
-            if self._current_year % self.vis_years == 0 and enable_graphics:
-                self._graphics.update(self.island_map,
-                                      self.island.heatmap_population()[0],
-                                      self.island.heatmap_population()[1],
-                                      self.cmax_herb,
-                                      self.cmax_carn,
-                                      self.num_animals_per_species,
-                                      self._current_year)
-                self._graphics._update_fitness_hist(self.island.fitness_list()[0],
-                                                    self.island.fitness_list()[1],
-                                                    self.hist_specs)
-                self._graphics._update_age_hist(self.island.age_list()[0],
-                                                self.island.age_list()[1],
-                                                self.hist_specs)
-                self._graphics._update_weight_hist(self.island.weight_list()[0],
-                                                   self.island.weight_list()[1],
-                                                   self.hist_specs)
+            visualise = enable_graphics and self._current_year % self.vis_years == 0
+            if not visualise and self.log_file is None:
+                continue
+
+            # One snapshot of the island for the graphics and the log file
+            snapshot = self.island.snapshot(traits=visualise)
+            if visualise:
+                self._graphics.update(self.island_map, snapshot, self.cmax_herb, self.cmax_carn,
+                                      self._current_year, self.hist_specs)
 
             if self.log_file is not None:
-                amount_herbs = self.num_animals_per_species['Herbivore']
-                amount_carns = self.num_animals_per_species['Carnivore']
                 with open(self.log_file, 'a') as infile:
-                    infile.writelines(f'{self._current_year},{amount_herbs},{amount_carns}\n')
+                    infile.writelines(f'{self._current_year},{snapshot.total_herbs},'
+                                      f'{snapshot.total_carns}\n')
 
     def add_population(self, population):
         """
@@ -268,6 +296,31 @@ class BioSim:
         amount_animals_species, _ = self.island.animals_per_species()
         return amount_animals_species
 
+    def memory_report(self):
+        """
+        Report of the memory used by the animals on the island.
+
+        Useful for estimating how much memory a simulation needs when the population grows.
+        For each species, the report contains the number of animals, the total number of bytes
+        and the average number of bytes per animal. The total number of bytes for all
+        animals is given under 'Total'.
+
+        :return: Dictionary with the memory report.
+        """
+        amount_animals_species, total_amount_animals = self.island.animals_per_species()
+        footprint = self.island.memory_footprint()
+
+        report = {}
+        for species, amount_animals in amount_animals_species.items():
+            report[species] = {'animals': amount_animals,
+                               'bytes': footprint[species],
+                               'bytes_per_animal': (footprint[species] / amount_animals
+                                                    if amount_animals else 0)}
+        report['Total'] = {'animals': total_amount_animals,
+                           'bytes': sum(footprint.values())}
+
+        return report
+
     def make_movie(self, movie_fmt=None):
         """
         Create MPEG4 movie from visualization images saved.
@@ -278,3 +331,17 @@ class BioSim:
         The movie is stored as img_base + movie_fmt.
         """
         self._graphics.make_movie(movie_fmt)
+
+    def close(self):
+        """
+        Close the island, ending the worker processes and freeing the shared memory of the
+        parallel engine. The other engines have nothing to close.
+        """
+        if hasattr(self.island, 'close'):
+            self.island.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
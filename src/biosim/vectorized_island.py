@@ -0,0 +1,441 @@
+# -*- coding: utf-8 -*-
+
+__author__ = 'Andrine Zimmermann, Karin Mollatt'
+__email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
+
+import numpy as np
+
+"""
+:mod: 'biosim.vectorized_island' contains the array based engine for the annual cycle of Rossumøya.
+
+This file only has one class, VectorizedIsland. It answers the same queries as
+:class:`biosim.island.Island`, so :class:`biosim.simulation.BioSim` can use either of them.
+"""
+
+from .animals import Herbivores, Carnivores, default_rng
+from .island import Island, IslandSnapshot, freeze
+from .population import IslandPopulation
+
+
+def cell_segments(sorted_cells):
+    """
+    Function for finding the runs of equal cells in a sorted array of cells.
+
+    :param sorted_cells: Array with flat cell indices in ascending order.
+    :return: Arrays with the start and the stop of each run.
+    """
+    if len(sorted_cells) == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+
+    starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+    stops = np.r_[starts[1:], len(sorted_cells)]
+    return starts, stops
+
+
+class VectorizedIsland:
+    """
+    Class for an island where each phase of the year acts on every cell at once.
+
+    All animals of one species on the island are kept in one
+    :class:`biosim.population.IslandPopulation`, and the landscape types and the fodder of the
+    cells in 2-D arrays. The rules are the same as in :class:`biosim.island.Island`, but each
+    phase is done for the whole island before the next one starts:
+
+    #. the fodder regrows in every cell,
+    #. the herbivores eat, and the carnivores hunt,
+    #. the animals give birth,
+    #. the animals migrate,
+    #. the animals age, lose weight and die.
+
+    Since migration is one phase, every animal migrates at most once a year, without a
+    migration flag. An animal that draws a cell it cannot move to stays where it is.
+    """
+
+    map_params = Island.map_params
+
+    # Movement for north, south, east and west, in the same order as Island.migration_steps
+    migration_steps = Island.migration_steps
+
+    def __init__(self, island_map, ini_pop, rng=None):
+        """
+        Method for saving values in class.
+
+        :param island_map: Multi-line string specifying island geography
+        :param ini_pop: List of dictionaries specifying initial population
+        :param rng: Random number generator for every random decision on the island, the shared
+                    :data:`biosim.animals.default_rng` if None.
+        """
+        self.rng = default_rng if rng is None else rng
+        self.ini_pop = ini_pop
+        self.map_string = island_map
+        self.creating_grid(island_map)
+
+        self.herbivores = IslandPopulation(Herbivores, self.rng)
+        self.carnivores = IslandPopulation(Carnivores, self.rng)
+        self.adding_population(self.ini_pop)
+
+    def creating_grid(self, island_map):
+        """
+        Method for creating the arrays describing the cells of the island.
+
+        :attr:`landscape_codes` holds the index of the landscape type of each cell in
+        :attr:`map_params`, :attr:`habitable` is True for the cells animals can live in, and
+        :attr:`fodder` holds the amount of fodder. The cell at location (x, y) is element
+        (x - 1, y - 1) of the arrays.
+
+        :param island_map: Multi-line string specifying island geography
+        """
+        map_lines = island_map.strip().splitlines()
+
+        for line in map_lines:
+            for landscape_type in line:
+                if landscape_type not in self.map_params:
+                    raise ValueError('Invalid landscape type: ' + landscape_type)
+
+        for line in map_lines:
+            if len(line) != len(map_lines[0]):
+                raise ValueError('Each line must be of equal length.')
+
+        border = map_lines[0] + map_lines[-1] + ''.join(line[0] + line[-1] for line in map_lines)
+        if set(border) != {'W'}:
+            raise ValueError('The island must be surrounded of water')
+
+        type_codes = {landscape_type: code for code, landscape_type in enumerate(self.map_params)}
+        self.landscape_codes = np.array([[type_codes[landscape_type] for landscape_type in line]
+                                         for line in map_lines], dtype=np.intp)
+        self.habitable = np.array([landscape.available for landscape in self.map_params.values()])[
+            self.landscape_codes]
+        self.fodder = np.zeros(self.landscape_codes.shape)
+
+        # Change of the flat cell index for each migration step
+        self._flat_steps = self.migration_steps @ np.array([self.row_length, 1])
+
+    @property
+    def row_length(self):
+        """
+        Number of rows.
+        """
+        return self.landscape_codes.shape[1]
+
+    @property
+    def col_length(self):
+        """
+        Number of columns.
+        """
+        return self.landscape_codes.shape[0]
+
+    @property
+    def amount_cells(self):
+        """
+        Number of cells on the island.
+        """
+        return self.landscape_codes.size
+
+    def flat_index(self, loc):
+        """
+        Method for finding the flat cell index of a location.
+
+        :param loc: Location tuple
+        :return: Index of the cell in the flattened grid arrays.
+        """
+        loc_x, loc_y = loc
+        if not (1 <= loc_x <= self.col_length and 1 <= loc_y <= self.row_length):
+            raise KeyError('This location is invalid.')
+        return (loc_x - 1) * self.row_length + (loc_y - 1)
+
+    def adding_population(self, incoming_pop=None):
+        """
+        Method for adding population to the island.
+
+        The animals are created once, so that age and weight are checked in the same way
+        as for the animal objects, before their traits are copied into the arrays.
+
+        :param incoming_pop: List of dictionaries specifying initial population
+        """
+        if incoming_pop is None:
+            return
+
+        for dict_loc_pop in incoming_pop:
+            cell = self.flat_index(dict_loc_pop['loc'])
+
+            new_animals = {'Herbivore': [], 'Carnivore': []}
+            for pop_dict in dict_loc_pop['pop']:
+                if pop_dict['species'] == 'Herbivore':
+                    new_animals['Herbivore'].append(Herbivores(pop_dict['age'], pop_dict['weight'],
+                                                               self.rng))
+                elif pop_dict['species'] == 'Carnivore':
+                    new_animals['Carnivore'].append(Carnivores(pop_dict['age'], pop_dict['weight'],
+                                                               self.rng))
+                else:
+                    raise TypeError('The only accepted species are Herbivore and Carnivore.')
+
+            for population, animals in ((self.herbivores, new_animals['Herbivore']),
+                                        (self.carnivores, new_animals['Carnivore'])):
+                population.add_animals([cell] * len(animals),
+                                       [animal.age for animal in animals],
+                                       [animal.weight for animal in animals],
+                                       [animal.phi for animal in animals])
+
+    def animals_per_species(self):
+        """
+        Method for creating a dictionary containing the amount of animals per species.
+
+        As for :class:`biosim.island.Island`, only animals in habitable cells are counted.
+
+        :return: Dictionary with the amount of animals per species.
+        """
+        habitable = self.habitable.ravel()
+        amount_herbs = int(self.herbivores.counts(self.amount_cells)[habitable].sum())
+        amount_carns = int(self.carnivores.counts(self.amount_cells)[habitable].sum())
+
+        amount_animals_species = {'Herbivore': amount_herbs, 'Carnivore': amount_carns}
+        total_amount_animals = amount_herbs + amount_carns
+        return amount_animals_species, total_amount_animals
+
+    def memory_footprint(self):
+        """
+        Method for estimating the memory used by the animals on the island.
+
+        :return: Dictionary with the number of bytes used by each species.
+        """
+        return {'Herbivore': self.herbivores.nbytes, 'Carnivore': self.carnivores.nbytes}
+
+    def heatmap_population(self):
+        """
+        Method for creating population distribution of heatmap for herbivores and carnivores.
+
+        :return: 2D arrays with population in each cell for herbivores and carnivores.
+        """
+        shape = self.landscape_codes.shape
+        return (self.herbivores.counts(self.amount_cells).reshape(shape),
+                self.carnivores.counts(self.amount_cells).reshape(shape))
+
+    def snapshot(self, traits=True):
+        """
+        Method for collecting the statistics of the island, see
+        :meth:`biosim.island.Island.snapshot`.
+
+        :param traits: If False, only the counts are collected.
+        :return: Read-only :class:`biosim.island.IslandSnapshot`.
+        """
+        herb_counts, carn_counts = freeze(*self.heatmap_population())
+        amount_animals_species, _ = self.animals_per_species()
+        if not traits:
+            return IslandSnapshot(herb_counts, carn_counts, amount_animals_species['Herbivore'],
+                                  amount_animals_species['Carnivore'],
+                                  None, None, None, None, None, None)
+
+        # One row per trait, in the order fitness, age and weight
+        herb_traits = np.empty((3, self.herbivores.size))
+        carn_traits = np.empty((3, self.carnivores.size))
+        for traits, population in ((herb_traits, self.herbivores), (carn_traits, self.carnivores)):
+            traits[0], traits[1], traits[2] = population.phi, population.age, population.weight
+
+        freeze(herb_traits, carn_traits)
+        return IslandSnapshot(herb_counts, carn_counts, amount_animals_species['Herbivore'],
+                              amount_animals_species['Carnivore'], herb_traits[0], carn_traits[0],
+                              herb_traits[1], carn_traits[1], herb_traits[2], carn_traits[2])
+
+    def fitness_list(self):
+        """
+        Method for creating arrays with fitness for all animals.
+
+        :return: Arrays containing fitness for herbivores and carnivores.
+        """
+        return self.herbivores.phi.copy(), self.carnivores.phi.copy()
+
+    def age_list(self):
+        """
+        Method for creating arrays with ages for all animals.
+
+        :return: Arrays containing ages for herbivores and carnivores.
+        """
+        return self.herbivores.age.copy(), self.carnivores.age.copy()
+
+    def weight_list(self):
+        """
+        Method for creating arrays with weights for all animals.
+
+        :return: Arrays containing weights for herbivores and carnivores.
+        """
+        return self.herbivores.weight.copy(), self.carnivores.weight.copy()
+
+    def set_animal_params_island(self, species, params):
+        """
+        Set parameters for animal species.
+
+        :param species: String, name of animal species
+        :param params: Dict with valid parameter specification for species
+        """
+        if species == 'Herbivore':
+            Herbivores.set_params(params)
+        elif species == 'Carnivore':
+            Carnivores.set_params(params)
+
+    def set_landscape_params_island(self, landscape, params):
+        """
+        Set parameters for landscape type.
+
+        :param landscape: String, code letter for landscape
+        :param params: Dict with valid parameter specification for landscape
+        """
+        self.map_params[landscape].set_params(params)
+
+    def regrow_fodder(self):
+        """
+        Method for regrowing the fodder of every cell at once.
+
+        Every cell gets the amount f_max of its landscape type.
+        """
+        f_max = np.array([landscape.params_fodder['f_max']
+                          for landscape in self.map_params.values()], dtype=float)
+        self.fodder[:] = f_max[self.landscape_codes]
+
+    def feeding_herbs(self):
+        """
+        Method for herbivores eating the fodder in their cells, for every cell at once.
+
+        In each cell, the herbivores eat in descending order of fitness, and every herbivore
+        eats F, or what is left of the fodder if that is less than F. What is left before a
+        herbivore eats is the fodder of the cell minus a cumulative sum of F over the herbivores
+        before it in the cell, so the intake of every herbivore on the island is found at once:
+
+        - the herbivores are sorted by cell, and by descending fitness within each cell,
+        - the rank of each herbivore in its cell is its position minus the start of the cell,
+        - the intake is the fodder of the cell minus F times the rank, clipped to [0, F].
+
+        The weights, the fitness and the fodder are then updated with one NumPy call each.
+        """
+        herbs = self.herbivores
+        if herbs.size == 0:
+            return
+
+        params = Herbivores.params
+        fodder = self.fodder.reshape(-1)
+        order = np.lexsort((-herbs.phi, herbs.cell))
+        sorted_cells = herbs.cell[order]
+
+        starts, stops = cell_segments(sorted_cells)
+        rank = np.arange(herbs.size) - np.repeat(starts, stops - starts)
+        amount_eaten = np.clip(fodder[sorted_cells] - params.F * rank, 0, params.F)
+
+        fed = amount_eaten > 0
+        eaters = order[fed]
+        herbs.weight[eaters] += params.beta * amount_eaten[fed]
+        herbs.phi[eaters] = Herbivores.fitness_batch(herbs.age[eaters], herbs.weight[eaters])
+        fodder -= np.bincount(sorted_cells, amount_eaten, minlength=self.amount_cells)
+
+    def feeding_carn_with_herbs(self):
+        """
+        Method for carnivores hunting the herbivores in their cells.
+
+        In each cell, the carnivores hunt one at a time in random order, with
+        :meth:`biosim.animals.Carnivores.hunt_batch` on the herbivores of the cell in ascending
+        order of fitness. The eaten herbivores are removed together at the end.
+        """
+        herbs, carns = self.herbivores, self.carnivores
+        if herbs.size == 0 or carns.size == 0:
+            return
+
+        herb_order = np.lexsort((herbs.phi, herbs.cell))
+        herb_cells = herbs.cell[herb_order]
+        herb_phis = herbs.phi[herb_order]
+        herb_weights = herbs.weight[herb_order]
+        alive = np.ones(herbs.size, dtype=bool)
+
+        carn_order = np.lexsort((self.rng.random(carns.size), carns.cell))
+        carn_cells = carns.cell[carn_order]
+        carn_starts, carn_stops = cell_segments(carn_cells)
+        herb_starts = np.searchsorted(herb_cells, carn_cells[carn_starts], side='left')
+        herb_stops = np.searchsorted(herb_cells, carn_cells[carn_starts], side='right')
+
+        for carn_start, carn_stop, herb_start, herb_stop in zip(carn_starts, carn_stops,
+                                                                herb_starts, herb_stops):
+            amount_alive = herb_stop - herb_start
+            for carn in carn_order[carn_start:carn_stop]:
+                if amount_alive == 0:
+                    break
+
+                weight, amount_killed = Carnivores.hunt_batch(carns.age[carn], carns.weight[carn],
+                                                              carns.phi[carn],
+                                                              herb_phis[herb_start:herb_stop],
+                                                              herb_weights[herb_start:herb_stop],
+                                                              alive[herb_start:herb_stop], self.rng)
+                if amount_killed > 0:
+                    carns.weight[carn] = weight
+                    carns.phi[carn] = Carnivores.fitness_value(carns.age[carn], weight)
+                    amount_alive -= amount_killed
+
+        keep = np.empty(herbs.size, dtype=bool)
+        keep[herb_order] = alive
+        herbs.remove_animals(keep)
+
+    def animals_give_birth(self):
+        """
+        Method for giving birth in every cell, following
+        :meth:`biosim.animals.Animals.procreation_batch`.
+
+        The number of animals of the same species is counted in the cell of each animal. The
+        newborns are added in the cell of their mother.
+        """
+        for population in (self.herbivores, self.carnivores):
+            if population.size < 2:
+                continue
+
+            species_class = population.species_class
+            amount_same_species = population.counts(self.amount_cells)[population.cell]
+            mothers, newborn_weights = species_class.procreation_batch(population.weight,
+                                                                       population.phi,
+                                                                       amount_same_species,
+                                                                       self.rng)
+            if len(mothers) == 0:
+                continue
+
+            population.weight[mothers] -= species_class.params.xi * newborn_weights
+            population.phi[mothers] = species_class.fitness_batch(population.age[mothers],
+                                                                  population.weight[mothers])
+            population.add_animals(population.cell[mothers], np.zeros(len(mothers), dtype=np.int64),
+                                   newborn_weights)
+
+    def migrating_animals(self):
+        """
+        Method for migrating the animals of every cell at once.
+
+        Each animal in a habitable cell wants to move with probability mu times its fitness, and
+        draws one of the four neighbouring cells. The animals that drew a habitable cell move
+        there, the others stay.
+        """
+        habitable = self.habitable.reshape(-1)
+
+        for population in (self.herbivores, self.carnivores):
+            if population.size == 0:
+                continue
+
+            prob_migrate = population.species_class.params.mu * population.phi
+            wants_to_move = ((self.rng.random(population.size) < prob_migrate)
+                             & habitable[population.cell])
+            movers = np.flatnonzero(wants_to_move)
+            steps = self._flat_steps[self.rng.integers(len(self._flat_steps), size=len(movers))]
+            next_cells = population.cell[movers] + steps
+
+            moves = habitable[next_cells]
+            population.cell[movers[moves]] = next_cells[moves]
+
+    def animals_age_and_die(self):
+        """
+        Method for aging the animals and removing the dead ones, see
+        :meth:`biosim.population.Population.ages_and_dies`.
+        """
+        self.herbivores.ages_and_dies()
+        self.carnivores.ages_and_dies()
+
+    def annual_cycle_simulation(self):
+        """
+        Method for simulating one year one the island. It follows the annual cycle.
+        """
+        self.regrow_fodder()
+        self.feeding_herbs()
+        self.feeding_carn_with_herbs()
+        self.animals_give_birth()
+        self.migrating_animals()
+        self.animals_age_and_die()
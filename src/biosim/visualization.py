@@ -94,24 +94,28 @@ class Graphics:
 
         self._gridspec = None
 
-    def update(self, sys_map, herb_array, carn_array, cmax_herb, cmax_carn, amount_animals_species, year):
+    def update(self, sys_map, snapshot, cmax_herb, cmax_carn, year, hist_specs=None):
         """
         Updates graphics with current data and save to file if necessary.
 
         :param sys_map: Current system status (2d array)
-        :param herb_array: Array with herbivore distribution
-        :param carn_array: Array with carnivore distribution
+        :param snapshot: :class:`biosim.island.IslandSnapshot` with the counts and traits of the
+                         animals
         :param cmax_herb: Value specifying color-code limits for herbivore density
         :param cmax_carn: Value specifying color-code limits for carnivore density
-        :param amount_animals_species: Amount of animals per species
         :param year: Current year
+        :param hist_specs: Specifications for histograms
         """
 
         self._update_system_map(sys_map)
-        self._update_herb_heatmap(herb_array, cmax_herb)
-        self._update_carn_heatmap(carn_array, cmax_carn)
+        self._update_herb_heatmap(snapshot.herb_counts, cmax_herb)
+        self._update_carn_heatmap(snapshot.carn_counts, cmax_carn)
         self._update_year(year)
-        self._update_mean_graph(amount_animals_species, year)
+        self._update_mean_graph(snapshot.amount_animals_species, year)
+        amounts = snapshot.herb_amounts, snapshot.carn_amounts
+        self._update_fitness_hist(snapshot.herb_phi, snapshot.carn_phi, hist_specs, *amounts)
+        self._update_age_hist(snapshot.herb_age, snapshot.carn_age, hist_specs, *amounts)
+        self._update_weight_hist(snapshot.herb_weight, snapshot.carn_weight, hist_specs, *amounts)
         self._fig.canvas.flush_events()  # ensure every thing is drawn
         plt.pause(0.00001)  # pause required to pass control to GUI
 
@@ -338,70 +342,79 @@ class Graphics:
             self._carn_axis = self._carn_ax.imshow(carn_array, interpolation='nearest', vmin=0, vmax=cmax)
             plt.colorbar(self._carn_axis, ax=self._carn_ax, orientation='vertical')
 
-    def _update_fitness_hist(self, herb_list=None, carn_list=None, hist_specs=None):
+    def _update_fitness_hist(self, herb_list=None, carn_list=None, hist_specs=None,
+                             herb_weights=None, carn_weights=None):
         """
         Method for updating the fitness histogram.
 
         :param herb_list: List with fitness for herbivores
         :param carn_list: List with fitness for carnivores
         :param hist_specs: Specifications for histograms
+        :param herb_weights: Number of herbivores each value stands for, None for one each
+        :param carn_weights: Number of carnivores each value stands for, None for one each
         """
         if hist_specs is None:
             self._fitness_ax.clear()
-            self._fitness_ax.hist(herb_list, histtype='step', color='b')
-            self._fitness_ax.hist(carn_list, histtype='step', color='r')
+            self._fitness_ax.hist(herb_list, weights=herb_weights, histtype='step', color='b')
+            self._fitness_ax.hist(carn_list, weights=carn_weights, histtype='step', color='r')
             self._fitness_ax.title.set_text('Fitness')
         else:
             fit_bins = (int(hist_specs["fitness"]["max"] / hist_specs["fitness"]["delta"]))
             self._fitness_ax.clear()
             self._fitness_ax.hist(herb_list, bins=fit_bins, histtype='step', color='b',
-                                  range=(0, hist_specs["fitness"]["max"]))
+                                  weights=herb_weights, range=(0, hist_specs["fitness"]["max"]))
             self._fitness_ax.hist(carn_list, bins=fit_bins, histtype='step', color='r',
-                                  range=(0, hist_specs["fitness"]["max"]))
+                                  weights=carn_weights, range=(0, hist_specs["fitness"]["max"]))
             self._fitness_ax.title.set_text('Fitness')
 
-    def _update_age_hist(self, herb_list=None, carn_list=None, hist_specs=None):
+    def _update_age_hist(self, herb_list=None, carn_list=None, hist_specs=None,
+                         herb_weights=None, carn_weights=None):
         """
         Method for updating the age histogram.
 
         :param herb_list: List with age for herbivores
         :param carn_list: List with age for carnivores
         :param hist_specs: Specifications for histograms
+        :param herb_weights: Number of herbivores each value stands for, None for one each
+        :param carn_weights: Number of carnivores each value stands for, None for one each
         """
         if hist_specs is None:
             self._age_ax.clear()
-            self._age_ax.hist(herb_list, histtype='step', color='b')
-            self._age_ax.hist(carn_list, histtype='step', color='r')
+            self._age_ax.hist(herb_list, weights=herb_weights, histtype='step', color='b')
+            self._age_ax.hist(carn_list, weights=carn_weights, histtype='step', color='r')
             self._age_ax.title.set_text('Age')
         else:
             age_bins = (int(hist_specs["age"]["max"] / hist_specs["age"]["delta"]))
             self._age_ax.clear()
             self._age_ax.hist(herb_list, bins=age_bins, histtype='step', color='b',
-                              range=(0, hist_specs["age"]["max"]))
+                              weights=herb_weights, range=(0, hist_specs["age"]["max"]))
             self._age_ax.hist(carn_list, bins=age_bins, histtype='step', color='r',
-                              range=(0, hist_specs["age"]["max"]))
+                              weights=carn_weights, range=(0, hist_specs["age"]["max"]))
             self._age_ax.title.set_text('Age')
 
-    def _update_weight_hist(self, herb_list=None, carn_list=None, hist_specs=None):
+    def _update_weight_hist(self, herb_list=None, carn_list=None, hist_specs=None,
+                            herb_weights=None, carn_weights=None):
         """
         Method for updating the weight histogram.
 
         :param herb_list: List with weight for herbivores
         :param carn_list: List with weight for carnivores
         :param hist_specs: Specifications for histograms
+        :param herb_weights: Number of herbivores each value stands for, None for one each
+        :param carn_weights: Number of carnivores each value stands for, None for one each
         """
         if hist_specs is None:
             self._weight_ax.clear()
-            self._weight_ax.hist(herb_list, histtype='step', color='b')
-            self._weight_ax.hist(carn_list, histtype='step', color='r')
+            self._weight_ax.hist(herb_list, weights=herb_weights, histtype='step', color='b')
+            self._weight_ax.hist(carn_list, weights=carn_weights, histtype='step', color='r')
             self._weight_ax.title.set_text('Weight')
         else:
             weight_bins = (int(hist_specs["weight"]["max"] / hist_specs["weight"]["delta"]))
             self._weight_ax.clear()
             self._weight_ax.hist(herb_list, bins=weight_bins, histtype='step', color='b',
-                                 range=(0, hist_specs["weight"]["max"]))
+                                 weights=herb_weights, range=(0, hist_specs["weight"]["max"]))
             self._weight_ax.hist(carn_list, bins=weight_bins, histtype='step', color='r',
-                                 range=(0, hist_specs["weight"]["max"]))
+                                 weights=carn_weights, range=(0, hist_specs["weight"]["max"]))
             self._weight_ax.title.set_text('Weight')
 
     def _update_mean_graph(self, amount_animals_species, year):
@@ -0,0 +1,39 @@
+__author__ = 'Andrine Zimmermann, Karin Mollatt'
+__email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
+
+"""
+Fixtures and helpers shared by the tests of every module.
+"""
+
+from biosim import animals
+import numpy as np
+import pytest
+
+SEED = 12345
+
+
+def herbs_pop(loc, amount, age=5, weight=20):
+    """
+    Function for creating the population dictionary of some herbivores in one cell.
+    """
+    return {'loc': loc,
+            'pop': [{'species': 'Herbivore', 'age': age, 'weight': weight} for _ in range(amount)]}
+
+
+def carns_pop(loc, amount, age=5, weight=20):
+    """
+    Function for creating the population dictionary of some carnivores in one cell.
+    """
+    return {'loc': loc,
+            'pop': [{'species': 'Carnivore', 'age': age, 'weight': weight} for _ in range(amount)]}
+
+
+@pytest.fixture(autouse=True)
+def seeded_default_rng():
+    """
+    Fixture resetting the shared random number generator to a fixed seed before each test.
+
+    Objects made without a random number generator use :data:`biosim.animals.default_rng`, so
+    the tests that do not give one draw the same numbers on every run.
+    """
+    animals.default_rng.bit_generator.state = np.random.default_rng(SEED).bit_generator.state
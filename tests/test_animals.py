@@ -9,6 +9,7 @@ Testing the functions in animals.py
 from biosim.animals import Herbivores, Carnivores
 import pytest
 from math import exp
+import numpy as np
 
 
 class TestAnimals:
@@ -80,6 +81,28 @@ class TestAnimals:
         with pytest.raises(KeyError):
             self.herb.set_params({"alpha": 1})
 
+    # Tests for the parameter snapshot
+    def test_params_snapshot_rebuilt(self):
+        """
+        Testing that the parameter snapshot and its derived constants follow set_params.
+        """
+        ini_zeta = Herbivores.default_params['zeta']
+        Herbivores.set_params({'zeta': 2})
+        try:
+            params = Herbivores.params
+            assert params.zeta == 2
+            assert params.birth_demand == 2 * (params.w_birth + params.sigma_birth)
+        finally:
+            Herbivores.set_params({'zeta': ini_zeta})
+
+    def test_params_snapshot_immutable(self):
+        """
+        Testing that the parameter snapshot cannot be changed directly.
+        """
+        with pytest.raises(AttributeError):
+            self.carn.params.F = 100
+        assert self.carn.params.inv_DeltaPhiMax == 1 / self.carn.params.DeltaPhiMax
+
     # Tests for __init__ method
     def test_age_negative(self):
         """
@@ -106,10 +129,11 @@ class TestAnimals:
         """
         Testing if we don't get a weight input, the weight will be drawn from a Gaussian distribution.
 
-        Using the mocker function to trick the function random.gauss to return 1.
+        Using a mocked random number generator whose normal method returns 1.
         """
-        mocker.patch("random.gauss", return_value=1)
-        assert Herbivores().weight == 1
+        rng = mocker.Mock()
+        rng.normal.return_value = 1
+        assert Herbivores(rng=rng).weight == 1
 
     def test_weight_negative(self):
         """
@@ -125,6 +149,22 @@ class TestAnimals:
         self.herb.weight = 5
         assert self.herb.weight == 5
 
+    # Tests for slots
+    def test_no_instance_dict(self):
+        """
+        Testing that animals keep their attributes in slots, so that new attributes cannot be added.
+        """
+        assert not hasattr(self.herb, '__dict__')
+        with pytest.raises(AttributeError):
+            self.carn.color = 'red'
+
+    def test_class_attributes_available(self):
+        """
+        Testing that species and parameters can still be looked up on the animals.
+        """
+        assert self.herb.species == 'Herbivores'
+        assert self.carn.default_params is Carnivores.default_params
+
     # Tests for q_func and fitness methods
     @pytest.mark.parametrize("x, x_half, phi_aw, pos_neg, expected",
                              [[5, 5, 0.5, 1, 0.5],
@@ -155,6 +195,58 @@ class TestAnimals:
         self.herb.weight = 3
         assert self.herb.weight == 3
 
+    # Tests for fitness_batch and update_fitness methods
+    def test_fitness_batch_same_as_fitness(self):
+        """
+        Testing that the batch fitness gives the same values as the fitness of each animal.
+        """
+        herbs = [Herbivores(age, weight) for age, weight in [(0, 8), (5, 20), (40, 10), (80, 60)]]
+        phis = Herbivores.fitness_batch([herb.age for herb in herbs],
+                                        [herb.weight for herb in herbs])
+        assert phis == pytest.approx([herb.phi for herb in herbs])
+
+    def test_fitness_batch_weight_zero(self):
+        """
+        Testing that the batch fitness is zero for animals with weight zero.
+        """
+        phis = Carnivores.fitness_batch(np.array([3, 4]), np.array([0, 10]))
+        assert phis[0] == 0
+        assert phis[1] > 0
+
+    def test_update_fitness(self):
+        """
+        Testing that update_fitness sets the fitness of every animal in the list.
+        """
+        herbs = [Herbivores(5, 20) for _ in range(3)]
+        for herb in herbs:
+            herb.weight = 40
+        Herbivores.update_fitness(herbs)
+        assert [herb.phi for herb in herbs] == pytest.approx([Herbivores(5, 40).phi] * 3)
+
+    # Tests for lazy fitness
+    def test_phi_stale_after_change(self):
+        """
+        Testing that eating only marks the fitness as stale, and that reading phi gives the
+        fitness for the new weight.
+        """
+        herb = Herbivores(5, 20)
+        herb.phi
+        herb.herbs_eating(10)
+        assert herb._phi_stale
+        assert herb.phi == Herbivores(5, herb.weight).fitness()
+        assert not herb._phi_stale
+
+    def test_update_fitness_only_stale(self, mocker):
+        """
+        Testing that update_fitness only recalculates animals with stale fitness.
+        """
+        herbs = [Herbivores(5, 20) for _ in range(4)]
+        Herbivores.update_fitness(herbs)
+        herbs[2].aging()
+        spy = mocker.spy(Herbivores, 'fitness_batch')
+        Herbivores.update_fitness(herbs)
+        assert len(spy.call_args.args[1]) == 1
+
     # Tests for aging method
     def test_aging(self):
         """
@@ -199,12 +291,13 @@ class TestAnimals:
         birth_prob = min(1, self.herb.default_params['gamma']*self.herb.phi*(amount_same_species-1)),
         the procreation() method will return None
 
-        Using mocker to trick the function random.random to return 20, which we can see is above
-        the birth probability.
+        Using a mocked random number generator whose random method returns 20, which we can see
+        is above the birth probability.
         """
         amount_same_species = 10
-        mocker.patch("random.random", return_value=20)
-        assert self.herb.procreation(amount_same_species) is None
+        rng = mocker.Mock()
+        rng.random.return_value = 20
+        assert self.herb.procreation(amount_same_species, rng) is None
 
     def test_weight_higher_than_newborn(self):
         """
@@ -226,6 +319,108 @@ class TestAnimals:
         self.herb.weight = (self.herb.default_params["xi"] * newborn.weight) - 1
         assert self.herb.procreation(10) is None
 
+    # Tests for procreation_batch and give_birth methods
+    def test_procreation_batch_light_animals(self):
+        """
+        Testing that animals lighter than the demand never give birth.
+        """
+        demand = Herbivores.params.birth_demand
+        mothers, newborn_weights = Herbivores.procreation_batch([demand - 1] * 5, [1] * 5, 5)
+        assert len(mothers) == 0
+        assert len(newborn_weights) == 0
+
+    def test_procreation_batch_xi_rule(self, mocker):
+        """
+        Testing that only mothers heavier than xi times the newborn give birth.
+
+        Using a mocked random number generator whose random method returns 0, so every animal wants
+        to give birth, and whose normal method returns newborns that only the heavier mother can
+        carry.
+        """
+        demand = Herbivores.params.birth_demand
+        newborn_weight = (demand + 5) / Herbivores.params.xi
+        rng = mocker.Mock()
+        rng.random.return_value = np.zeros(2)
+        rng.normal.return_value = np.full(2, newborn_weight)
+        mothers, newborn_weights = Herbivores.procreation_batch([demand, demand + 10], [1, 1], 2,
+                                                                rng)
+        assert list(mothers) == [1]
+        assert list(newborn_weights) == [newborn_weight]
+
+    def test_procreation_batch_amount_per_animal(self, mocker):
+        """
+        Testing that the number of animals of the same species can be given for each animal,
+        and that an animal alone in its cell never gives birth.
+
+        Using a mocked random number generator whose random method returns 0, so every animal that
+        can give birth wants to.
+        """
+        demand = Herbivores.params.birth_demand
+        rng = mocker.Mock()
+        rng.random.side_effect = np.zeros
+        rng.normal.side_effect = lambda loc, scale, size: np.full(size, 1.0)
+        mothers, _ = Herbivores.procreation_batch([demand] * 3, [1] * 3, [1, 2, 2], rng)
+        assert list(mothers) == [1, 2]
+
+    def test_give_birth_mother_loses_weight(self, mocker):
+        """
+        Testing that the mothers lose xi times the weight of their newborn.
+
+        Using a mocked random number generator whose random method returns 0 and whose normal
+        method returns newborns of weight 8.
+        """
+        rng = mocker.Mock()
+        rng.random.return_value = np.zeros(3)
+        rng.normal.return_value = np.full(3, 8.0)
+        herbs = [Herbivores(5, 50) for _ in range(3)]
+        newborns = Herbivores.give_birth(herbs, rng)
+        assert [newborn.weight for newborn in newborns] == [8.0] * 3
+        assert [herb.weight for herb in herbs] == [50 - Herbivores.params.xi * 8.0] * 3
+
+    def test_procreation_no_newborn_without_birth(self, mocker):
+        """
+        Testing that no newborn is created when the mother is too light for the drawn birth weight.
+
+        Using a mocked random number generator whose random method returns 0, and whose normal
+        method returns a birth weight the mother cannot carry.
+        """
+        rng = mocker.Mock()
+        rng.random.return_value = 0
+        rng.normal.return_value = 50
+        spy = mocker.spy(Herbivores, 'newborns')
+        mother = Herbivores(5, 50)
+        assert mother.procreation(10, rng) is None
+        assert spy.call_count == 0
+        assert mother.weight == 50
+
+    def test_procreation_newborn(self, mocker):
+        """
+        Testing that the newborn gets the drawn birth weight, and that the mother loses xi times it.
+
+        Using a mocked random number generator whose random method returns 0, and whose normal
+        method returns a birth weight of 8.
+        """
+        rng = mocker.Mock()
+        rng.random.return_value = 0
+        rng.normal.return_value = 8.0
+        mother = Herbivores(5, 50)
+        newborn = mother.procreation(10, rng)
+        assert newborn.age == 0
+        assert newborn.weight == 8.0
+        assert mother.weight == 50 - Herbivores.params.xi * 8.0
+
+    def test_newborns(self):
+        """
+        Testing that the newborns from the fast constructor are the same as animals created
+        with the ordinary constructor.
+        """
+        newborns = Carnivores.newborns([6.0, 7.5])
+        for newborn, weight in zip(newborns, (6.0, 7.5)):
+            animal = Carnivores(0, weight)
+            assert type(newborn) is Carnivores
+            assert (newborn.age, newborn.weight) == (0, weight)
+            assert newborn.phi == animal.phi
+
     # Tests for death method
     def test_death_weight_zero(self):
         """
@@ -239,57 +434,62 @@ class TestAnimals:
         Testing that if the weight is higher than zero AND the drawn number is LOWER
         than the death probability, the death() method returns False.
 
-        Using mocker to trick the random.random function to return the value 0.
+        Using a mocked random number generator whose random method returns the value 0.
         """
-        mocker.patch('random.random', return_value=0)
+        rng = mocker.Mock()
+        rng.random.return_value = 0
         self.herb.weight = 1
-        assert self.herb.death() is True
+        assert self.herb.death(rng) is True
 
     def test_death_weight_not_zero_higher_than_prob(self, mocker):
         """
         Testing that if the weight is higher than zero AND the drawn number is HIGHER
         than the death probability, the death() method returns False.
 
-        Using mocker to trick the random.random function to return the value 1.
+        Using a mocked random number generator whose random method returns the value 1.
         """
-        mocker.patch('random.random', return_value=1)
+        rng = mocker.Mock()
+        rng.random.return_value = 1
         self.herb.weight = 20
-        assert self.herb.death() is False
+        assert self.herb.death(rng) is False
 
     def test_lower_prob_migrate(self, mocker):
         """
         Testing that if the drawn number is lower than the probability to migrate, that
         the method will return True.
 
-        Using mocker to trick the random.random function to return the value 0.
+        Using a mocked random number generator whose random method returns the value 0.
         """
-        mocker.patch('random.random', return_value=0)
+        rng = mocker.Mock()
+        rng.random.return_value = 0
         self.herb.phi = 1
-        assert self.herb.probability_migrate() is True
+        assert self.herb.probability_migrate(rng) is True
 
     def test_higher_prob_migrate(self, mocker):
         """
         Testing that if the drawn number is higher than the probability to migrate, that
         the method will return False.
 
-        Using mocker to trick the random.random function to return the value 1.
+        Using a mocked random number generator whose random method returns the value 1.
         """
-        mocker.patch('random.random', return_value=1)
+        rng = mocker.Mock()
+        rng.random.return_value = 1
         self.herb.phi = 0.1
-        assert self.herb.probability_migrate() is False
+        assert self.herb.probability_migrate(rng) is False
 
     def test_equal_prob_migrate(self, mocker):
         """
         Testing that if the drawn number is equal to the probability to migrate, that
         the method will return False.
 
-        Using mocker to trick the random.random function to return the value of probability
-        to migrate.
+        Using a mocked random number generator whose random method returns the value of
+        probability to migrate.
         """
         self.herb.phi = 1
         prob_migrate = self.herb.default_params['mu'] * self.herb.phi
-        mocker.patch('random.random', return_value=prob_migrate)
-        assert self.herb.probability_migrate() is False
+        rng = mocker.Mock()
+        rng.random.return_value = prob_migrate
+        assert self.herb.probability_migrate(rng) is False
 
 
 class TestHerbivores:
@@ -346,16 +546,101 @@ class TestCarnivores:
         Testing that if the drawn number is lower than the killing probability, the weight
         of the animal increases with the correct amount.
 
-        Using mocker to trick the random.random function to return the value of probability
-        to migrate.
+        Using a mocked random number generator whose random method returns 0.
         """
-
-        mocker.patch('random.random', return_value=0)
+        rng = mocker.Mock()
+        rng.random.return_value = 0
         ini_weight = self.carn.weight
         herblist =[Herbivores(age=1, weight=5)]
-        self.carn.carns_eating_herbs(herblist)
+        self.carn.carns_eating_herbs(herblist, rng)
         amount_eaten = herblist[0].weight
         assert self.carn.weight == ini_weight + self.carn.default_params['beta']*amount_eaten
 
+    def test_one_fitness_per_kill_decision(self, mocker):
+        """
+        Testing that a carnivore that eats several herbivores recalculates its fitness once
+        for each herbivore it tries to kill.
+
+        Using a mocked random number generator whose random method returns 0, so that every kill
+        succeeds.
+        """
+        rng = mocker.Mock()
+        rng.random.return_value = 0
+        herblist = [Herbivores(age=1, weight=5) for _ in range(3)]
+        spy = mocker.spy(Carnivores, 'fitness')
+        eaten = self.carn.carns_eating_herbs(herblist, rng)
+        assert len(eaten) == 3
+        assert spy.call_count == 3
+
+    # Tests for hunt_batch and hunting methods
+    def test_hunt_batch_stops_at_F(self, mocker):
+        """
+        Testing that the hunting kernel stops when the carnivore has eaten F, and that only
+        the eaten herbivores are marked as dead.
+
+        Using a mocked random number generator that draws only zeros, so that every kill succeeds.
+        """
+        rng = mocker.Mock()
+        rng.random.side_effect = np.zeros
+        herb_phis = np.zeros(4)
+        herb_weights = np.full(4, 30.)
+        alive = np.ones(4, dtype=bool)
+        weight, amount_killed = Carnivores.hunt_batch(5, 20, 1, herb_phis, herb_weights, alive, rng)
+        assert amount_killed == 2
+        assert list(alive) == [False, False, True, True]
+        assert weight == 20 + Carnivores.params.beta * Carnivores.params.F
+
+    def test_hunt_batch_skips_eaten_herbs(self, mocker):
+        """
+        Testing that a herbivore that is already eaten is not eaten again.
+
+        Using a mocked random number generator that draws only zeros, so that every kill succeeds.
+        """
+        rng = mocker.Mock()
+        rng.random.side_effect = np.zeros
+        alive = np.array([False, True, False])
+        weight, amount_killed = Carnivores.hunt_batch(5, 20, 1, np.zeros(3), np.full(3, 5.), alive,
+                                                      rng)
+        assert amount_killed == 1
+        assert not alive.any()
+        assert weight == 20 + Carnivores.params.beta * 5
+
+    def test_hunt_batch_stops_early_for_fitter_herbs(self, mocker):
+        """
+        Testing that no random numbers are drawn for herbivores that are at least as fit as the
+        carnivore.
+        """
+        rng = mocker.Mock()
+        rng.random.side_effect = np.zeros
+        carn_phi = Carnivores.fitness_value(5, 20)
+        herb_phis = np.array([0, 0.999, 0.999, 0.999])
+        alive = np.ones(4, dtype=bool)
+        weight, amount_killed = Carnivores.hunt_batch(5, 20, carn_phi, herb_phis, np.full(4, 1.),
+                                                      alive, rng)
+        assert rng.random.call_count == 1
+        assert rng.random.call_args[0][0] == 1
+        assert amount_killed == 1
+        assert list(alive) == [False, True, True, True]
+
+    def test_hunting_updates_carnivore(self, mocker):
+        """
+        Testing that a carnivore that kills with the hunting method gains weight and gets a new
+        fitness.
+
+        Using a mocked random number generator that draws only zeros, so that every kill succeeds.
+        """
+        rng = mocker.Mock()
+        rng.random.side_effect = np.zeros
+        herbs = sorted([Herbivores(age=1, weight=5) for _ in range(3)], key=lambda herb: herb.phi)
+        herb_phis = np.array([herb.phi for herb in herbs])
+        herb_weights = np.array([herb.weight for herb in herbs])
+        alive = np.ones(3, dtype=bool)
+        ini_weight = self.carn.weight
+        ini_phi = self.carn.phi
+        assert self.carn.hunting(herb_phis, herb_weights, alive, rng) == 3
+        assert self.carn.weight == \
+            pytest.approx(ini_weight + self.carn.params.beta * herb_weights.sum())
+        assert self.carn.phi > ini_phi
+
 
 pytest.main(['test_animals.py'])
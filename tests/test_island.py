@@ -4,6 +4,7 @@ __email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
 
 from biosim.landscapes import Lowland, Highland, Desert, Water
 from biosim.island import Island
+import numpy as np
 import pytest
 
 
@@ -62,34 +63,234 @@ class TestIsland:
 
     # Test for find_adjacent_cell_migrate
     @pytest.mark.parametrize('mocker_value, new_cell',
-                             [[(3, 4), (3, 4)],
-                              [(3, 2), (3, 2)],
-                              [(4, 3), (4, 3)],
-                              [(2, 3), (2, 3)]])
+                             [[0, (3, 4)],
+                              [1, (3, 2)],
+                              [2, (4, 3)],
+                              [3, (2, 3)]])
     def test_find_adjacent_cell(self, mocker, mocker_value, new_cell):
         """
         Testing that finding the neighbouring cell returns the correct cell.
+
+        Using a mocked random number generator to choose the index of the neighbouring cell.
+        """
+        self.standard_island.rng = mocker.Mock()
+        self.standard_island.rng.integers.side_effect = \
+            lambda high, size: np.full(size, mocker_value)
+        chosen_cells = self.standard_island.find_adjacent_cell_migrate((3, 3), 2)
+        assert list(chosen_cells[new_cell]) == [0, 1]
+        assert sum(len(positions) for positions in chosen_cells.values()) == 2
+
+    def test_neighbour_tables(self):
+        """
+        Testing that the neighbour table holds the neighbouring cells in the order of the
+        migration steps, and whether animals can move there.
         """
-        mocker.patch('random.choice', return_value=mocker_value)
-        chosen_cell = self.standard_island.find_adjacent_cell_migrate((3, 3))
-        assert chosen_cell == new_cell
+        flat = self.standard_island.flat_index((2, 3))
+        neighbours = self.standard_island.neighbours[flat]
+        assert [self.standard_island.flat_locs[neighbour] for neighbour in neighbours] == \
+            [(2, 4), (2, 2), (3, 3), (1, 3)]
+        assert list(self.standard_island.neighbour_habitable[flat]) == [False, False, True, False]
+
+    def test_find_adjacent_cell_water(self, mocker):
+        """
+        Testing that animals that draw a water cell are not given a cell to move to.
+
+        Using a mocked random number generator, so every animal draws the cell to the north, which
+        is water.
+        """
+        self.standard_island.rng = mocker.Mock()
+        self.standard_island.rng.integers.side_effect = lambda high, size: np.zeros(size, dtype=int)
+        assert self.standard_island.find_adjacent_cell_migrate((2, 3), 3) == {}
 
     # Test for migrating_animals
     def test_migrate_to_new_cell(self, mocker):
         """
         Testing that the animal migrates to a new cell.
 
-        Using mocker to trick the function random.random to return 0, for the migrating to happen.
-        Also using it on the function random.choice, for knowing which cell it chooses.
+        Using a mocked random number generator whose random method returns 0, for the migrating
+        to happen, and whose integers method returns 0, for knowing which cell it chooses.
         """
-        mocker.patch('random.random', return_value=0)
-        mocker.patch('random.choice', return_value=(3,4))
+        rng = mocker.Mock()
+        rng.random.side_effect = np.zeros
+        rng.integers.side_effect = lambda high, size: np.zeros(size, dtype=int)
+        self.standard_island = Island(ini_pop=self.standard_island.ini_pop,
+                                      island_map=self.standard_island.map_string, rng=rng)
         ini_pop = len(self.standard_island.map[(3, 3)].list_herbivores) + \
                   len(self.standard_island.map[(3, 3)].list_carnivores)
-        self.standard_island.migrating_animals((3, 3))
+        self.standard_island.migrating_animals()
         final_pop = len(self.standard_island.map[(3, 3)].list_herbivores) + \
                     len(self.standard_island.map[(3, 3)].list_carnivores)
         assert ini_pop > final_pop
+        assert (3, 4) in self.standard_island.active_cells
+
+    @pytest.mark.parametrize('storage', ['objects', 'arrays', 'cohorts'])
+    def test_migrate_once_per_year(self, mocker, storage):
+        """
+        Testing that the animals migrate at most once a year, and that an animal that draws
+        a water cell stays.
+
+        Using a mocked random number generator, so every animal wants to move east. The animals
+        in (2, 2) move to (3, 2), while the animals there move on to (4, 2), and the animals in
+        (4, 2) stay, since the cell east of them is water. For cohort storage, the binomial
+        method returns every animal with a positive probability, and the multinomial method
+        sends every animal east.
+        """
+        rng = mocker.Mock()
+        rng.random.side_effect = np.zeros
+        rng.integers.side_effect = lambda high, size: np.full(size, 2)
+        rng.binomial.side_effect = lambda n, p: np.where(np.asarray(p) > 0, n, 0)
+        rng.multinomial.side_effect = lambda n, pvals: np.outer(n, np.eye(len(pvals), dtype=int)[2])
+        island = Island(ini_pop=[{'loc': (loc_x, 2),
+                                  'pop': [{'species': 'Herbivore', 'age': 5, 'weight': 20}] * loc_x}
+                                 for loc_x in (2, 3, 4)],
+                        island_map="WWW\nWLW\nWLW\nWLW\nWWW", storage=storage, rng=rng)
+        island.migrating_animals()
+        assert [island.map[(loc_x, 2)].amount_herbs for loc_x in (2, 3, 4)] == [0, 2, 3 + 4]
+
+    # Tests for the fodder grid
+    def test_regrow_fodder(self):
+        """
+        Testing that regrowing gives every cell f_max of its landscape type, and that the cells
+        read their fodder from the grid.
+        """
+        island = Island(ini_pop=[], island_map="WWWWW\nWLHDW\nWWWWW")
+        island.regrow_fodder()
+        assert island.fodder.shape == (3, 5)
+        landscapes = (Water, Lowland, Highland, Desert, Water)
+        assert list(island.fodder[1]) == [landscape.params_fodder['f_max']
+                                          for landscape in landscapes]
+        assert island.map[(2, 3)].amount_fodder == Highland.params_fodder['f_max']
+
+    # Tests for the grid arrays
+    def test_grid_arrays(self):
+        """
+        Testing that the grid arrays follow the map, with the cell at location (x, y) in
+        element (x - 1, y - 1).
+        """
+        island = Island(ini_pop=[], island_map="WWWWW\nWLHDW\nWWWWW")
+        assert island.row_length == 5
+        assert island.col_length == 3
+        assert list(island.habitable[1]) == [False, True, True, True, False]
+        assert island.cells[island.grid_index((2, 3))] is island.map[(2, 3)]
+
+    def test_heatmap_population(self):
+        """
+        Testing that the heatmaps count the animals of each species in their cells.
+        """
+        herbs = [{'species': 'Herbivore', 'age': 5, 'weight': 20}] * 4
+        self.standard_island.adding_population([{'loc': (2, 3), 'pop': herbs}])
+        herb_array, carn_array = self.standard_island.heatmap_population()
+        assert herb_array.shape == carn_array.shape == (5, 5)
+        assert herb_array[2, 2] == 20
+        assert herb_array[1, 2] == 4
+        assert carn_array.sum() == 10
+        assert self.standard_island.animals_per_species() == \
+            ({'Herbivore': 24, 'Carnivore': 10}, 34)
+
+    @pytest.mark.parametrize('storage', ['objects', 'arrays', 'cohorts'])
+    def test_counts_follow_annual_cycle(self, storage):
+        """
+        Testing that the counts kept by the island are the same as counting the animals in
+        every cell, after some years with births, deaths, kills and migration.
+        """
+        island = Island(ini_pop=self.standard_island.ini_pop,
+                        island_map=self.standard_island.map_string,
+                        storage=storage, rng=np.random.default_rng(5))
+        for _ in range(5):
+            island.annual_cycle_simulation()
+
+        herb_array, carn_array = island.heatmap_population()
+        assert herb_array.tolist() == [[island.map[(row, col)].amount_herbs for col in range(1, 6)]
+                                       for row in range(1, 6)]
+        assert carn_array.tolist() == [[island.map[(row, col)].amount_carns for col in range(1, 6)]
+                                       for row in range(1, 6)]
+        assert island.animals_per_species()[0] == {'Herbivore': herb_array.sum(),
+                                                   'Carnivore': carn_array.sum()}
+
+    @pytest.mark.parametrize('storage', ['objects', 'arrays', 'cohorts'])
+    def test_snapshot(self, storage):
+        """
+        Testing that the snapshot has the same counts and traits as the queries for each of them,
+        and that it cannot be changed.
+        """
+        island = Island(ini_pop=self.standard_island.ini_pop,
+                        island_map=self.standard_island.map_string,
+                        storage=storage, rng=np.random.default_rng(6))
+        for _ in range(3):
+            island.annual_cycle_simulation()
+
+        snapshot = island.snapshot()
+        herb_amounts, carn_amounts = 1, 1
+        if storage == 'cohorts':
+            herb_amounts = snapshot.herb_amounts.astype(int)
+            carn_amounts = snapshot.carn_amounts.astype(int)
+        assert snapshot.amount_animals_species == island.animals_per_species()[0]
+        assert snapshot.herb_counts.tolist() == island.heatmap_population()[0].tolist()
+        assert list(np.repeat(snapshot.herb_phi, herb_amounts)) == \
+            pytest.approx(list(island.fitness_list()[0]))
+        assert list(np.repeat(snapshot.carn_age, carn_amounts)) == list(island.age_list()[1])
+        assert list(np.repeat(snapshot.herb_weight, herb_amounts)) == \
+            pytest.approx(list(island.weight_list()[0]))
+        with pytest.raises(ValueError):
+            snapshot.herb_age[0] = 0
+        with pytest.raises(ValueError):
+            snapshot.herb_counts[2, 2] = 0
+
+    def test_cohort_snapshot_amounts(self):
+        """
+        Testing that a snapshot of cohorts has one value per cohort, with the number of animals
+        in each cohort.
+        """
+        ini_pop = [{'loc': (2, 2), 'pop': [{'species': 'Herbivore', 'age': 5, 'weight': 20}] * 50}]
+        island = Island(ini_pop=ini_pop, island_map=self.standard_island.map_string,
+                        storage='cohorts', rng=np.random.default_rng(6))
+
+        snapshot = island.snapshot()
+        assert snapshot.herb_amounts.tolist() == [50]
+        assert snapshot.herb_age.tolist() == [5]
+        assert snapshot.carn_amounts.size == 0
+
+    def test_snapshot_without_traits(self):
+        """
+        Testing that a snapshot without traits only has the counts.
+        """
+        snapshot = self.standard_island.snapshot(traits=False)
+        assert snapshot.amount_animals_species == {'Herbivore': 20, 'Carnivore': 10}
+        assert snapshot.herb_phi is None
+
+    def test_cell_writes_fodder_grid(self):
+        """
+        Testing that fodder eaten in a cell is written to the fodder grid of the island.
+        """
+        self.standard_island.map[(3, 3)].amount_fodder = 42
+        assert self.standard_island.fodder[2, 2] == 42
+
+    # Tests for the active cells
+    def test_active_cells(self):
+        """
+        Testing that only the cell with the initial population is active.
+        """
+        assert self.standard_island.active_cells == {(3, 3)}
+
+    def test_annual_cycle_skips_empty_cells(self, mocker):
+        """
+        Testing that the annual cycle does not visit any cell when there are no animals.
+        """
+        empty_island = Island(ini_pop=[], island_map="WWWWW\nWWLWW\nWLLLW\nWWLWW\nWWWWW")
+        spy = mocker.spy(Lowland, 'feeding_herbs')
+        empty_island.annual_cycle_simulation()
+        assert spy.call_count == 0
+
+    def test_extinct_cell_inactive(self):
+        """
+        Testing that a cell where every animal dies is no longer active.
+
+        The herbivore weighs nothing and lives in the desert, so it cannot eat and dies.
+        """
+        ini_pop = [{'loc': (3, 3), 'pop': [{'species': 'Herbivore', 'age': 5, 'weight': 0}]}]
+        island = Island(ini_pop=ini_pop, island_map="WWWWW\nWWDWW\nWDDDW\nWWDWW\nWWWWW")
+        island.annual_cycle_simulation()
+        assert island.active_cells == set()
 
 
 pytest.main(['test_island.py'])
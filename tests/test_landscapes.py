@@ -3,6 +3,7 @@ __author__ = 'Andrine Zimmermann, Karin Mollatt'
 __email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
 
 import pytest
+import numpy as np
 from biosim.landscapes import Lowland, Highland, Desert, Water
 
 
@@ -79,17 +80,81 @@ class TestLandscapes:
         assert obj.amount_fodder == 50          # Every herb wants to eat 10. (10x10=100)
 
     # Test for feeding_carn_with_herbs
+    def test_only_fittest_herbs_eat(self, class_to_test):
+        """
+        Testing that when the fodder only feeds a few herbivores, the fittest ones eat, and
+        the others keep their weight.
+
+        :param class_to_test: Lowland, Highland, Desert and Water subclasses.
+        """
+        obj = class_to_test()
+        obj.animals_population([{'species': 'Herbivore', 'age': 5, 'weight': weight}
+                                for weight in (12, 30, 18, 25, 40, 8)])
+        obj.amount_fodder = 2.5 * obj.list_herbivores[0].params.F
+        obj.feeding_herbs()
+        assert obj.amount_fodder == 0
+        assert [herb.weight > ini_weight for herb, ini_weight in zip(obj.list_herbivores,
+                                                                     (12, 30, 18, 25, 40, 8))] == \
+               [False, True, False, True, True, False]
+
+    def test_feeding_orders_herbs_for_hunt(self, class_to_test):
+        """
+        Testing that with carnivores in the cell, the herbivores are left in ascending order
+        of fitness after feeding, ready for the hunt.
+
+        :param class_to_test: Lowland, Highland, Desert and Water subclasses.
+        """
+        obj = class_to_test()
+        obj.animals_population([{'species': 'Herbivore', 'age': 5, 'weight': weight}
+                                for weight in (12, 30, 18, 25, 40, 8)])
+        obj.animals_population([{'species': 'Carnivore', 'age': 5, 'weight': 20}])
+        obj.amount_fodder = 2.5 * obj.list_herbivores[0].params.F
+        obj.feeding_herbs()
+        phis = [herb.phi for herb in obj.list_herbivores]
+        assert phis == sorted(phis)
+        assert sorted(herb.weight for herb in obj.list_herbivores)[:3] == [8, 12, 18]
+
+    def test_feeding_ordered_ties(self, class_to_test):
+        """
+        Testing that herbivores with the same fitness are fed in their order in the cell, also
+        when the herbivores are ordered for the hunt.
+
+        :param class_to_test: Lowland, Highland, Desert and Water subclasses.
+        """
+        obj = class_to_test()
+        obj.animals_population([{'species': 'Herbivore', 'age': 5, 'weight': 20}] * 3)
+        obj.animals_population([{'species': 'Carnivore', 'age': 5, 'weight': 20}])
+        first_herb = obj.list_herbivores[0]
+        obj.amount_fodder = obj.list_herbivores[0].params.F
+        obj.feeding_herbs()
+        assert first_herb.weight > 20
+        assert sorted(herb.weight for herb in obj.list_herbivores)[:2] == [20, 20]
+
+    def test_no_fodder_no_ordering(self, class_to_test):
+        """
+        Testing that the herbivores are left as they are when there is no fodder.
+
+        :param class_to_test: Lowland, Highland, Desert and Water subclasses.
+        """
+        obj = class_to_test()
+        obj.animals_population([{'species': 'Herbivore', 'age': 5, 'weight': weight}
+                                for weight in (10, 30, 20)])
+        obj.amount_fodder = 0
+        obj.feeding_herbs()
+        assert [herb.weight for herb in obj.list_herbivores] == [10, 30, 20]
+
     def test_herbs_get_eaten(self, class_to_test, mocker):
         """
         Testing that the eaten herbivores are removed from the list of present herbivores.
 
-        Using mocker to trick the function random.random to return 0, to be lower than
+        Using a mocked random number generator that draws only zeros, to be lower than
         probability of killing.
 
         :param class_to_test: Lowland, Highland, Desert and Water subclasses.
         """
-        mocker.patch('random.random', return_value=0)
-        obj = class_to_test()
+        rng = mocker.Mock()
+        rng.random.side_effect = np.zeros
+        obj = class_to_test(rng=rng)
         herb_list = [{'species': 'Herbivore',
                            'age': 5,
                            'weight': 20}
@@ -123,10 +188,13 @@ class TestLandscapes:
         """
         Testing that the animal is removed from the rest of population if it dies.
 
+        Using a mocked random number generator whose random method returns 0.
+
         :param class_to_test: Lowland, Highland, Desert and Water subclasses
         """
-        mocker.patch('random.random', return_value=0)
-        obj = class_to_test()
+        rng = mocker.Mock()
+        rng.random.return_value = 0
+        obj = class_to_test(rng=rng)
         herb_list = [{'species': 'Herbivore',
                       'age': 5,
                       'weight': 20}
@@ -140,10 +208,13 @@ class TestLandscapes:
         """
         Testing that the animal is removed from the rest of population if it dies.
 
+        Using a mocked random number generator whose random method returns 0.
+
         :param class_to_test: Lowland, Highland, Desert and Water subclasses
         """
-        mocker.patch('random.random', return_value=0)
-        obj = class_to_test()
+        rng = mocker.Mock()
+        rng.random.return_value = 0
+        obj = class_to_test(rng=rng)
         carn_list = [{'species': 'Carnivore',
                       'age': 5,
                       'weight': 20}
@@ -153,75 +224,80 @@ class TestLandscapes:
             obj.animal_dies()
         assert len(obj.list_carnivores) < len(carn_list)
 
-    # Test for distribute_migrated_animals
-    def test_distribute_migrated_herbs(self, class_to_test):
+    # Test for animal_ages_and_dies
+    def test_ages_and_dies(self, class_to_test, mocker):
         """
-        Testing that the animals that migrates, is put to a list.
+        Testing that the fused end of the year ages the survivors and removes the animals
+        with weight zero.
+
+        Using a mocked random number generator whose random method returns 1, so that no other
+        animal dies.
 
         :param class_to_test: Lowland, Highland, Desert and Water subclasses
         """
-        obj = class_to_test()
-        ini_migrated_herbs, _ = obj.distribute_migrated_animals()
+        rng = mocker.Mock()
+        rng.random.return_value = 1
+        obj = class_to_test(rng=rng)
         herb_list = [{'species': 'Herbivore',
                       'age': 5,
-                      'weight': 20}
-                     for _ in range(20)]
+                      'weight': weight}
+                     for weight in (0, 20, 30)]
         obj.animals_population(herb_list)
-        final_migrated_herbs, _ = obj.distribute_migrated_animals()
-        assert len(ini_migrated_herbs) < len(final_migrated_herbs)
+        obj.animal_ages_and_dies()
+        assert [herb.age for herb in obj.list_herbivores] == [6, 6]
+        assert [herb.weight for herb in obj.list_herbivores] == \
+               [weight * (1 - obj.list_herbivores[0].default_params['eta']) for weight in (20, 30)]
 
-    def test_distribute_migrated_carns(self, class_to_test):
+    # Test for remove_animals
+    def test_remove_animals_keeps_order(self, class_to_test):
         """
-        Testing that the animals that migrates, is put to a list.
+        Testing that removing animals with a mask keeps the remaining animals in the same order.
 
         :param class_to_test: Lowland, Highland, Desert and Water subclasses
         """
         obj = class_to_test()
-        _, ini_migrated_carns = obj.distribute_migrated_animals()
-        carn_list = [{'species': 'Carnivore',
-                      'age': 5,
-                      'weight': 20}
-                     for _ in range(20)]
-        obj.animals_population(carn_list)
-        _, final_migrated_carns = obj.distribute_migrated_animals()
-        assert len(ini_migrated_carns) < len(final_migrated_carns)
+        obj.animals_population([{'species': 'Herbivore', 'age': age, 'weight': 20}
+                                for age in range(5)])
+        obj.animals_population([{'species': 'Carnivore', 'age': 5, 'weight': 20}])
+        herb_list = obj.list_herbivores
+        obj.remove_animals(herbs_keep=[True, False, True, False, True])
+        assert [herb.age for herb in obj.list_herbivores] == [0, 2, 4]
+        assert obj.list_herbivores is herb_list
+        assert len(obj.list_carnivores) == 1
 
-    # Test for annual_restart_migration
-    def test_herb_has_migrated_is_false(self, class_to_test):
+    # Test for distribute_migrated_animals
+    def test_distribute_migrated_herbs(self, class_to_test):
         """
-        Testing that the animal's migration 'flag' is changed to False, if it
-        has migrated.
+        Testing that the animals that migrates, is put to a list.
 
         :param class_to_test: Lowland, Highland, Desert and Water subclasses
         """
         obj = class_to_test()
+        ini_migrated_herbs, _ = obj.distribute_migrated_animals()
         herb_list = [{'species': 'Herbivore',
                       'age': 5,
                       'weight': 20}
-                     for _ in range(10)]
+                     for _ in range(20)]
         obj.animals_population(herb_list)
-        migrated_herbs, _ = obj.distribute_migrated_animals()
-        obj.annual_restart_migration()
-        for herb in migrated_herbs:
-            assert herb.has_migrated is False
+        final_migrated_herbs, _ = obj.distribute_migrated_animals()
+        assert len(ini_migrated_herbs) < len(final_migrated_herbs)
 
-    def test_carn_has_migrated_is_false(self, class_to_test):
+    def test_distribute_migrated_carns(self, class_to_test):
         """
-        Testing that the animal's migration 'flag' is changed to False, if it
-        has migrated.
+        Testing that the animals that migrates, is put to a list.
 
         :param class_to_test: Lowland, Highland, Desert and Water subclasses
         """
         obj = class_to_test()
+        _, ini_migrated_carns = obj.distribute_migrated_animals()
         carn_list = [{'species': 'Carnivore',
                       'age': 5,
                       'weight': 20}
-                     for _ in range(10)]
+                     for _ in range(20)]
         obj.animals_population(carn_list)
-        _, migrated_carns = obj.distribute_migrated_animals()
-        obj.annual_restart_migration()
-        for carn in migrated_carns:
-            assert carn.has_migrated is False
+        _, final_migrated_carns = obj.distribute_migrated_animals()
+        assert len(ini_migrated_carns) < len(final_migrated_carns)
+
 
 class TestLowland:
 
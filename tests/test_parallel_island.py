@@ -0,0 +1,319 @@
+__author__ = 'Andrine Zimmermann, Karin Mollatt'
+__email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
+
+"""
+Testing the functions in parallel_island.py
+"""
+
+from biosim.island import Island
+from biosim.landscapes import Lowland
+from biosim.parallel_island import ParallelIsland, SharedArrays, StripIsland
+from multiprocessing import shared_memory
+from conftest import herbs_pop, carns_pop
+import numpy as np
+import pytest
+
+
+class TestParallelIsland:
+
+    @pytest.fixture(autouse=True)
+    def standard_island(self):
+        """
+        Fixture setting standard island, simulated by two workers.
+        """
+        self.island_map = "WWWWW\nWLLLW\nWLHLW\nWLLLW\nWLDLW\nWWWWW"
+        self.standard_island = ParallelIsland(self.island_map,
+                                              [herbs_pop((2, 2), 20), carns_pop((5, 3), 10)],
+                                              rng=np.random.default_rng(1), workers=2)
+        yield
+        self.standard_island.close()
+
+    # Tests for creating_grid and creating_strips
+    @pytest.mark.parametrize('island_map', ["WWW\nWRW\nWWW", "WWW\nWLLW\nWWW", "WWW\nWLL\nWWW"])
+    def test_invalid_map(self, island_map):
+        """
+        Testing that we get a ValueError for invalid landscape types, lines of different length
+        and islands that are not surrounded by water, before any worker is started.
+        """
+        with pytest.raises(ValueError):
+            ParallelIsland(island_map, [], workers=2)
+
+    def test_strips_cover_rows(self):
+        """
+        Testing that the strips follow each other and cover every row once.
+        """
+        with ParallelIsland(self.island_map, [], workers=3) as island:
+            rows = [row for first, last in island.strips for row in range(first, last + 1)]
+            assert rows == list(range(1, island.col_length + 1))
+            assert len(island.strips) == 3
+
+    def test_no_more_strips_than_rows(self):
+        """
+        Testing that an island gets at most one strip per row with habitable cells.
+        """
+        with ParallelIsland("WWW\nWLW\nWWW", [herbs_pop((2, 2), 3)], workers=4) as island:
+            assert len(island.strips) == 1
+            assert island.animals_per_species()[1] == 3
+
+    # Tests for adding_population and the queries
+    def test_key_error_invalid_location(self):
+        """
+        Testing that we get a KeyError if the location is outside the map.
+        """
+        with pytest.raises(KeyError):
+            self.standard_island.adding_population([herbs_pop((0, 0), 5)])
+
+    def test_error_in_worker(self):
+        """
+        Testing that an error raised in a worker is raised by the island.
+        """
+        with pytest.raises(TypeError):
+            self.standard_island.adding_population([{'loc': (4, 2),
+                                                     'pop': [{'species': 'Fox', 'age': 5,
+                                                              'weight': 20}]}])
+
+    def test_heatmap_population(self):
+        """
+        Testing that the heatmaps count the animals of every strip in their cells.
+        """
+        herb_array, carn_array = self.standard_island.heatmap_population()
+        assert herb_array[1, 1] == 20
+        assert carn_array[4, 2] == 10
+        assert self.standard_island.animals_per_species() == \
+            ({'Herbivore': 20, 'Carnivore': 10}, 30)
+
+    def test_snapshot(self):
+        """
+        Testing that the snapshot joins the traits of every strip.
+        """
+        snapshot = self.standard_island.snapshot()
+        assert snapshot.amount_animals_species == {'Herbivore': 20, 'Carnivore': 10}
+        assert list(snapshot.herb_age) == [5] * 20
+        assert list(snapshot.carn_weight) == [20] * 10
+        with pytest.raises(ValueError):
+            snapshot.herb_phi[0] = 0
+
+    def test_snapshot_animals_in_water(self):
+        """
+        Testing that the snapshot has the traits of animals placed in a cell that is not habitable,
+        like the snapshot of :class:`biosim.island.Island`, while the totals leave them out.
+        """
+        self.standard_island.adding_population([herbs_pop((1, 1), 3, age=2)])
+        snapshot = self.standard_island.snapshot()
+        assert sorted(snapshot.herb_age) == [2] * 3 + [5] * 20
+        assert snapshot.total_herbs == 20
+
+    def test_cohort_snapshot_amounts(self):
+        """
+        Testing that a snapshot of cohorts has one value per cohort from every strip, with the
+        number of animals in each cohort.
+        """
+        with ParallelIsland(self.island_map, [herbs_pop((2, 2), 20), herbs_pop((5, 3), 10, age=3)],
+                            rng=np.random.default_rng(1), workers=2, storage='cohorts') as island:
+            snapshot = island.snapshot()
+            assert snapshot.herb_amounts.tolist() == [20, 10]
+            assert snapshot.herb_age.tolist() == [5, 3]
+            assert len(island.age_list()[0]) == 30
+
+    def test_snapshot_shares_memory(self):
+        """
+        Testing that the snapshot reads the counts and traits from the shared blocks without
+        copying.
+        """
+        snapshot = self.standard_island.snapshot()
+        assert np.shares_memory(snapshot.herb_counts, self.standard_island.herb_counts)
+        assert np.shares_memory(snapshot.carn_age,
+                                self.standard_island.shared.arrays['carn_traits'])
+
+    def test_trait_blocks_grow(self):
+        """
+        Testing that the shared trait arrays are replaced by larger ones when the animals do not
+        fit.
+        """
+        self.standard_island.snapshot()
+        old_name = self.standard_island.shared.spec('herb_traits')[0]
+        self.standard_island.adding_population([herbs_pop((4, 4), 100, age=3)])
+        snapshot = self.standard_island.snapshot()
+        assert self.standard_island.shared.spec('herb_traits')[0] != old_name
+        assert sorted(snapshot.herb_age) == [3] * 100 + [5] * 20
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=old_name)
+
+    def test_close_unlinks_blocks(self):
+        """
+        Testing that closing the island unlinks its shared blocks, also when leaving a with block
+        because of an exception.
+        """
+        with pytest.raises(RuntimeError):
+            with ParallelIsland(self.island_map, [herbs_pop((2, 2), 5)], workers=2) as island:
+                island.snapshot()
+                names = [island.shared.spec(key)[0] for key in island.shared.arrays]
+                raise RuntimeError
+        assert len(names) == 5
+        for name in names:
+            with pytest.raises(FileNotFoundError):
+                shared_memory.SharedMemory(name=name)
+        assert not any(process.is_alive() for process in island._processes)
+
+    # Tests for the annual cycle
+    def test_shared_fodder(self):
+        """
+        Testing that the strips write the fodder left after feeding into the shared fodder grid.
+        """
+        self.standard_island.annual_cycle_simulation()
+        assert self.standard_island.fodder[1, 3] == Lowland.params_fodder['f_max']
+        assert self.standard_island.fodder[1, 1] < self.standard_island.fodder[1, 3]
+
+    def test_counts_follow_annual_cycle(self):
+        """
+        Testing that the counts of the island agree with the traits of the workers after some years.
+        """
+        for _ in range(5):
+            self.standard_island.annual_cycle_simulation()
+        snapshot = self.standard_island.snapshot()
+        herb_array, carn_array = self.standard_island.heatmap_population()
+        assert herb_array.sum() == len(snapshot.herb_age) == snapshot.total_herbs
+        assert carn_array.sum() == len(snapshot.carn_age) == snapshot.total_carns
+
+    def test_migrants_cross_strips(self):
+        """
+        Testing that herbivores at the border of the first strip migrate into the second one.
+        """
+        with ParallelIsland("WWW\nWLW\nWLW\nWLW\nWLW\nWWW", [herbs_pop((3, 2), 50)],
+                            rng=np.random.default_rng(2), workers=2) as island:
+            assert island.strips[0][1] == 3
+            for _ in range(2):
+                island.annual_cycle_simulation()
+            herb_array, _ = island.heatmap_population()
+            assert herb_array[3:].sum() > 0
+            assert herb_array.sum() == island.total_herbs
+
+    def test_same_as_serial_island(self):
+        """
+        Testing that the parallel island gives about the same number of herbivores as the serial
+        island, averaged over some seeds.
+        """
+        island_map = "WWWWWW\nWLLLHW\nWLHLDW\nWLDLLW\nWWWWWW"
+        parallel, serial = [], []
+        for seed in range(4):
+            reference = Island(island_map, [herbs_pop((3, 3), 100)], storage='arrays',
+                               rng=np.random.default_rng(seed))
+            with ParallelIsland(island_map, [herbs_pop((3, 3), 100)],
+                                rng=np.random.default_rng(seed), workers=3) as island:
+                for _ in range(20):
+                    island.annual_cycle_simulation()
+                    reference.annual_cycle_simulation()
+                parallel.append(island.total_herbs)
+            serial.append(reference.total_herbs)
+        assert np.mean(parallel) == pytest.approx(np.mean(serial), rel=0.1)
+
+
+class TestStripIsland:
+
+    @pytest.fixture(autouse=True)
+    def strip(self):
+        """
+        Fixture setting a strip owning the rows 2 and 3 of an island, with the rows 1 and 4 as halo.
+        """
+        self.strip = StripIsland("WLLW\nWLLW\nWLLW\nWLLW", (2, 3), 0, storage='arrays',
+                                 rng=np.random.default_rng(1))
+
+    def test_halo_locs(self):
+        """
+        Testing that the halo is the first and last row of the strip.
+        """
+        assert sorted(self.strip.halo_locs) == \
+            [(1, y) for y in range(1, 5)] + [(4, y) for y in range(1, 5)]
+
+    @pytest.mark.parametrize('storage', ['objects', 'arrays', 'cohorts'])
+    def test_taking_halo_animals(self, mocker, storage):
+        """
+        Testing that the animals that migrate into the halo are taken out, with their locations on
+        the island.
+
+        Using a mocked random number generator, so every animal wants to move south, into the next
+        strip.
+        """
+        rng = mocker.Mock()
+        rng.random.side_effect = np.zeros
+        rng.integers.side_effect = lambda high, size: np.full(size, 2)
+        rng.binomial.side_effect = lambda n, p: np.where(np.asarray(p) > 0, n, 0)
+        rng.multinomial.side_effect = lambda n, pvals: np.outer(n, np.eye(len(pvals), dtype=int)[2])
+        strip = StripIsland("WLLW\nWLLW\nWLLW\nWLLW", (2, 3), 0, storage=storage, rng=rng)
+        strip.adding_population([herbs_pop((3, 2), 5)])
+        strip.migrating_animals()
+        leaving = strip.taking_halo_animals()
+        assert [loc for loc, _, _ in leaving] == [(4, 2)]
+        assert strip.total_herbs == 0
+        assert (4, 2) not in strip.active_cells
+
+    def test_arriving_animals(self):
+        """
+        Testing that animals arriving from another strip are added to their cell, and age with the
+        strip.
+        """
+        self.strip.adding_population([herbs_pop((1, 2), 5)])
+        herbs, _ = self.strip.map[(1, 2)].emigrate([np.arange(5)], [])
+        self.strip.year_after_exchange([((2, 2), herbs[0], None)])
+        assert self.strip.total_herbs == self.strip.herb_counts[1, 1]
+        assert self.strip.total_carns == 0
+        assert set(self.strip.map[(2, 2)].herbivores.age) <= {6}
+
+    def test_shared_grids(self):
+        """
+        Testing that a strip with shared grids counts and regrows its owned rows in the shared
+        grids, and leaves the rows of the halo to the neighbouring strips.
+        """
+        owner = SharedArrays(owner=True)
+        for key, dtype in (('fodder', np.float64), ('herb_counts', np.int64),
+                           ('carn_counts', np.int64)):
+            owner.create(key, (6, 4), dtype)
+        strip = StripIsland("WLLW\nWLLW\nWLLW\nWLLW", (3, 4), 1, storage='arrays',
+                            rng=np.random.default_rng(1),
+                            grid_specs={key: owner.spec(key) for key in owner.arrays})
+        strip.adding_population([herbs_pop((3, 2), 5), herbs_pop((2, 2), 4)])
+        strip.regrow_fodder()
+        assert owner.arrays['herb_counts'][2, 1] == 5
+        assert owner.arrays['herb_counts'][1, 1] == 0
+        assert list(owner.arrays['fodder'][:, 1]) == \
+            [0, 0] + [Lowland.params_fodder['f_max']] * 2 + [0, 0]
+        strip.map[(2, 2)].feeding_herbs()
+        assert owner.arrays['fodder'][2, 1] < Lowland.params_fodder['f_max']
+        owner.close()
+
+
+class TestSharedArrays:
+
+    def test_attach_sees_owner_array(self):
+        """
+        Testing that an attached array uses the same memory as the array of the owner.
+        """
+        owner = SharedArrays(owner=True)
+        array = owner.create('grid', (2, 3), np.int64)
+        attached = SharedArrays().attach('grid', *owner.spec('grid'))
+        array[1, 2] = 7
+        assert attached[1, 2] == 7
+        assert attached.shape == (2, 3)
+        owner.close()
+
+    def test_only_owner_creates(self):
+        """
+        Testing that we get a PermissionError when creating an array without owning the blocks.
+        """
+        with pytest.raises(PermissionError):
+            SharedArrays().create('grid', (2, 3))
+
+    def test_close_with_arrays_in_use(self):
+        """
+        Testing that closing the owner unlinks a block, while an array still using its memory can
+        be read.
+        """
+        owner = SharedArrays(owner=True)
+        view = owner.create('grid', (4,))[1:]
+        name = owner.spec('grid')[0]
+        owner.close()
+        view[0] = 1
+        assert list(view) == [1, 0, 0]
+        assert not owner.arrays
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
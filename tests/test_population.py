@@ -0,0 +1,392 @@
+
+__author__ = 'Andrine Zimmermann, Karin Mollatt'
+__email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
+
+"""
+Testing the functions in population.py
+"""
+
+from biosim.animals import Herbivores, Carnivores
+from biosim.landscapes import Lowland
+from biosim.population import Population, IslandPopulation, CohortPopulation
+import numpy as np
+import pytest
+
+
+class TestPopulation:
+
+    @pytest.fixture(autouse=True)
+    def standard_populations(self):
+        """
+        Fixture setting standard herbivore and carnivore populations.
+        """
+        self.herbs = Population(Herbivores)
+        self.herbs.add_animals([5] * 10, [20] * 10)
+        self.carns = Population(Carnivores)
+        self.carns.add_animals([5] * 10, [20] * 10)
+
+    def test_add_animals_grows_capacity(self):
+        """
+        Testing that adding more animals than the initial capacity keeps all animals.
+        """
+        self.herbs.add_animals(range(100), [10] * 100)
+        assert len(self.herbs) == 110
+        assert list(self.herbs.age[10:]) == list(range(100))
+
+    def test_fitness_same_as_objects(self):
+        """
+        Testing that the fitness in the arrays is the same as for animal objects.
+        """
+        assert self.herbs.phi[0] == pytest.approx(Herbivores(5, 20).phi)
+        assert self.carns.phi[0] == pytest.approx(Carnivores(5, 20).phi)
+
+    def test_remove_animals_compacts(self):
+        """
+        Testing that removed animals are gone and the survivors keep their order.
+        """
+        self.herbs.add_animals([1, 2, 3], [30, 40, 50])
+        keep = np.ones(len(self.herbs), dtype=bool)
+        keep[:10] = False
+        keep[11] = False
+        self.herbs.remove_animals(keep)
+        assert list(self.herbs.weight) == [30, 50]
+
+    def test_eats_fodder_same_as_objects(self):
+        """
+        Testing that feeding removes the same amount of fodder and gives the same weights
+        as feeding with animal objects.
+        """
+        obj_cell = Lowland()
+        arr_cell = Lowland(storage='arrays')
+        ini_pop = [{'species': 'Herbivore', 'age': age, 'weight': 10 + age} for age in range(10)]
+        obj_cell.animals_population(ini_pop)
+        arr_cell.animals_population(ini_pop)
+        obj_cell.amount_fodder = arr_cell.amount_fodder = 55
+        obj_cell.feeding_herbs()
+        arr_cell.feeding_herbs()
+
+        assert arr_cell.amount_fodder == obj_cell.amount_fodder
+        assert sorted(arr_cell.herbivores.weight) == pytest.approx(
+            sorted(herb.weight for herb in obj_cell.list_herbivores))
+
+    def test_fittest_same_as_sort(self):
+        """
+        Testing that the fittest animals are the same, in the same order, as the first animals
+        of a stable sort, also when several animals have the same fitness.
+        """
+        self.herbs.add_animals([5] * 30, np.arange(30) % 7 + 10)
+        full_order = np.argsort(-self.herbs.phi, kind='stable')
+        for amount in (1, 3, 11, 25, 40, 60):
+            assert list(self.herbs.fittest(amount)) == list(full_order[:amount])
+
+    def test_order_by_fitness(self):
+        """
+        Testing that ordering stores the animals in ascending order of fitness, that removing
+        animals keeps the order and that adding animals ends it.
+        """
+        self.herbs.add_animals([5] * 5, [40, 8, 30, 12, 25])
+        self.herbs.order_by_fitness()
+        assert self.herbs.ordered
+        assert np.all(np.diff(self.herbs.phi) >= 0)
+        self.herbs.remove_animals(np.arange(len(self.herbs)) % 2 == 0)
+        assert self.herbs.ordered
+        assert np.all(np.diff(self.herbs.phi) >= 0)
+        self.herbs.add_animals([1], [10])
+        assert not self.herbs.ordered
+
+    def test_eats_fodder_keeps_order(self):
+        """
+        Testing that feeding an ordered population feeds the fittest herbivores, and leaves
+        the population in ascending order of fitness.
+        """
+        self.herbs.add_animals([5, 30, 2, 10], [40, 8, 30, 12])
+        self.herbs.order_by_fitness()
+        fittest_ages = set(self.herbs.age[-3:])
+        self.herbs.eats_fodder(2.5 * Herbivores.params.F)
+        assert self.herbs.ordered
+        assert np.all(np.diff(self.herbs.phi) >= 0)
+        assert set(self.herbs.age[-3:]) == fittest_ages
+
+    def test_order_by_fitness_ties(self):
+        """
+        Testing that reading an ordered population from the end gives the animals in the same
+        order as :meth:`biosim.population.Population.fittest`, also for equal fitness.
+        """
+        herbs = Population(Herbivores)
+        herbs.add_animals([1, 2, 3, 4], [20] * 4)
+        herbs.phi[:] = [0.5, 0.5, 0.7, 0.5]
+        fittest_ages = list(herbs.age[herbs.fittest(4)])
+        herbs.order_by_fitness()
+        assert list(herbs.age[::-1]) == fittest_ages == [3, 1, 2, 4]
+
+    def test_cell_remove_animals(self):
+        """
+        Testing that removing animals from a cell with array storage keeps the order of the rest.
+        """
+        arr_cell = Lowland('arrays')
+        arr_cell.animals_population([{'species': 'Herbivore', 'age': age, 'weight': 20}
+                                     for age in range(5)])
+        arr_cell.remove_animals(herbs_keep=[True, False, True, False, True])
+        assert list(arr_cell.herbivores.age) == [0, 2, 4]
+        assert len(arr_cell.carnivores) == 0
+
+    def test_hunts_removes_eaten_herbs(self, mocker):
+        """
+        Testing that eaten herbivores are removed, and that the carnivores gain weight.
+
+        Using a mocked random number generator that draws only zeros, so every attempt succeeds.
+        Every carnivore eats F=50, so the ten herbivores of weight 20 feed four carnivores.
+        """
+        self.carns.rng = mocker.Mock()
+        self.carns.rng.random.side_effect = np.zeros
+        self.carns.rng.permutation.side_effect = np.arange
+        ini_weight = self.carns.weight.sum()
+        self.carns.hunts(self.herbs)
+        assert len(self.herbs) == 0
+        assert self.carns.weight.sum() == ini_weight + Carnivores.default_params['beta'] * 170
+
+    def test_gives_birth(self):
+        """
+        Testing that heavy animals give birth, and that the mothers lose weight.
+        """
+        self.herbs.weight[:] = 50
+        self.herbs.gives_birth()
+        assert len(self.herbs) > 10
+        assert np.all(self.herbs.age[10:] == 0)
+        assert self.herbs.weight[:10].sum() < 500
+
+    def test_no_birth_for_single_animal(self):
+        """
+        Testing that a single animal cannot give birth.
+        """
+        single = Population(Herbivores)
+        single.add_animals([5], [50])
+        single.gives_birth()
+        assert len(single) == 1
+
+    def test_gets_older(self):
+        """
+        Testing that the animals age and lose weight every year.
+        """
+        self.herbs.gets_older()
+        assert np.all(self.herbs.age == 6)
+        assert self.herbs.weight == pytest.approx(20 - Herbivores.default_params['eta'] * 20)
+        assert self.herbs.phi[0] == pytest.approx(Herbivores(6, self.herbs.weight[0]).phi)
+
+    def test_dies(self, mocker):
+        """
+        Testing that animals with weight zero always die.
+
+        Using a mocked random number generator whose random method returns 1, so no other animal
+        dies.
+        """
+        self.herbs.rng = mocker.Mock()
+        self.herbs.rng.random.return_value = 1
+        self.herbs.weight[:5] = 0
+        self.herbs.update_fitness()
+        self.herbs.dies()
+        assert len(self.herbs) == 5
+
+    def test_ages_and_dies(self, mocker):
+        """
+        Testing that the fused end of the year gives the same ages and weights as aging,
+        and removes the animals with weight zero.
+
+        Using a mocked random number generator whose random method returns 1, so no other animal
+        dies.
+        """
+        self.herbs.rng = mocker.Mock()
+        self.herbs.rng.random.return_value = 1
+        self.herbs.weight[:3] = 0
+        self.herbs.ages_and_dies()
+        assert len(self.herbs) == 7
+        assert np.all(self.herbs.age == 6)
+        assert self.herbs.weight == pytest.approx(20 - Herbivores.default_params['eta'] * 20)
+
+    def test_wants_to_migrate(self, mocker):
+        """
+        Testing that only animals with positive fitness want to migrate.
+
+        Using a mocked random number generator whose random method returns 0, so every animal that
+        can move wants to.
+        """
+        self.herbs.rng = mocker.Mock()
+        self.herbs.rng.random.side_effect = np.zeros
+        self.herbs.weight[:4] = 0
+        self.herbs.update_fitness()
+        assert list(self.herbs.wants_to_migrate()) == list(range(4, 10))
+
+
+def test_invalid_storage():
+    """
+    Testing that we get a ValueError for an unknown storage type.
+    """
+    with pytest.raises(ValueError):
+        Lowland(storage='lists')
+
+
+class TestIslandPopulation:
+
+    @pytest.fixture(autouse=True)
+    def standard_population(self):
+        """
+        Fixture setting a standard herbivore population spread over three cells.
+        """
+        self.herbs = IslandPopulation(Herbivores)
+        self.herbs.add_animals([0, 2, 2, 5] * 5, [5] * 20, np.arange(20, 40))
+
+    def test_cells_follow_removal(self):
+        """
+        Testing that the cell of each animal stays with the animal when animals are removed.
+        """
+        keep = self.herbs.weight >= 30
+        self.herbs.remove_animals(keep)
+        assert list(self.herbs.cell) == [2, 5, 0, 2, 2, 5, 0, 2, 2, 5]
+        assert list(self.herbs.weight) == list(range(30, 40))
+
+    def test_counts(self):
+        """
+        Testing that the animals are counted in each cell.
+        """
+        assert list(self.herbs.counts(7)) == [5, 0, 10, 0, 0, 5, 0]
+
+
+class TestCohortPopulation:
+
+    @pytest.fixture(autouse=True)
+    def standard_populations(self):
+        """
+        Fixture setting standard herbivore and carnivore cohort populations.
+        """
+        self.herbs = CohortPopulation(Herbivores, np.random.default_rng(1))
+        self.herbs.add_animals([5] * 10, [20] * 10)
+        self.carns = CohortPopulation(Carnivores, np.random.default_rng(2))
+        self.carns.add_animals([5] * 2, [40] * 2)
+
+    def test_add_animals_merges(self):
+        """
+        Testing that animals with the same age and weight are kept in one cohort.
+        """
+        self.herbs.add_animals([5, 6], [20, 20])
+        assert len(self.herbs) == 12
+        assert self.herbs.size == 2
+        assert sorted(self.herbs.count) == [1, 11]
+        assert list(np.repeat(self.herbs.trait_values('age'), self.herbs.count)) == \
+            sorted([5] * 11 + [6])
+
+    def test_quantised_weights_keep_mean(self):
+        """
+        Testing that the weights are rounded to multiples of the weight quantum, and that the
+        mean weight is kept.
+        """
+        herbs = CohortPopulation(Herbivores, np.random.default_rng(3))
+        herbs.add_animals([5] * 1000, [20.1] * 1000)
+        assert set(herbs.weight) == {20, 20 + herbs.weight_quantum}
+        assert np.average(herbs.trait_values('weight'), weights=herbs.count) == \
+            pytest.approx(20.1, abs=0.01)
+
+    def test_eats_fodder_same_as_population(self):
+        """
+        Testing that feeding removes the same amount of fodder, and gives about the same weights,
+        as feeding the same herbivores stored one by one.
+        """
+        arr_herbs = Population(Herbivores)
+        arr_herbs.add_animals([5] * 10, [20] * 10)
+        amount_fodder = 5.5 * Herbivores.params.F
+        assert self.herbs.eats_fodder(amount_fodder) == \
+            pytest.approx(arr_herbs.eats_fodder(amount_fodder))
+        assert len(self.herbs) == 10
+        weights = np.repeat(self.herbs.trait_values('weight'), self.herbs.count)
+        assert np.sort(weights) == pytest.approx(np.sort(arr_herbs.weight),
+                                                 abs=self.herbs.weight_quantum)
+
+    def test_hunts(self, mocker):
+        """
+        Testing that the carnivores eat what they kill, and fill up one at a time.
+
+        Using a mocked random number generator that lets the carnivores hunt in order, and whose
+        binomial method returns every animal with a positive probability, so every herbivore that
+        is less fit than the carnivores is killed until they have eaten F each.
+        """
+        rng = mocker.Mock()
+        rng.permutation.side_effect = np.arange
+        rng.binomial.side_effect = lambda n, p: np.where(np.asarray(p) > 0, n, 0)
+        self.carns.rng = rng
+        herbs = CohortPopulation(Herbivores)
+        herbs.add_animals([5] * 30, [2] * 30)
+        params = Carnivores.params
+        amount_eaten = min(30 * 2, 2 * params.F)
+
+        self.carns.hunts(herbs)
+        assert len(herbs) == 30 - int(np.ceil(amount_eaten / 2))
+        carn_weight = np.sum(self.carns.trait_values('weight') * self.carns.count)
+        assert carn_weight == pytest.approx(80 + params.beta * amount_eaten,
+                                            abs=2 * self.carns.weight_quantum)
+
+    def test_hunts_weightless_herbs(self, mocker):
+        """
+        Testing that herbivores with weight zero, or rounded down to zero, can be killed, but give
+        the carnivores no food.
+
+        Using a mocked random number generator as in :meth:`test_hunts`.
+        """
+        rng = mocker.Mock()
+        rng.permutation.side_effect = np.arange
+        rng.binomial.side_effect = lambda n, p: np.where(np.asarray(p) > 0, n, 0)
+        self.carns.rng = rng
+        herbs = CohortPopulation(Herbivores)
+        herbs.add_animals([5] * 6, [0] * 3 + [0.05] * 3)
+
+        self.carns.hunts(herbs)
+        assert len(herbs) == 0
+        assert len(self.carns) == 2
+        assert list(self.carns.weight) == [40]
+
+    def test_gives_birth(self):
+        """
+        Testing that the newborns get age zero and a positive weight, and that their mothers
+        lose weight.
+        """
+        herbs = CohortPopulation(Herbivores, np.random.default_rng(4))
+        herbs.add_animals([5] * 1000, [50] * 1000)
+        herbs.gives_birth()
+        newborns = herbs.age == 0
+        assert len(herbs) == 1000 + herbs.count[newborns].sum()
+        assert np.all(herbs.weight[newborns] > 0)
+        assert herbs.count[~newborns & (herbs.weight < 50)].sum() == herbs.count[newborns].sum()
+
+    def test_no_birth_for_single_animal(self):
+        """
+        Testing that a single animal does not give birth.
+        """
+        herbs = CohortPopulation(Herbivores)
+        herbs.add_animals([5], [50])
+        herbs.gives_birth()
+        assert len(herbs) == 1
+
+    def test_ages_and_dies(self, mocker):
+        """
+        Testing that the animals get older and lose weight, and that the animals with weight zero
+        die.
+
+        Using a mocked random number generator whose binomial method returns every animal with
+        probability one, so no other animal dies.
+        """
+        self.herbs.add_animals([5] * 3, [0] * 3)
+        self.herbs.rng = mocker.Mock()
+        self.herbs.rng.binomial.side_effect = lambda n, p: np.where(np.asarray(p) >= 1, n, 0)
+        self.herbs.ages_and_dies()
+        assert len(self.herbs) == 10
+        assert list(self.herbs.age) == [6]
+        assert self.herbs.weight[0] == pytest.approx(20 - Herbivores.params.eta * 20,
+                                                     abs=self.herbs.weight_quantum)
+
+    def test_take_migrating_animals(self):
+        """
+        Testing that the migrating animals are taken out of their cohorts.
+        """
+        cohorts, amount_movers = self.herbs.wants_to_migrate()
+        ages, weights, phis, counts = self.herbs.take_animals(cohorts, amount_movers)
+        self.herbs.remove_empty()
+        assert len(self.herbs) == 10 - counts.sum()
+        assert list(ages) == [5] * len(cohorts)
@@ -2,6 +2,7 @@
 __author__ = 'Andrine Zimmermann, Karin Mollatt'
 __email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
 
+from multiprocessing import shared_memory
 import pytest
 
 from biosim.simulation import BioSim
@@ -69,5 +70,144 @@ class TestSimulation:
                      seed=1, img_years=5, vis_years=2)
         assert obj.num_animals_per_species == {'Herbivore': 0, 'Carnivore': 0}
 
+    def test_memory_report(self):
+        """
+        Testing that the memory report counts the animals and the bytes they use.
+        """
+        report = self.standard_simulation.memory_report()
+        assert report['Herbivore']['animals'] == 20
+        assert report['Carnivore']['animals'] == 10
+        assert report['Herbivore']['bytes_per_animal'] > 0
+        assert report['Total']['bytes'] == \
+            report['Herbivore']['bytes'] + report['Carnivore']['bytes']
+
+    def test_same_seed_same_result(self):
+        """
+        Testing that two simulations with the same seed give the same result, also when they
+        run in the same process, since each simulation draws from its own random number generator.
+        """
+        other_simulation = BioSim(ini_pop=self.standard_simulation.island.ini_pop,
+                                  island_map="WWWWW\nWWLWW\nWLLLW\nWWLWW\nWWWWW", seed=1)
+        self.standard_simulation.simulate(num_years=3)
+        other_simulation.simulate(num_years=3)
+        assert other_simulation.num_animals_per_species == \
+            self.standard_simulation.num_animals_per_species
+        assert other_simulation.island.weight_list() == \
+            self.standard_simulation.island.weight_list()
+
+    def test_log_file(self, tmp_path):
+        """
+        Testing that the log file gets one line per year with the amount of each species.
+        """
+        log_file = tmp_path / 'counts.csv'
+        simulation = BioSim(ini_pop=self.standard_simulation.island.ini_pop,
+                            island_map="WWWWW\nWWLWW\nWLLLW\nWWLWW\nWWWWW", seed=1, vis_years=0,
+                            log_file=log_file)
+        simulation.simulate(num_years=2)
+        amount_animals_species = simulation.num_animals_per_species
+        lines = log_file.read_text().splitlines()
+        assert len(lines) == 2
+        assert lines[-1] == \
+            f"2,{amount_animals_species['Herbivore']},{amount_animals_species['Carnivore']}"
+
+    def test_no_graphics_when_simulating_again(self, mocker):
+        """
+        Testing that a simulation without graphics stays without graphics when it is continued.
+        """
+        simulation = BioSim(ini_pop=[], island_map="WWWWW\nWWLWW\nWLLLW\nWWLWW\nWWWWW", seed=1,
+                            vis_years=0)
+        spy = mocker.spy(simulation._graphics, 'update')
+        simulation.simulate(num_years=1)
+        simulation.simulate(num_years=1)
+        assert spy.call_count == 0
+
+    def test_invalid_engine(self):
+        """
+        Testing that we get a ValueError for an unknown engine.
+        """
+        with pytest.raises(ValueError):
+            BioSim(ini_pop=[], island_map="WWWWW\nWWLWW\nWLLLW\nWWLWW\nWWWWW", seed=1,
+                   engine='fast')
+
+    def test_vectorized_engine(self):
+        """
+        Testing that a simulation with the vectorized engine runs with graphics, and reports the
+        same initial numbers and memory report entries as the reference engine.
+        """
+        vectorized = BioSim(ini_pop=self.standard_simulation.island.ini_pop,
+                            island_map="WWWWW\nWWLWW\nWLLLW\nWWLWW\nWWWWW", seed=1,
+                            engine='vectorized')
+        assert vectorized.num_animals_per_species == \
+            self.standard_simulation.num_animals_per_species
+        assert vectorized.memory_report().keys() == self.standard_simulation.memory_report().keys()
+        vectorized.simulate(num_years=3)
+        assert vectorized.year == 3
+
+    def test_cohorts_engine(self):
+        """
+        Testing that a simulation with the cohort engine runs with graphics, and reports the same
+        initial numbers as the reference engine.
+        """
+        cohorts = BioSim(ini_pop=self.standard_simulation.island.ini_pop,
+                         island_map="WWWWW\nWWLWW\nWLLLW\nWWLWW\nWWWWW", seed=1, engine='cohorts')
+        assert cohorts.num_animals_per_species == self.standard_simulation.num_animals_per_species
+        cohorts.simulate(num_years=3)
+        assert cohorts.year == 3
+
+    def test_parallel_engine(self):
+        """
+        Testing that a simulation with the parallel engine runs with graphics, and reports the same
+        initial numbers as the reference engine.
+        """
+        parallel = BioSim(ini_pop=self.standard_simulation.island.ini_pop,
+                          island_map="WWWWW\nWWLWW\nWLLLW\nWWLWW\nWWWWW", seed=1, engine='parallel')
+        assert parallel.num_animals_per_species == self.standard_simulation.num_animals_per_species
+        parallel.simulate(num_years=3)
+        assert parallel.year == 3
+        parallel.close()
+
+    def test_parallel_engine_workers(self, mocker):
+        """
+        Testing that the parallel engine starts the number of workers given in engine_options, and
+        by default at most one worker per row with habitable cells.
+        """
+        parallel = BioSim(ini_pop=self.standard_simulation.island.ini_pop,
+                          island_map="WWWWW\nWWLWW\nWLLLW\nWWLWW\nWWWWW", seed=1, engine='parallel',
+                          engine_options={'workers': 2})
+        assert len(parallel.island.strips) == 2
+        parallel.close()
+
+        mocker.patch('os.cpu_count', return_value=64)
+        parallel = BioSim(ini_pop=self.standard_simulation.island.ini_pop,
+                          island_map="WWWWW\nWLLLW\nWLLLW\nWLLLW\nWWWWW", seed=1, engine='parallel')
+        assert len(parallel.island.strips) == 3
+        parallel.close()
+
+    def test_close_parallel_engine(self):
+        """
+        Testing that leaving a with block of a simulation with the parallel engine ends the workers
+        and unlinks the shared blocks.
+        """
+        with BioSim(ini_pop=self.standard_simulation.island.ini_pop,
+                    island_map="WWWWW\nWWLWW\nWLLLW\nWWLWW\nWWWWW", seed=1, engine='parallel',
+                    vis_years=0) as parallel:
+            parallel.simulate(num_years=2)
+            parallel.island.snapshot()
+            names = [parallel.island.shared.spec(key)[0] for key in parallel.island.shared.arrays]
+        assert len(names) == 5
+        for name in names:
+            with pytest.raises(FileNotFoundError):
+                shared_memory.SharedMemory(name=name)
+        assert not any(process.is_alive() for process in parallel.island._processes)
+
+    def test_close_other_engines(self):
+        """
+        Testing that closing a simulation with an engine without workers does nothing.
+        """
+        with self.standard_simulation as simulation:
+            simulation.simulate(num_years=1)
+        simulation.close()
+        assert simulation.year == 1
+
 
 pytest.main(['test_simulation.py'])
@@ -0,0 +1,234 @@
+__author__ = 'Andrine Zimmermann, Karin Mollatt'
+__email__ = 'andrine.zimmermann@nmbu.no, karin.mollatt@nmbu.no'
+
+"""
+Testing the functions in vectorized_island.py
+"""
+
+from biosim.animals import Herbivores, Carnivores
+from biosim.landscapes import Lowland, Highland, Desert, Water
+from biosim.population import Population
+from biosim.vectorized_island import VectorizedIsland
+from conftest import herbs_pop, carns_pop
+import numpy as np
+import pytest
+
+
+class TestVectorizedIsland:
+
+    @pytest.fixture(autouse=True)
+    def standard_island(self):
+        """
+        Fixture setting standard island.
+        """
+        self.island_map = "WWWWW\nWWLWW\nWLLLW\nWWLWW\nWWWWW"
+        self.standard_island = VectorizedIsland(self.island_map, [herbs_pop((3, 3), 20),
+                                                                  carns_pop((3, 3), 10)])
+
+    # Tests for creating_grid
+    @pytest.mark.parametrize('island_map', ["WWW\nWRW\nWWW", "WWW\nWLLW\nWWW", "WWW\nWLL\nWWW"])
+    def test_invalid_map(self, island_map):
+        """
+        Testing that we get a ValueError for invalid landscape types, lines of different length
+        and islands that are not surrounded by water.
+        """
+        with pytest.raises(ValueError):
+            VectorizedIsland(island_map, [])
+
+    def test_grid_arrays(self):
+        """
+        Testing that the grid arrays follow the map.
+        """
+        island = VectorizedIsland("WWWWW\nWLHDW\nWWWWW", [])
+        assert island.landscape_codes.shape == (3, 5)
+        assert island.row_length == 5
+        assert island.col_length == 3
+        assert list(island.habitable[1]) == [False, True, True, True, False]
+
+    def test_regrow_fodder(self):
+        """
+        Testing that every cell gets the fodder of its landscape type.
+        """
+        island = VectorizedIsland("WWWWW\nWLHDW\nWWWWW", [])
+        island.regrow_fodder()
+        landscapes = (Water, Lowland, Highland, Desert, Water)
+        assert list(island.fodder[1]) == [landscape.params_fodder['f_max']
+                                          for landscape in landscapes]
+
+    # Tests for adding_population and the queries
+    def test_key_error_invalid_location(self):
+        """
+        Testing that we get a KeyError if the location is outside the map.
+        """
+        with pytest.raises(KeyError):
+            VectorizedIsland(self.island_map, [herbs_pop((0, 0), 5)])
+
+    def test_animals_per_species(self):
+        """
+        Testing that the animals are counted per species.
+        """
+        amount_animals_species, total_amount_animals = self.standard_island.animals_per_species()
+        assert amount_animals_species == {'Herbivore': 20, 'Carnivore': 10}
+        assert total_amount_animals == 30
+
+    def test_heatmap_population(self):
+        """
+        Testing that the heatmaps count the animals in their cells.
+        """
+        self.standard_island.adding_population([herbs_pop((2, 3), 4)])
+        herb_array, carn_array = self.standard_island.heatmap_population()
+        assert herb_array[2, 2] == 20
+        assert herb_array[1, 2] == 4
+        assert carn_array.sum() == 10
+
+    def test_trait_lists(self):
+        """
+        Testing that the trait lists have one value per animal.
+        """
+        herb_ages, carn_ages = self.standard_island.age_list()
+        herb_weights, _ = self.standard_island.weight_list()
+        herb_phis, _ = self.standard_island.fitness_list()
+        assert len(herb_ages) == len(herb_weights) == len(herb_phis) == 20
+        assert list(carn_ages) == [5] * 10
+
+    def test_snapshot(self):
+        """
+        Testing that the snapshot has the same counts and traits as the queries for each of them.
+        """
+        snapshot = self.standard_island.snapshot()
+        assert snapshot.amount_animals_species == {'Herbivore': 20, 'Carnivore': 10}
+        assert snapshot.herb_counts.tolist() == \
+            self.standard_island.heatmap_population()[0].tolist()
+        assert list(snapshot.herb_phi) == list(self.standard_island.fitness_list()[0])
+        assert list(snapshot.carn_weight) == list(self.standard_island.weight_list()[1])
+        with pytest.raises(ValueError):
+            snapshot.carn_age[0] = 0
+
+    # Tests for the phases of the annual cycle
+    def test_feeding_herbs_fittest_first(self):
+        """
+        Testing that only the fittest herbivores in each cell eat when the fodder is short.
+        """
+        island = VectorizedIsland("WWWW\nWHHW\nWWWW", [herbs_pop((2, 2), 1, weight=5),
+                                                       herbs_pop((2, 2), 1, weight=30),
+                                                       herbs_pop((2, 3), 1, weight=5)])
+        island.fodder[1, 1:3] = Herbivores.params.F
+        island.feeding_herbs()
+        gain = Herbivores.params.beta * Herbivores.params.F
+        assert list(island.herbivores.weight) == pytest.approx([5, 30 + gain, 5 + gain])
+        assert list(island.fodder[1, 1:3]) == [0, 0]
+
+    def test_feeding_herbs_same_as_cells(self):
+        """
+        Testing that feeding the whole island at once gives the same weights and fodder as
+        feeding each cell on its own with :meth:`biosim.population.Population.eats_fodder`.
+        """
+        rng = np.random.default_rng(4)
+        locs = [(2, 2), (2, 3), (2, 4), (3, 2), (3, 3)]
+        island = VectorizedIsland("WWWWWW\nWLHDLW\nWLHLLW\nWWWWWW", [])
+        for loc in locs:
+            island.adding_population([{'loc': loc,
+                                       'pop': [{'species': 'Herbivore', 'age': int(age),
+                                                'weight': float(weight)}
+                                               for age, weight in zip(rng.integers(0, 20, 80),
+                                                                      rng.uniform(5, 40, 80))]}])
+        island.regrow_fodder()
+        expected_fodder = island.fodder.copy()
+
+        expected_weights = []
+        for loc in locs:
+            in_cell = island.herbivores.cell == island.flat_index(loc)
+            cell_herbs = Population(Herbivores)
+            cell_herbs.add_animals(island.herbivores.age[in_cell],
+                                   island.herbivores.weight[in_cell])
+            index = (loc[0] - 1, loc[1] - 1)
+            expected_fodder[index] = cell_herbs.eats_fodder(expected_fodder[index])
+            expected_weights.extend(cell_herbs.weight)
+
+        island.feeding_herbs()
+        assert list(island.herbivores.weight) == pytest.approx(expected_weights)
+        assert island.fodder == pytest.approx(expected_fodder)
+
+    def test_feeding_carn_only_in_own_cell(self, mocker):
+        """
+        Testing that carnivores only hunt herbivores in their own cell.
+
+        Using a mocked random number generator whose random method returns 0, so every herbivore
+        that is less fit than the carnivore is killed.
+        """
+        island = VectorizedIsland("WWWW\nWLLW\nWWWW", [herbs_pop((2, 2), 3, weight=2),
+                                                       herbs_pop((2, 3), 3, weight=2),
+                                                       carns_pop((2, 2), 1, weight=40)])
+        island.rng = mocker.Mock()
+        island.rng.random.side_effect = np.zeros
+        island.feeding_carn_with_herbs()
+        assert list(island.herbivores.cell) == [island.flat_index((2, 3))] * 3
+        assert island.carnivores.weight[0] == pytest.approx(40 + Carnivores.params.beta * 6)
+
+    def test_no_birth_alone_in_cell(self, mocker):
+        """
+        Testing that animals alone in their cell do not give birth, even with other animals of
+        the same species elsewhere on the island.
+
+        Using a mocked random number generator whose random method returns 0.
+        """
+        island = VectorizedIsland("WWWW\nWLLW\nWWWW", [herbs_pop((2, 2), 1, weight=50),
+                                                       herbs_pop((2, 3), 1, weight=50)])
+        island.rng = mocker.Mock()
+        island.rng.random.side_effect = np.zeros
+        island.animals_give_birth()
+        assert len(island.herbivores) == 2
+
+    def test_birth_in_mothers_cell(self, mocker):
+        """
+        Testing that the newborns are added in the cell of their mother.
+
+        Using a mocked random number generator whose random method returns 0, and whose normal
+        method returns newborns of weight 8.
+        """
+        island = VectorizedIsland("WWWW\nWLLW\nWWWW", [herbs_pop((2, 3), 2, weight=50)])
+        island.rng = mocker.Mock()
+        island.rng.random.side_effect = np.zeros
+        island.rng.normal.side_effect = lambda loc, scale, size: np.full(size, 8.0)
+        island.animals_give_birth()
+        assert list(island.herbivores.cell) == [island.flat_index((2, 3))] * 4
+        assert list(island.herbivores.age) == [5, 5, 0, 0]
+
+    @pytest.mark.parametrize('direction, new_loc',
+                             [[0, (3, 4)], [1, (3, 2)], [2, (4, 3)], [3, (2, 3)]])
+    def test_migrating_animals(self, mocker, direction, new_loc):
+        """
+        Testing that the animals move to the neighbouring cell they draw.
+
+        Using a mocked random number generator, so every animal wants to move, in the given
+        direction.
+        """
+        self.standard_island.rng = mocker.Mock()
+        self.standard_island.rng.random.side_effect = np.zeros
+        self.standard_island.rng.integers.side_effect = lambda high, size: np.full(size, direction)
+        self.standard_island.migrating_animals()
+        herb_array, carn_array = self.standard_island.heatmap_population()
+        assert herb_array[new_loc[0] - 1, new_loc[1] - 1] == 20
+        assert carn_array[new_loc[0] - 1, new_loc[1] - 1] == 10
+
+    def test_no_migration_into_water(self, mocker):
+        """
+        Testing that an animal that draws a water cell stays where it is.
+
+        Using a mocked random number generator, so every animal wants to move north, into water.
+        """
+        island = VectorizedIsland("WWW\nWLW\nWWW", [herbs_pop((2, 2), 5)])
+        island.rng = mocker.Mock()
+        island.rng.random.side_effect = np.zeros
+        island.rng.integers.side_effect = lambda high, size: np.zeros(size, dtype=int)
+        island.migrating_animals()
+        assert list(island.herbivores.cell) == [island.flat_index((2, 2))] * 5
+
+    def test_annual_cycle_ages_animals(self):
+        """
+        Testing that the animals that survive a year are one year older.
+        """
+        self.standard_island.annual_cycle_simulation()
+        herb_ages, carn_ages = self.standard_island.age_list()
+        assert set(herb_ages) <= {1, 6}
+        assert set(carn_ages) <= {1, 6}